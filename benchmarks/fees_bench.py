@@ -0,0 +1,78 @@
+import time
+
+import numpy as np
+
+from bojxona import fees, split, whatif
+
+# ─── Formulalar: qatorma-qator (skalyar) va massiv (batched) chaqiruvlar ───
+SIZES = (1, 1_000, 1_000_000)
+BHM = 412000.0
+
+
+def best_time(fn, min_time=0.2, repeat=3):
+    # Eng yaxshi natija (sekund / bitta chaqiruv); sekin chaqiruvlar bir martadan o'lchanadi
+    best = float("inf")
+    for _ in range(repeat):
+        n, elapsed = 0, 0.0
+        t0 = time.perf_counter()
+        while elapsed < min_time or n == 0:
+            fn()
+            n += 1
+            elapsed = time.perf_counter() - t0
+        best = min(best, elapsed / n)
+        if elapsed > 5 * min_time:
+            break
+    return best
+
+
+def _inputs(n, seed=0):
+    rng = np.random.default_rng(seed)
+    return {
+        "usd": rng.uniform(0, 1.5e6, n),
+        "w_t": rng.uniform(0.1, 50, n),
+        "days": rng.integers(1, 60, n).astype(float),
+        "km": rng.integers(1, 800, n).astype(float),
+        "vehicles": rng.integers(1, 10, n).astype(float),
+    }
+
+
+def cases(x):
+    usd, w_t, days, km, veh = x["usd"], x["w_t"], x["days"], x["km"], x["vehicles"]
+    return {
+        "byd_fee": (
+            lambda: [fees.byd_fee(v, BHM) for v in usd.tolist()],
+            lambda: fees.byd_fee(usd, BHM),
+        ),
+        "storage_4": (
+            lambda: [fees.storage_4(w, d, BHM)["total"] for w, d in zip(w_t.tolist(), days.tolist())],
+            lambda: fees.storage_4(w_t, days, BHM)["total"],
+        ),
+        "escort_fee": (
+            lambda: [fees.escort_fee(k, v, BHM) for k, v in zip(km.tolist(), veh.tolist())],
+            lambda: fees.escort_fee(km, veh, BHM),
+        ),
+    }
+
+
+def split_lines(n, total=101_000, seed=0):
+    # Chegaradan sal yuqori jami qiymat: taqsimlash foydali, nomzodlar ko'p
+    v = np.random.default_rng(seed).lognormal(0, 1.5, n)
+    return np.round(v / v.sum() * total, 2)
+
+
+def run(sizes=SIZES):
+    out = {}
+    for n in sizes:
+        for name, (scalar, batched) in cases(_inputs(n)).items():
+            out[f"fees.{name}.scalar.{n}"] = best_time(scalar)
+            out[f"fees.{name}.batched.{n}"] = best_time(batched)
+    for n in (100, 5_000):
+        lines = split_lines(n)
+        out[f"split.optimize.{n}"] = best_time(lambda: split.optimize(lines, BHM))
+    # What-if to'ri: 100k deklaratsiya (yarmi so'mda), 1000 BHM × 1000 kurs × 3 chegirma
+    x = _inputs(100_000)
+    half = len(x["usd"]) // 2
+    pf = whatif.Portfolio(x["usd"][:half], x["usd"][half:] * 12900.0, x["days"] > 30, np.zeros(1))
+    b_axis, x_axis = np.linspace(3e5, 6e5, 1000), np.linspace(1e4, 1.6e4, 1000)
+    out["whatif.grid.1000x1000x3"] = best_time(lambda: pf.grid(b_axis, x_axis, (0.0, 0.1, 0.2)))
+    return out
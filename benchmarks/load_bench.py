@@ -0,0 +1,277 @@
+import argparse
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from datetime import date
+
+from bojxona import cbu_stub
+
+# ─── Yuklama sinovi: bitta Streamlit serveriga N ta parallel foydalanuvchi ───
+# Haqiqiy `streamlit run app.py` jarayoni ishga tushiriladi; har bir "foydalanuvchi" brauzer kabi
+# websocket (/_stcore/stream) orqali BackMsg yuboradi: sahifalar bo'ylab o'tadi, BHM va sahifadagi
+# raqamli maydonlarni (customs_usd, days_t, ...) o'zgartiradi. Rerun vaqti — so'rov yuborilgandan
+# script_finished kelguncha (navbatda kutish ham kiradi). Xotira — server jarayonining RSS i.
+# AppTest bu yerda yaramaydi: u bitta global Runtime bilan ishlaydi va parallel sessiyalarni bermaydi.
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+# Har bir sahifada o'zgartiriladigan raqamli maydonlar soni (sidebar BHM dan tashqari)
+EDITS = 2
+SIDEBAR = 1
+DEFAULT_PAGE = "asosiy"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def rss(pid, field="VmRSS"):
+    # /proc/<pid>/status dan baytlarda (Linux)
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            if line.startswith(field + ":"):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _seed_rates(data_dir, srv):
+    env = {**os.environ, "BOJXONA_DATA_DIR": data_dir}
+    code = ("import sys; from bojxona import rates; "
+            "rates.RateStore().put_many([(c, sys.argv[1], float(r)) for c, r in (a.split('=') for a in sys.argv[2:])])")
+    subprocess.run([sys.executable, "-c", code, date.today().isoformat(), *(f"{c}={r}" for c, r in srv.rates.items())],
+                   env=env, check=True, cwd=os.path.dirname(APP))
+
+
+def start_server(base_url, data_dir, port=None, timeout=60):
+    port = port or _free_port()
+    env = {**os.environ, "CBU_BASE_URL": base_url, "BOJXONA_DATA_DIR": data_dir}
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "streamlit", "run", APP, "--server.headless", "true", "--server.port", str(port),
+         "--server.address", "127.0.0.1", "--server.enableXsrfProtection", "false", "--server.fileWatcherType", "none",
+         "--browser.gatherUsageStats", "false"],
+        env=env, cwd=os.path.dirname(APP), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"Streamlit server to'xtadi (kod {proc.returncode})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("Streamlit server ishga tushmadi")
+
+
+class Session:
+    # Bitta brauzer sessiyasi: widget holatlari klientda saqlanadi va har rerunda to'liq yuboriladi
+    def __init__(self, port, timeout=120):
+        try:
+            from websockets.sync.client import connect
+        except ImportError:
+            raise RuntimeError("Yuklama sinovi uchun 'websockets' paketi kerak: pip install websockets")
+        self.ws = connect(f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"],
+                          max_size=None, open_timeout=timeout)
+        self.timeout = timeout
+        self.pages = {}
+        self.page_hash = ""
+        self.states = {}
+        self.inputs = {}
+
+    def __enter__(self):
+        self.ws.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self.ws.__exit__(*exc)
+
+    def rerun(self, page=None, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        if page is not None:
+            self.page_hash = self.pages.get(page, "")
+            # Boshqa sahifa: asosiy qismdagi widgetlar yo'qoladi, sidebar dagilar qoladi
+            self.states = {k: v for k, v in self.states.items() if self.inputs.get(k, (None, None))[1] == SIDEBAR}
+        if not fragment_id:
+            self.inputs = {k: v for k, v in self.inputs.items() if v[1] == SIDEBAR}
+        msg = BackMsg()
+        cs = msg.rerun_script
+        cs.page_script_hash = self.page_hash
+        cs.page_name = page or ""
+        cs.fragment_id = fragment_id
+        cs.widget_states.widgets.extend(self.states.values())
+
+        t0 = time.perf_counter()
+        self.ws.send(msg.SerializeToString())
+        error = None
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(self.ws.recv(timeout=self.timeout))
+            kind = fwd.WhichOneof("type")
+            if kind == "navigation":
+                # Standart sahifaning url_pathname i bo'sh — app.py dagi kabi birinchi sahifa nomi olinadi
+                self.pages = {p.url_pathname or DEFAULT_PAGE: p.page_script_hash for p in fwd.navigation.app_pages}
+                self.page_hash = fwd.navigation.page_script_hash
+            elif kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                el = fwd.delta.new_element
+                which = el.WhichOneof("type")
+                if which == "number_input":
+                    self.inputs[el.number_input.id] = (el.number_input, fwd.metadata.delta_path[0], fwd.delta.fragment_id)
+                elif which == "exception" and error is None:
+                    error = el.exception.message
+            elif kind == "script_finished":
+                if fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - t0, error
+
+    def edit(self, rng, sidebar=False):
+        # Tasodifiy raqamli maydonni chegaralar ichida o'zgartirish; (fragment_id) qaytadi
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        cands = [(k, v) for k, v in self.inputs.items() if (v[1] == SIDEBAR) == sidebar and not v[0].disabled]
+        if not cands:
+            return None
+        wid, (num, _, fragment_id) = rng.choice(cands)
+        # Chegaralar ichida, lekin standart qiymatdan 5 baravardan oshmasdan (real kiritishlarga yaqin)
+        lo = num.min if num.has_min else 0
+        hi = max(lo, num.default, 1) * 5
+        hi = min(hi, num.max) if num.has_max else hi
+        ws = WidgetState(id=wid)
+        if num.data_type == num.INT:
+            ws.int_value = rng.randint(int(lo), max(int(lo), int(hi)))
+        else:
+            ws.double_value = rng.uniform(lo, hi)
+        self.states[wid] = ws
+        return fragment_id
+
+
+def user(port, pages, deadline, think, seed, out, errors):
+    rng = random.Random(seed)
+    try:
+        with Session(port) as s:
+            _browse(s, rng, pages, deadline, think, out)
+    except Exception as e:
+        errors.append(f"{type(e).__name__}: {e}")
+
+
+def _browse(s, rng, pages, deadline, think, out):
+    out.append(("(ochilish)", *s.rerun()))
+    order = list(pages or s.pages)
+    rng.shuffle(order)
+    i = 0
+    while time.time() < deadline:
+        page = order[i % len(order)]
+        i += 1
+        out.append((page, *s.rerun(page)))
+        # Avval sidebar (BHM), keyin sahifadagi EDITS ta maydon
+        for sidebar in [True] + [False] * EDITS:
+            if time.time() >= deadline:
+                break
+            if think:
+                time.sleep(rng.uniform(0, 2 * think))
+            fragment_id = s.edit(rng, sidebar)
+            if fragment_id is None:
+                continue
+            out.append((page, *s.rerun(fragment_id=fragment_id)))
+
+
+def _pct(xs, q):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(q * len(xs)))] if xs else float("nan")
+
+
+def run(users=8, duration=20.0, think=0.0, pages=None, port=None):
+    srv = cbu_stub.serve()
+    data_dir = tempfile.mkdtemp(prefix="bojxona-load-")
+    _seed_rates(data_dir, srv)
+    proc, port = start_server(srv.base_url, data_dir, port)
+    try:
+        # Isitish: importlar, keshlar va bitta sessiya — bazaviy RSS shundan keyin o'lchanadi
+        user(port, pages, time.time() + 3, 0, -1, [], [])
+        time.sleep(1)
+        base = rss(proc.pid)
+
+        samples, errors = [], []
+        per_user = [[] for _ in range(users)]
+        t0 = time.time()
+        deadline = t0 + duration
+        threads = [threading.Thread(target=user, args=(port, pages, deadline, think, i, per_user[i], errors), daemon=True)
+                   for i in range(users)]
+        peak = [base]
+        for t in threads:
+            t.start()
+        while any(t.is_alive() for t in threads):
+            peak[0] = max(peak[0], rss(proc.pid))
+            time.sleep(0.2)
+        elapsed = time.time() - t0
+        for xs in per_user:
+            samples.extend(xs)
+    finally:
+        proc.terminate()
+        try:
+            proc.wait(10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+        srv.shutdown()
+
+    times = [t for _, t, _ in samples]
+    out = {
+        "load.users": float(users),
+        "load.reruns": float(len(times)),
+        "load.throughput": len(times) / elapsed,
+        "load.rerun_p50": _pct(times, 0.5),
+        "load.rerun_p95": _pct(times, 0.95),
+        "load.rerun_p99": _pct(times, 0.99),
+        "load.rss_base_bytes": float(base),
+        "load.rss_peak_bytes": float(peak[0]),
+        "load.session_bytes": max(0.0, (peak[0] - base) / users),
+    }
+    by_page = {}
+    for page, t, _ in samples:
+        by_page.setdefault(page, []).append(t)
+    for page, xs in by_page.items():
+        out[f"load.{page}.rerun_p50"] = statistics.median(xs)
+        out[f"load.{page}.rerun_p95"] = _pct(xs, 0.95)
+    failures = [f"{page}: {err}" for page, _, err in samples if err] + errors
+    return out, failures
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Bitta Streamlit serveriga parallel sessiyalar bilan yuklama sinovi")
+    p.add_argument("--users", type=int, default=8)
+    p.add_argument("--duration", type=float, default=20.0, help="sekund")
+    p.add_argument("--think", type=float, default=0.0, help="harakatlar orasidagi o'rtacha pauza (sekund)")
+    p.add_argument("--pages", nargs="*", help="faqat shu sahifalar (slug)")
+    p.add_argument("--port", type=int)
+    p.add_argument("--max-p95", type=float, help="p95 rerun (sekund) shundan oshsa xato")
+    p.add_argument("--max-session-mb", type=float, help="sessiya xotirasi (MB) shundan oshsa xato")
+    a = p.parse_args(argv)
+
+    res, failures = run(a.users, a.duration, a.think, a.pages, a.port)
+    print(f"Foydalanuvchilar: {a.users}, rerunlar: {res['load.reruns']:.0f}, o'tkazuvchanlik: {res['load.throughput']:.1f} rerun/s")
+    print(f"Rerun: p50 {res['load.rerun_p50'] * 1e3:,.0f} ms, p95 {res['load.rerun_p95'] * 1e3:,.0f} ms, p99 {res['load.rerun_p99'] * 1e3:,.0f} ms")
+    print(f"RSS: bazaviy {res['load.rss_base_bytes'] / 2**20:,.0f} MB, eng yuqori {res['load.rss_peak_bytes'] / 2**20:,.0f} MB, "
+          f"sessiyaga {res['load.session_bytes'] / 2**20:,.1f} MB")
+    for key in sorted(k for k in res if k.count(".") == 2):
+        print(f"  {key:40s} {res[key] * 1e3:>10,.0f} ms")
+    for f in failures[:10]:
+        print(f"XATO {f}")
+    bad = bool(failures)
+    if a.max_p95 is not None and res["load.rerun_p95"] > a.max_p95:
+        print(f"REGRESSIYA p95 {res['load.rerun_p95']:.3f} s > {a.max_p95} s")
+        bad = True
+    if a.max_session_mb is not None and res["load.session_bytes"] > a.max_session_mb * 2**20:
+        print(f"REGRESSIYA sessiya xotirasi {res['load.session_bytes'] / 2**20:.1f} MB > {a.max_session_mb} MB")
+        bad = True
+    return 1 if bad else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+from bojxona import cbu_stub, rates, settings
+
+# ─── Sahifalar: AppTest orqali to'liq skript qayta ishga tushishi (rerun) ───
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PAGES = ("asosiy", "rasmiylashtiruv", "taqsimlash", "tranzit", "ombor", "hamrohlik", "jismoniy", "boshqa", "jadval", "grafik", "stsenariy", "teskari")
+# Sovuq start: yangi jarayonda birinchi (standart) sahifa ochilishigacha
+COLD_START = """
+import sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(sys.argv[1], default_timeout=120)
+at.run()
+assert not at.exception, at.exception[0].message
+print(time.perf_counter() - t0)
+"""
+
+
+def stub_cbu():
+    # cbu.uz o'rniga lokal server; kurslar diskka oldindan yoziladi, shunda rerun tarmoqqa chiqmaydi
+    srv = cbu_stub.serve()
+    settings.CBU_URL = srv.base_url
+    today = date.today().isoformat()
+    rates.RateStore().put_many([(ccy, today, rate) for ccy, rate in srv.rates.items()])
+    return srv
+
+
+def open_app():
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP, default_timeout=120)
+    at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return at
+
+
+def goto(at, slug):
+    at.switch_page(f"views/{slug}.py").run()
+
+
+def cold_start(base_url, repeat=3):
+    env = {**os.environ, "CBU_BASE_URL": base_url}
+    times = []
+    for _ in range(repeat):
+        out = subprocess.run([sys.executable, "-c", COLD_START, APP], env=env, check=True,
+                             capture_output=True, text=True).stdout
+        times.append(float(out.split()[-1]))
+    return min(times)
+
+
+def run(reruns=5):
+    srv = stub_cbu()
+    out = {}
+    try:
+        out["page.cold_start"] = cold_start(srv.base_url)
+        at = open_app()
+        for slug in PAGES:
+            goto(at, slug)
+            if at.exception:
+                raise RuntimeError(f"{slug}: {at.exception[0].message}")
+            times = []
+            for _ in range(reruns):
+                t0 = time.perf_counter()
+                at.run()
+                times.append(time.perf_counter() - t0)
+            tracemalloc.start()
+            at.run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            out[f"page.{slug}.rerun"] = statistics.median(times)
+            out[f"page.{slug}.peak_bytes"] = float(peak)
+    finally:
+        srv.shutdown()
+    return out
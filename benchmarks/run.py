@@ -0,0 +1,88 @@
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+
+# Benchmarklar oflayn ishlaydi: ma'lumotlar katalogi vaqtinchalik, CBU lokal stub
+os.environ["BOJXONA_DATA_DIR"] = tempfile.mkdtemp(prefix="bojxona-bench-")
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+# Vaqt o'lchovlari shovqinli: kichik mutlaq farqlar regressiya hisoblanmaydi
+ABS_FLOOR = {"peak_bytes": 256 * 1024, "default": 0.002}
+
+
+def collect(only, quick, reruns):
+    from benchmarks import fees_bench, pages_bench
+
+    results = {}
+    if only in (None, "fees"):
+        sizes = fees_bench.SIZES[:-1] if quick else fees_bench.SIZES
+        results.update(fees_bench.run(sizes))
+    if only in (None, "pages"):
+        results.update(pages_bench.run(reruns))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    failed = []
+    for key, base in sorted(baseline.items()):
+        if key not in results:
+            continue
+        got = results[key]
+        floor = ABS_FLOOR["peak_bytes"] if key.endswith("peak_bytes") else ABS_FLOOR["default"]
+        if got > base * tolerance and got - base > floor:
+            failed.append((key, base, got))
+    return failed
+
+
+def _fmt(key, value):
+    if key.endswith("peak_bytes"):
+        return f"{value / 1024:,.0f} KB"
+    return f"{value * 1e3:,.3f} ms"
+
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="Yig'im formulalari va sahifa rerunlari benchmarklari")
+    p.add_argument("--only", choices=("fees", "pages"))
+    p.add_argument("--quick", action="store_true", help="1 000 000 qatorli o'lchovlarsiz")
+    p.add_argument("--reruns", type=int, default=5)
+    p.add_argument("--tolerance", type=float, default=1.5, help="baseline × tolerance dan sekin bo'lsa xato")
+    p.add_argument("--baseline", default=BASELINE)
+    p.add_argument("--update", action="store_true", help="natijalarni yangi baseline sifatida yozish")
+    p.add_argument("--out", help="natijalarni JSON faylga yozish")
+    a = p.parse_args(argv)
+
+    results = collect(a.only, a.quick, a.reruns)
+    for key in sorted(results):
+        print(f"{key:48s} {_fmt(key, results[key]):>16s}")
+    doc = {"python": platform.python_version(), "machine": platform.machine(), "results": results}
+    if a.out:
+        with open(a.out, "w") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+
+    if a.update:
+        old = {}
+        if os.path.exists(a.baseline):
+            with open(a.baseline) as f:
+                old = json.load(f)["results"]
+        doc["results"] = {**old, **results}
+        with open(a.baseline, "w") as f:
+            json.dump(doc, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"Baseline yangilandi: {a.baseline}")
+        return 0
+    if not os.path.exists(a.baseline):
+        print("Baseline topilmadi; avval --update bilan yarating")
+        return 0
+    with open(a.baseline) as f:
+        baseline = json.load(f)["results"]
+    failed = compare(results, baseline, a.tolerance)
+    for key, base, got in failed:
+        print(f"REGRESSIYA {key}: {_fmt(key, base)} -> {_fmt(key, got)} ({got / base:.2f}×)")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+import argparse
+import os
+from datetime import date
+
+import numpy as np
+import pandas as pd
+from starlette.applications import Starlette
+from starlette.concurrency import run_in_threadpool
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+from bojxona import batch, fees, inverse, metrics, rates, routes, schedule
+
+# ─── HTTP JSON API: har bir kalkulyator uchun yagona va ommaviy endpointlar ───
+#   POST /v1/{calc}        — bitta obyekt
+#   POST /v1/{calc}/batch  — {"items": [...], "bhm": ixtiyoriy}
+#   POST /v1/inverse/{query}[/batch] — teskari so'rovlar: byudjetga sig'adigan eng katta qiymat, bosqich chegarasi
+#     (max null, fee null — hech narsa sig'maydi; max null, fee bor — yuqori chegara yo'q)
+# bhm berilmasa har element o'z "date" maydoni (yoki bugun) bo'yicha jadvaldan olinadi.
+# "date" berilsa modda stavkalari ham shu sana bo'yicha jadvaldan olinadi (sanasiz — amaldagi VM № 55 stavkalari);
+# sanada kuchga kirmagan modda kerak bo'lgan elementda total null va "error" maydoni bo'ladi (bitta obyektda — 422).
+# Teskari so'rovlar (inverse) sanadan faqat BHM ni oladi — stavkalar amaldagi.
+# Diskda USD kursi bo'lmasa total_usd null bo'ladi va javobga "rate_error" qo'shiladi (taxminiy kurs ishlatilmaydi).
+RATE_ERROR = "USD kursi mavjud emas (cbu.uz dan hali olinmagan)"
+NO_RATE = "sana uchun stavka yo'q (modda bu sanada kuchga kirmagan)"
+MAX_ITEMS = 100_000
+SERVICE_ARTICLES = ("2", "6", "8", "9")
+
+
+def _col(data, name, default=None):
+    if name in data:
+        return data[name]
+    if default is None:
+        raise ValueError(f"'{name}' maydoni talab qilinadi")
+    return [default] * data.n
+
+
+def _num(data, name, default=None, positive=False, whole=False):
+    col = _col(data, name, default)
+    if any(isinstance(v, (list, dict)) for v in col):
+        raise ValueError(f"'{name}' maydoni son bo'lishi kerak (ro'yxat yoki obyekt emas)")
+    try:
+        vals = np.array(col, dtype=float)
+    except (TypeError, ValueError):
+        raise ValueError(f"'{name}' maydonida son bo'lmagan qiymat bor")
+    missing = np.isnan(vals)
+    if missing.any():
+        if default is None:
+            raise ValueError(f"'{name}' maydoni talab qilinadi")
+        vals[missing] = default
+    # Barcha miqdorlar (qiymat, og'irlik, kun, km, soni, byudjet) manfiy bo'lmagan chekli son
+    if not (np.isfinite(vals) & (vals >= 0)).all():
+        raise ValueError(f"'{name}' maydoni manfiy bo'lmagan son bo'lishi kerak")
+    # Bo'luvchi miqdorlar (teskari so'rovlarda og'irlik, kun, avtomobillar) — musbat; soni — butun
+    if positive and not (vals > 0).all():
+        raise ValueError(f"'{name}' maydoni musbat son bo'lishi kerak")
+    if whole and not (vals == np.floor(vals)).all():
+        raise ValueError(f"'{name}' maydoni butun son bo'lishi kerak")
+    return vals
+
+
+def _flag(data, name):
+    vals = _col(data, name, False)
+    if any(isinstance(v, (list, dict)) for v in vals):
+        raise ValueError(f"'{name}' maydoni true/false bo'lishi kerak")
+    if any(isinstance(v, str) for v in vals):
+        return batch.to_flags(pd.Series(vals, dtype=object).fillna(False))
+    return np.array([bool(v) for v in vals])
+
+
+class _Columns(dict):
+    # JSON elementlar ro'yxati → {maydon: qiymatlar ro'yxati}; yo'q maydon None bo'ladi
+    def __init__(self, items):
+        keys = dict.fromkeys(k for it in items for k in it)
+        super().__init__((k, [it.get(k) for it in items]) for k in keys)
+        self.n = len(items)
+        self.rates = None
+
+
+def _byd(data, bhm, fx):
+    if "currency" in data:
+        if not fx or "USD" not in fx:
+            raise ValueError("Valyuta kurslari mavjud emas")
+        usd = rates.to_uzs(_num(data, "customs_value"), data["currency"], fx) / fx["USD"]
+    else:
+        usd = _num(data, "customs_usd")
+    args = (_flag(data, "initial_decl"), _flag(data, "after_hours"), _num(data, "insp_h", 0), _num(data, "insp_ot", 0))
+    if "date" in data:
+        res = schedule.default().byd_total(usd, data["date"], *args, bhm=bhm)
+    else:
+        res = fees.byd_total(usd, bhm, *args)
+    return {"customs_usd": usd, **res}
+
+
+def _transit(data, bhm, fx):
+    n = _num(data, "n", 1, whole=True)
+    fee = fees.flat_fee("1b", n, bhm, data.rates)
+    ah_fee = np.where(_flag(data, "after_hours"), fees.flat_fee("3a", n, bhm, data.rates), 0.0)
+    return {"fee": fee, "ah_fee": ah_fee, "total": fee + ah_fee}
+
+
+def _flat(code, field, whole=True):
+    def calc(data, bhm, fx):
+        return {"total": fees.flat_fee(code, _num(data, field, 1, whole=whole), bhm, data.rates)}
+    return calc
+
+
+def _storage4(data, bhm, fx):
+    return fees.storage_4(_num(data, "w_t"), _num(data, "days"), bhm, data.rates)
+
+
+def _storage7(data, bhm, fx):
+    return fees.storage_7(_num(data, "w_kg"), _num(data, "days"), bhm, _flag(data, "perishable"), data.rates)
+
+
+def _escort(data, bhm, fx):
+    # km yoki origin + destination (postlar masofa matritsasidan)
+    if "km" not in data and "origin" in data:
+        return routes.price_manifest(_col(data, "origin"), _col(data, "destination"), _num(data, "vehicles", 1, True, True), bhm, rates=data.rates)
+    km = _num(data, "km")
+    return {"rate": fees.escort_rate(km, data.rates), "total": fees.escort_fee(km, _num(data, "vehicles", 1, True, True), bhm, data.rates)}
+
+
+def _service(data, bhm, fx):
+    art = [str(a).strip() for a in _col(data, "article")]
+    bad = sorted(set(art) - set(SERVICE_ARTICLES))
+    if bad:
+        raise ValueError(f"Noma'lum modda: {', '.join(bad)} (ruxsat: {', '.join(SERVICE_ARTICLES)})")
+    by_code = {a: np.broadcast_to(fees.rate(a, data.rates), data.n) for a in set(art)}
+    rate = np.array([by_code[a][i] for i, a in enumerate(art)])
+    return {"total": rate * bhm * _num(data, "n", 1, whole=True)}
+
+
+CALCULATORS = {
+    "byd": _byd,                     # 1a (+3a, 3b)
+    "transit": _transit,             # 1b
+    "cash": _flat("1v", "n"),        # 1v
+    "order": _flat("1g", "n"),       # 1g
+    "courier": _flat("1d", "kg", whole=False),  # 1d
+    "storage4": _storage4,           # 4
+    "storage7": _storage7,           # 7
+    "escort": _escort,               # 5
+    "service": _service,             # 2, 6, 8, 9
+}
+
+
+def _tier(kind):
+    def query(data, bhm, fx):
+        return inverse.next_tier(kind, _num(data, "value"))
+    return query
+
+
+INVERSE = {
+    "byd": lambda d, bhm, fx: inverse.byd_value(_num(d, "budget"), bhm, _flag(d, "initial_decl")),
+    "storage4_days": lambda d, bhm, fx: inverse.storage4_days(_num(d, "budget"), _num(d, "w_t", positive=True), bhm),
+    "storage4_weight": lambda d, bhm, fx: inverse.storage4_weight(_num(d, "budget"), _num(d, "days", positive=True), bhm),
+    "storage7_days": lambda d, bhm, fx: inverse.storage7_days(_num(d, "budget"), _num(d, "w_kg", positive=True), bhm, _flag(d, "perishable")),
+    "storage7_weight": lambda d, bhm, fx: inverse.storage7_weight(_num(d, "budget"), _num(d, "days", positive=True), bhm, _flag(d, "perishable")),
+    "escort_km": lambda d, bhm, fx: inverse.escort_km(_num(d, "budget"), _num(d, "vehicles", 1, True, True), bhm),
+    "escort_vehicles": lambda d, bhm, fx: inverse.escort_vehicles(_num(d, "budget"), _num(d, "km", positive=True), bhm),
+    "flat": lambda d, bhm, fx: inverse.flat_n(_num(d, "budget"), _col(d, "article"), bhm),
+    **{f"{kind}_tier": _tier(kind) for kind in inverse.CURVES},
+}
+
+
+def price(calc, items, bhm=None, fx=None, registry=CALCULATORS):
+    # Hisob natijasi ustunlar ko'rinishida: {maydon: massiv}
+    if calc not in registry:
+        raise KeyError(calc)
+    if not items:
+        raise ValueError("Bo'sh so'rov")
+    if len(items) > MAX_ITEMS:
+        raise ValueError(f"Bir so'rovda ko'pi bilan {MAX_ITEMS:,} ta element")
+    data = _Columns(items)
+    if "date" in data:
+        # Sanasiz elementlar — bugungi sana
+        today = date.today()
+        try:
+            data["date"] = schedule.as_days([today if d is None else d for d in data["date"]])
+        except (TypeError, ValueError):
+            raise ValueError("'date' maydonida noto'g'ri sana")
+        data.rates = schedule.default().article_rates(data["date"])
+    if bhm is None:
+        bhm = schedule.default().bhm(data["date"] if "date" in data else date.today())
+        if np.isnan(bhm).any():
+            raise ValueError("Sana uchun BHM topilmadi")
+    res = registry[calc](data, bhm, fx)
+    n = data.n
+    cols = {k: np.broadcast_to(np.asarray(v, dtype=float), n) for k, v in res.items()}
+    if "bhm" not in cols:
+        cols["bhm"] = np.broadcast_to(np.asarray(bhm, dtype=float), n)
+    if "total" in cols:
+        cols["total_usd"] = cols["total"] / fx["USD"] if fx and "USD" in fx else np.full(n, np.nan)
+        unpriced = ~np.isfinite(cols["total"])
+        if unpriced.any():
+            cols["error"] = np.where(unpriced, NO_RATE, None)
+    return cols
+
+
+def _records(cols):
+    lists = []
+    for v in cols.values():
+        if v.dtype == object:
+            lists.append(v.tolist())
+            continue
+        nan = ~np.isfinite(v)
+        lists.append([None if m else x for x, m in zip(v.tolist(), nan.tolist())] if nan.any() else v.tolist())
+    keys = list(cols)
+    return [dict(zip(keys, row)) for row in zip(*lists)]
+
+
+_service_rates = None
+
+
+def _fx():
+    # Har ishchi jarayon o'z RateService ini yaratadi; kurslar diskdagi umumiy ombordan o'qiladi
+    global _service_rates
+    if _service_rates is None:
+        _service_rates = rates.RateService()
+        metrics.cache_collector("rates", _service_rates)
+    return _service_rates.rate_table()
+
+
+def _compute(calc, items, bhm, registry, endpoint):
+    with metrics.timer("bojxona_api_request_seconds", calculator=calc, endpoint=endpoint):
+        fx = _fx()
+        return price(calc, items, bhm, fx, registry), fx
+
+
+async def _handle(request, many, registry=CALCULATORS):
+    calc = request.path_params["calc"]
+    if calc not in registry:
+        return JSONResponse({"error": f"Noma'lum kalkulyator: {calc}", "calculators": list(registry)}, 404)
+    try:
+        body = await request.json()
+    except ValueError:
+        return JSONResponse({"error": "JSON noto'g'ri"}, 400)
+    if many:
+        items = body.get("items") if isinstance(body, dict) else body
+        bhm = body.get("bhm") if isinstance(body, dict) else None
+    else:
+        items = [body] if isinstance(body, dict) else None
+        bhm = body.pop("bhm", None) if isinstance(body, dict) else None
+    if not isinstance(items, list) or not all(isinstance(i, dict) for i in items):
+        return JSONResponse({"error": "Elementlar JSON obyektlar ro'yxati bo'lishi kerak"}, 400)
+    if bhm is not None and (isinstance(bhm, bool) or not isinstance(bhm, (int, float)) or not np.isfinite(bhm) or bhm <= 0):
+        return JSONResponse({"error": "'bhm' musbat son bo'lishi kerak"}, 400)
+    endpoint = ("inverse_" if registry is INVERSE else "") + ("batch" if many else "single")
+    try:
+        # Hisob (va diskdagi kurslarni o'qish) hodisalar siklini band qilmasligi uchun oqimlar hovuzida
+        cols, fx = await run_in_threadpool(_compute, calc, items, bhm, registry, endpoint)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, 400)
+    recs = _records(cols)
+    extra = {"rate_error": RATE_ERROR} if "total_usd" in cols and "USD" not in fx else {}
+    if many:
+        return JSONResponse({"calculator": calc, "count": len(recs), "items": recs, **extra})
+    # Bitta obyekt hisoblanmasa (modda sanada kuchga kirmagan) — 422, maydonlar va sababi bilan
+    return JSONResponse({"calculator": calc, **recs[0], **extra}, 422 if recs[0].get("error") else 200)
+
+
+async def single(request):
+    return await _handle(request, many=False)
+
+
+async def many(request):
+    return await _handle(request, many=True)
+
+
+async def inverse_single(request):
+    return await _handle(request, many=False, registry=INVERSE)
+
+
+async def inverse_many(request):
+    return await _handle(request, many=True, registry=INVERSE)
+
+
+async def health(request):
+    return JSONResponse({"ok": True, "calculators": list(CALCULATORS), "inverse": list(INVERSE)})
+
+
+async def rate_table(request):
+    table = _fx()
+    if "USD" not in table:
+        return JSONResponse({"error": RATE_ERROR, "rates": table}, 503)
+    return JSONResponse(table)
+
+
+async def metrics_text(request):
+    # Har ishchi jarayon o'z o'lchovlarini beradi (BOJXONA_METRICS=1 bo'lganda)
+    return Response(metrics.render(), media_type=metrics.CONTENT_TYPE)
+
+
+app = Starlette(routes=[
+    Route("/health", health),
+    Route("/v1/rates", rate_table),
+    Route("/metrics", metrics_text),
+    Route("/v1/inverse/{calc}", inverse_single, methods=["POST"]),
+    Route("/v1/inverse/{calc}/batch", inverse_many, methods=["POST"]),
+    Route("/v1/{calc}", single, methods=["POST"]),
+    Route("/v1/{calc}/batch", many, methods=["POST"]),
+])
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    p = argparse.ArgumentParser(description="Bojxona yig'imlari HTTP API")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8600)
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    a = p.parse_args()
+    uvicorn.run("bojxona.api:app", host=a.host, port=a.port, workers=a.workers, log_level="warning")
@@ -0,0 +1,282 @@
+import atexit
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+from bojxona import settings
+
+# ─── Audit jurnali: har bir hisoblangan yig'im (kirish qiymatlari, BHM, kurs, tafsilot) ───
+# Yozuvlar xotiradagi buferga qo'shiladi (faqat qulf + list.append); fon oqimi buferni vaqti-vaqti
+# bilan (yoki FLUSH_ROWS ga yetganda) Parquet segmentiga (zstd) yozadi. Segmentlar kun bo'yicha
+# bo'lingan: <root>/day=YYYY-MM-DD/seg-*.parquet. Fayllar faqat qo'shiladi (compact — kunning
+# segmentlarini bittaga birlashtiradi). Agregatsiya pyarrow.dataset orqali: faqat kerakli ustunlar
+# o'qiladi, kun oralig'i bo'yicha papkalar kesiladi, guruhlash Arrow ichida bajariladi.
+GROUP_KEYS = ("day", "calc", "article", "calc_date", "rate_date", "bhm", "usd_rate", "session")
+FLUSH_ROWS = 50_000
+FLUSH_SECONDS = 5.0
+# Buferdagi yozuvlar chegarasi: fon oqimi ulgurmasa (katta ommaviy yuklash) chaqiruvchi o'zi yozadi;
+# yozib bo'lmasa eng eski yozuvlar tashlab yuboriladi (dropped da hisoblanadi)
+MAX_PENDING = 4 * FLUSH_ROWS
+
+
+def _schema():
+    import pyarrow as pa
+
+    return pa.schema([
+        ("ts", pa.timestamp("us")), ("session", pa.string()), ("calc", pa.string()), ("article", pa.string()),
+        ("calc_date", pa.date32()), ("bhm", pa.float64()), ("usd_rate", pa.float64()), ("rate_date", pa.date32()),
+        ("total", pa.float64()), ("inputs", pa.string()), ("breakdown", pa.string()),
+    ])
+
+
+def _json(d):
+    return json.dumps(d, ensure_ascii=False, default=str, separators=(",", ":")) if d else None
+
+
+class AuditLog:
+    def __init__(self, root=None, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS, max_pending=MAX_PENDING):
+        self.root = root or settings.data_path("audit")
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self.max_pending = max(max_pending, flush_rows)
+        self.last_error = None
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._rows = []
+        self._frames = []
+        self._pending = 0
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, daemon=True, name="audit-flush")
+        self._thread.start()
+        atexit.register(self.close)
+
+    def __len__(self):
+        return self._pending
+
+    def append(self, calc, article, total, bhm, usd_rate=None, rate_date=None, calc_date=None,
+               inputs=None, breakdown=None, session=None):
+        # Bitta hisob; inputs/breakdown — {nom: qiymat} lug'atlari (JSON sifatida saqlanadi)
+        row = (datetime.now(), session, calc, article, calc_date, float(bhm),
+               None if usd_rate is None else float(usd_rate), rate_date, float(total), _json(inputs), _json(breakdown))
+        with self._lock:
+            self._rows.append(row)
+            self._pending += 1
+            full = self._pending >= self.flush_rows
+        if full:
+            self._wake.set()
+            self._bound()
+
+    def extend(self, calc, article, total, bhm, usd_rate=None, rate_date=None, calc_date=None,
+               inputs=None, breakdown=None, session=None):
+        # Ommaviy hisob: total/bhm/usd_rate/rate_date/calc_date massiv yoki skalyar (sana rejimida har qator
+        # o'z kursi va sanasi bilan); inputs/breakdown — {nom: massiv}
+        import numpy as np
+        import pandas as pd
+
+        total = np.asarray(total, dtype=float).ravel()
+        n = len(total)
+
+        def days(d):
+            return d if d is None or np.ndim(d) == 0 else pd.to_datetime(np.asarray(d), errors="coerce").date
+
+        df = pd.DataFrame({
+            "ts": pd.Timestamp(datetime.now()), "session": session, "calc": calc, "article": article,
+            "calc_date": days(calc_date), "bhm": np.broadcast_to(np.asarray(bhm, dtype=float), n),
+            "usd_rate": np.broadcast_to(np.asarray(np.nan if usd_rate is None else usd_rate, dtype=float), n),
+            "rate_date": days(rate_date), "total": total,
+            "inputs": self._json_rows(inputs, n), "breakdown": self._json_rows(breakdown, n),
+        })
+        with self._lock:
+            self._frames.append(df)
+            self._pending += n
+            full = self._pending >= self.flush_rows
+        if full:
+            self._wake.set()
+            self._bound()
+
+    def _bound(self):
+        if self._pending < self.max_pending:
+            return
+        try:
+            self.flush()
+        except Exception as e:
+            self.last_error = e
+            with self._lock:
+                while self._pending > self.max_pending and (self._frames or self._rows):
+                    if self._frames:
+                        n = len(self._frames.pop(0))
+                    else:
+                        n = len(self._rows)
+                        self._rows = []
+                    self._pending -= n
+                    self.dropped += n
+
+    @staticmethod
+    def _json_rows(cols, n):
+        # Qatorlar bo'yicha JSON — pandas ning vektorli to_json orqali
+        import pandas as pd
+
+        if not cols:
+            return None
+        df = pd.DataFrame({k: pd.Series(v).reset_index(drop=True) for k, v in cols.items()})
+        return df.to_json(orient="records", lines=True, force_ascii=False, date_format="iso").splitlines() if n else []
+
+    def _take(self):
+        with self._lock:
+            rows, frames = self._rows, self._frames
+            self._rows, self._frames, self._pending = [], [], 0
+        return rows, frames
+
+    def flush(self):
+        rows, frames = self._take()
+        if not rows and not frames:
+            return 0
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        try:
+            schema = _schema()
+            tables = [pa.Table.from_pandas(df, schema=schema, preserve_index=False) for df in frames]
+            if rows:
+                tables.append(pa.Table.from_arrays([pa.array(col, type=f.type) for col, f in zip(zip(*rows), schema)], schema=schema))
+            table = pa.concat_tables(tables)
+        except Exception:
+            self._restore(rows, frames)
+            raise
+        # Kun bo'yicha yozilgan qismlar qaytarilmaydi — qayta urinishda takrorlanmasligi uchun
+        days = pc.strftime(table["ts"], format="%Y-%m-%d")
+        with self._write_lock:
+            left = pc.unique(days).to_pylist()
+            while left:
+                part = table.filter(pc.equal(days, left[0]))
+                try:
+                    self._write(left[0], part)
+                except Exception:
+                    rest = table.filter(pc.is_in(days, pa.array(left)))
+                    self._restore([], [rest.to_pandas()])
+                    raise
+                left.pop(0)
+        return table.num_rows
+
+    def _restore(self, rows, frames):
+        with self._lock:
+            self._rows[:0] = rows
+            self._frames[:0] = frames
+            self._pending += len(rows) + sum(len(f) for f in frames)
+
+    def _write(self, day, table):
+        import pyarrow.parquet as pq
+
+        folder = os.path.join(self.root, f"day={day}")
+        os.makedirs(folder, exist_ok=True)
+        name = f"seg-{time.time_ns()}-{os.getpid()}.parquet"
+        tmp = os.path.join(folder, f".{name}.tmp")
+        pq.write_table(table, tmp, compression="zstd")
+        os.replace(tmp, os.path.join(folder, name))
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                # Yozib bo'lmagan yozuvlar yo'qolmasligi uchun keyingi urinishda qayta yoziladi
+                self.last_error = e
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=10)
+        self.flush()
+
+    def compact(self, day):
+        # Kunning barcha segmentlarini bitta faylga birlashtirish (eski segmentlar o'chiriladi)
+        import pyarrow.parquet as pq
+
+        folder = os.path.join(self.root, f"day={day}")
+        with self._write_lock:
+            segs = sorted(f for f in os.listdir(folder) if f.startswith("seg-")) if os.path.isdir(folder) else []
+            if len(segs) < 2:
+                return len(segs)
+            table = pq.read_table([os.path.join(folder, f) for f in segs], schema=_schema())
+            self._write(day, table)
+            for f in segs:
+                os.remove(os.path.join(folder, f))
+        return 1
+
+    def dataset(self):
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        os.makedirs(self.root, exist_ok=True)
+        part = ds.partitioning(pa.schema([("day", pa.string())]), flavor="hive")
+        return ds.dataset(self.root, format="parquet", partitioning=part, schema=_schema().append(pa.field("day", pa.string())),
+                          exclude_invalid_files=False, ignore_prefixes=["."])
+
+    def _filter(self, start, end):
+        import pyarrow.dataset as ds
+
+        cond = None
+        for op, d in ((lambda f, v: f >= v, start), (lambda f, v: f <= v, end)):
+            if d is not None:
+                c = op(ds.field("day"), str(d)[:10])
+                cond = c if cond is None else cond & c
+        return cond
+
+    def aggregate(self, by=("article",), start=None, end=None):
+        # Jami va soni guruhlar bo'yicha; start/end — kun (YYYY-MM-DD yoki date), ikkalasi ham kiradi
+        by = list(by)
+        unknown = [k for k in by if k not in GROUP_KEYS]
+        if unknown:
+            raise ValueError(f"Noma'lum guruhlash ustuni: {', '.join(unknown)}")
+        self.flush()
+        table = self.dataset().to_table(columns=by + ["total"], filter=self._filter(start, end))
+        res = table.group_by(by).aggregate([("total", "sum"), ("total", "count")]) if by else \
+            table.group_by([]).aggregate([("total", "sum"), ("total", "count")])
+        df = res.to_pandas().rename(columns={"total_sum": "total", "total_count": "count"})
+        return df.sort_values(by).reset_index(drop=True) if by else df
+
+    def records(self, start=None, end=None, limit=None):
+        # Batafsil yozuvlar (eng yangilari birinchi)
+        import pyarrow as pa
+
+        self.flush()
+        data = self.dataset()
+        if not limit:
+            table = data.to_table(filter=self._filter(start, end))
+        else:
+            # Kunlar yangisidan boshlab o'qiladi, limitga yetganda to'xtaydi
+            days = sorted((d[4:] for d in os.listdir(self.root) if d.startswith("day=")), reverse=True)
+            days = [d for d in days if (start is None or d >= str(start)[:10]) and (end is None or d <= str(end)[:10])]
+            parts, got = [], 0
+            for d in days:
+                t = data.to_table(filter=self._filter(d, d))
+                parts.append(t)
+                got += t.num_rows
+                if got >= limit:
+                    break
+            table = pa.concat_tables(parts) if parts else data.schema.empty_table()
+        df = table.to_pandas().sort_values("ts", ascending=False, kind="stable").reset_index(drop=True)
+        return df.head(limit) if limit else df
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default():
+    # Jarayon uchun bitta jurnal; BOJXONA_AUDIT=0 bo'lsa None
+    global _default
+    if not settings.AUDIT:
+        return None
+    with _default_lock:
+        if _default is None:
+            _default = AuditLog()
+    return _default
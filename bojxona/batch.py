@@ -0,0 +1,231 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from bojxona import fees, rates, schedule
+
+# ─── Ommaviy BYD hisoblash: fayl bo'laklab o'qiladi va bo'laklab yoziladi ───
+INPUT_COLUMNS = ("customs_usd", "initial_decl", "after_hours", "insp_h", "insp_ot")
+FX_COLUMNS = ("customs_value", "currency")
+OUTPUT_COLUMNS = ("base", "disc", "ah_fee", "insp_fee", "insp_ot_fee", "total")
+# Parquet natijasida float64 bo'ladigan ustunlar; rate_date — sana, qolganlari (kiritilgan matn, bayroqlar) — string
+NUMERIC_COLUMNS = ("customs_usd", "customs_value", "insp_h", "insp_ot", "bhm", "usd_rate", *OUTPUT_COLUMNS)
+# Hisoblanmagan qatorlar sababi (bo'sh — qator hisoblangan)
+ERROR_COLUMN = "error"
+# price_file natijasida saqlanadigan xato qator raqamlari soni (jami soni alohida hisoblanadi)
+FAILED_ROWS_MAX = 10_000
+INPUT_TYPES = ("csv", "xlsx", "parquet")
+OUTPUT_TYPES = ("csv", "parquet")
+CHUNK_ROWS = 100_000
+
+_TRUE = {"1", "1.0", "true", "ha", "yes", "y", "x", "+"}
+
+
+def to_flags(col):
+    if col.dtype == bool:
+        return col.to_numpy()
+    if pd.api.types.is_numeric_dtype(col):
+        return col.fillna(0).to_numpy() != 0
+    return col.astype(str).str.strip().str.lower().isin(_TRUE).to_numpy()
+
+
+def to_numbers(col, default=np.nan):
+    # Son bo'lmagan matn — NaN; bo'sh katak — default (majburiy ustunlar uchun NaN qoladi)
+    num = pd.to_numeric(col, errors="coerce")
+    if not np.isnan(default):
+        num = num.where(col.notna(), default)
+    return num.to_numpy(dtype=float)
+
+
+def failed_rows(mask, offset=0):
+    # Qator raqamlari 1 dan (sarlavha hisobga olinmaydi)
+    return (np.flatnonzero(mask) + offset + 1).tolist()
+
+
+def _errors(checks, n):
+    # {ustun: qiymatlar} — NaN yoki manfiy qiymatli ustunlar nomi qator bo'yicha
+    names = np.array(list(checks))
+    bad = np.column_stack([~(np.broadcast_to(v, n) >= 0) for v in checks.values()])
+    err = np.full(n, "", dtype=object)
+    rows = bad.any(axis=1)
+    err[rows] = [f"noto'g'ri qiymat: {', '.join(names[b])}" for b in bad[rows]]
+    return err
+
+
+def _dates(df):
+    # O'qib bo'lmaydigan sana — NaT (qator xatosi), butun fayl to'xtamaydi
+    return schedule.as_days(pd.to_datetime(df["date"], errors="coerce"))
+
+
+def price_frame(df, bhm, fx=None, sched=None, history=None):
+    # fx: {valyuta: 1 birlik uchun so'm}, USD kaliti bo'lishi shart; currency ustuni bo'lsa ishlatiladi.
+    # history (rates.RateHistory) berilgan va date ustuni bo'lsa, valyuta har qator sanasidagi kurs bilan
+    # o'giriladi (as-of); usd_rate va rate_date ustunlari qo'shiladi.
+    # sched berilgan va date ustuni bo'lsa, har qator o'z sanasidagi tarif va BHM bilan hisoblanadi.
+    # Sanasi bo'sh yoki kursi topilmagan qatorlar hisoblanmaydi, sababi error ustunida.
+    dated = sched is not None or (history is not None and "currency" in df)
+    days = _dates(df) if dated and "date" in df else None
+    no_rate = None
+    if "currency" in df:
+        if "customs_value" not in df:
+            raise ValueError("Faylda 'currency' bilan birga 'customs_value' ustuni bo'lishi kerak")
+        if history is not None and days is not None:
+            usd_rate, rate_date = history.asof("USD", days)
+            per_unit = history.asof(df["currency"], days)[0]
+            no_rate = ~np.isfinite(per_unit * usd_rate)
+            df["customs_usd"] = to_numbers(df["customs_value"]) * per_unit / usd_rate
+            df["usd_rate"], df["rate_date"] = usd_rate, rate_date
+        else:
+            if not fx:
+                raise ValueError("Valyuta kurslari mavjud emas")
+            df["customs_usd"] = rates.to_uzs(to_numbers(df["customs_value"]), df["currency"], fx) / fx["USD"]
+    elif "customs_usd" not in df:
+        raise ValueError("Faylda 'customs_usd' ustuni yo'q")
+    n = len(df)
+    zeros = pd.Series(np.zeros(n), index=df.index)
+    usd = to_numbers(df["customs_usd"])
+    insp_h, insp_ot = to_numbers(df.get("insp_h", zeros), 0.0), to_numbers(df.get("insp_ot", zeros), 0.0)
+    args = (to_flags(df.get("initial_decl", zeros)), to_flags(df.get("after_hours", zeros)), insp_h, insp_ot)
+    if sched is not None and days is not None:
+        res = sched.byd_total(usd, days, *args)
+        df["bhm"] = res["bhm"]
+    else:
+        res = fees.byd_total(usd, bhm, *args)
+    # Bo'sh yoki noto'g'ri qiymatli qatorlar hisoblanmaydi (NaN), sababi error ustunida
+    err = _errors({"customs_usd": usd, "insp_h": insp_h, "insp_ot": insp_ot}, n)
+    if no_rate is not None:
+        err[no_rate] = "sana uchun kurs yo'q"
+    if days is not None:
+        err[np.isnat(days)] = "sana bo'sh yoki noto'g'ri"
+    bad = err != ""
+    total = np.broadcast_to(res["total"], n)
+    err[~bad & ~np.isfinite(total)] = "sana uchun stavka yoki BHM yo'q"
+    bad = err != ""
+    for k in OUTPUT_COLUMNS:
+        df[k] = np.where(bad, np.nan, np.broadcast_to(res[k], n))
+    df[ERROR_COLUMN] = err
+    return df
+
+
+def _file_type(name):
+    ext = os.path.splitext(name)[1].lower().lstrip(".")
+    if ext not in INPUT_TYPES:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan fayl turi: .{ext}")
+    return ext
+
+
+def count_rows(src, name):
+    kind = _file_type(name)
+    if kind == "parquet":
+        import pyarrow.parquet as pq
+        rows = pq.ParquetFile(src).metadata.num_rows
+    elif kind == "xlsx":
+        from openpyxl import load_workbook
+        wb = load_workbook(src, read_only=True, data_only=True)
+        rows = max((wb.active.max_row or 1) - 1, 0)
+        wb.close()
+    else:
+        rows, last = 0, b"\n"
+        for block in iter(lambda: src.read(1 << 20), b""):
+            rows += block.count(b"\n")
+            last = block[-1:]
+        rows += last != b"\n"
+        rows = max(rows - 1, 0)
+    src.seek(0)
+    return rows
+
+
+def iter_chunks(src, name, chunk_rows=CHUNK_ROWS):
+    kind = _file_type(name)
+    if kind == "csv":
+        yield from pd.read_csv(src, chunksize=chunk_rows)
+    elif kind == "parquet":
+        import pyarrow.parquet as pq
+        for b in pq.ParquetFile(src).iter_batches(batch_size=chunk_rows):
+            yield b.to_pandas()
+    else:
+        from openpyxl import load_workbook
+        wb = load_workbook(src, read_only=True, data_only=True)
+        try:
+            rows = wb.active.iter_rows(values_only=True)
+            header = [str(h).strip() for h in next(rows, ())]
+            buf = []
+            for r in rows:
+                buf.append(r)
+                if len(buf) == chunk_rows:
+                    yield pd.DataFrame(buf, columns=header)
+                    buf = []
+            if buf:
+                yield pd.DataFrame(buf, columns=header)
+        finally:
+            wb.close()
+
+
+def _output_schema(columns):
+    import pyarrow as pa
+
+    return pa.schema([(c, pa.float64() if c in NUMERIC_COLUMNS else pa.date32() if c == "rate_date" else pa.string())
+                      for c in map(str, columns)])
+
+
+def _to_table(df, schema):
+    # Har bo'lak bir xil sxemaga keltiriladi: bo'lakdagi dtype (int/float, bo'sh ustun) ga bog'liq emas
+    import pyarrow as pa
+
+    cols = []
+    for f in schema:
+        col = df[f.name] if f.name in df else pd.Series(None, index=df.index, dtype=object)
+        if pa.types.is_floating(f.type):
+            col = pd.to_numeric(col, errors="coerce").astype(float)
+        elif pa.types.is_date(f.type):
+            col = pd.to_datetime(col, errors="coerce").dt.date
+        else:
+            col = col.astype("string")
+        cols.append(pa.array(col, type=f.type, from_pandas=True))
+    return pa.Table.from_arrays(cols, schema=schema)
+
+
+def price_file(src, name, bhm, dst, out_type="csv", chunk_rows=CHUNK_ROWS, progress=None, fx=None, sched=None, on_chunk=None, history=None):
+    # on_chunk(bo'lak) — har hisoblangan bo'lak uchun (masalan, audit jurnaliga yozish).
+    # Natija: {"rows": qatorlar soni, "failed": hisoblanmagan qatorlar soni, "failed_rows": ularning raqamlari,
+    #          "versions": [(boshlanish, izoh)] — qo'llangan tarif versiyalari, "bhm": qo'llangan BHM qiymatlari}
+    if out_type not in OUTPUT_TYPES:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan natija formati: {out_type}")
+    total = count_rows(src, name) if progress else None
+    done = n_failed = 0
+    failed = []
+    versions, bhms = set(), set()
+    writer = None
+    try:
+        for chunk in iter_chunks(src, name, chunk_rows):
+            chunk = price_frame(chunk, bhm, fx, sched, history)
+            bad = (chunk[ERROR_COLUMN] != "").to_numpy()
+            n_failed += int(bad.sum())
+            if len(failed) < FAILED_ROWS_MAX:
+                failed += failed_rows(bad, done)[:FAILED_ROWS_MAX - len(failed)]
+            if "bhm" in chunk:
+                # Sana rejimi: har qator o'z sanasidagi versiya va BHM bilan hisoblangan
+                versions.update(sched.version(_dates(chunk[~bad])).tolist())
+                bhms.update(chunk.loc[~bad, "bhm"].unique().tolist())
+            elif (~bad).any():
+                bhms.add(float(bhm))
+            if on_chunk:
+                on_chunk(chunk)
+            if out_type == "csv":
+                chunk.to_csv(dst, mode="w" if done == 0 else "a", header=done == 0, index=False)
+            else:
+                import pyarrow.parquet as pq
+                if writer is None:
+                    writer = pq.ParquetWriter(dst, _output_schema(chunk.columns), compression="zstd")
+                writer.write_table(_to_table(chunk, writer.schema))
+            done += len(chunk)
+            if progress:
+                progress(done, total)
+    finally:
+        if writer is not None:
+            writer.close()
+    if done == 0:
+        raise ValueError("Faylda deklaratsiyalar topilmadi")
+    return {"rows": done, "failed": n_failed, "failed_rows": failed, "bhm": sorted(bhms),
+            "versions": [(str(sched.starts[v]), sched.notes[v]) for v in sorted(versions) if v >= 0]}
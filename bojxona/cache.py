@@ -0,0 +1,50 @@
+import functools
+import threading
+from collections import OrderedDict
+
+# ─── Sessiyalar o'rtasida umumiy, chegaralangan LRU kesh (hit/miss hisoblagichlari bilan) ───
+# Qiymatlar o'qish uchun: keshdan olingan obyektni o'zgartirmang.
+
+
+class LRUCache:
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get_or_build(self, key, build):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        # Qurish qulfdan tashqarida; parallel qurilsa birinchi yozilgani qoladi
+        value = build()
+        with self._lock:
+            value = self._data.setdefault(key, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+        return value
+
+    def memoize(self, fn):
+        @functools.wraps(fn)
+        def wrapper(*args):
+            return self.get_or_build((fn.__qualname__, *args), lambda: fn(*args))
+        return wrapper
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._data),
+                "maxsize": self.maxsize, "hit_ratio": self.hits / total if total else 0.0}
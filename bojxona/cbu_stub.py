@@ -0,0 +1,68 @@
+import json
+import sys
+import threading
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from bojxona.rates import cbu_date
+
+# ─── cbu.uz o'rnini bosuvchi lokal server (oflayn sinov va benchmarklar uchun) ───
+PREFIX = "/uz/arkhiv-kursov-valyut/json"
+DEFAULT_RATES = {"USD": 12650.0, "EUR": 13720.0, "RUB": 155.0, "CNY": 1760.0, "KZT": 24.5}
+CODES = {"USD": "840", "EUR": "978", "RUB": "643", "CNY": "156", "KZT": "398"}
+
+
+def _lookup(series, day):
+    # Sanaga bog'langan qatorlar: so'ralgan kundan oldingi oxirgi kurs qaytadi
+    if not isinstance(series, dict):
+        return series, day
+    known = [d for d in series if d <= day]
+    if not known:
+        return None, day
+    d = max(known)
+    return series[d], d
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        srv = self.server
+        srv.hits += 1
+        parts = self.path[len(PREFIX):].strip("/").split("/") if self.path.startswith(PREFIX) else []
+        if srv.fail or len(parts) not in (1, 2):
+            self.send_error(503 if srv.fail else 404)
+            return
+        ccy = parts[0].upper()
+        day = parts[1] if len(parts) == 2 else date.today().isoformat()
+        wanted = srv.rates if ccy == "ALL" else {ccy: srv.rates[ccy]} if ccy in srv.rates else {}
+        items = []
+        for i, (code, series) in enumerate(wanted.items(), 1):
+            rate, d = _lookup(series, day)
+            if rate is None:
+                continue
+            items.append({"id": i, "Code": CODES.get(code, "000"), "Ccy": code, "Nominal": "1",
+                          "Rate": f"{rate:.2f}", "Diff": "0", "Date": cbu_date(d)})
+        body = json.dumps(items).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(rates=None, port=0):
+    srv = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    srv.rates = dict(DEFAULT_RATES if rates is None else rates)
+    srv.fail = False
+    srv.hits = 0
+    srv.base_url = f"http://127.0.0.1:{srv.server_address[1]}{PREFIX}"
+    threading.Thread(target=srv.serve_forever, daemon=True, name="cbu-stub").start()
+    return srv
+
+
+if __name__ == "__main__":
+    srv = serve(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"CBU_BASE_URL={srv.base_url}")
+    threading.Event().wait()
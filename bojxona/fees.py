@@ -0,0 +1,131 @@
+import numpy as np
+
+# ─── VM № 55, 1-ilova: stavkalar (BHM ulushida) ───
+ARTICLE_RATES = {
+    "1b": 0.25,    # Tranzit / qayta ishlash (1 deklaratsiya)
+    "1v": 2.5,     # Naqd valyuta deklaratsiyasi (yuridik)
+    "1g": 0.25,    # Bojxona kirim orderi (1 dona)
+    "1d": 0.02,    # Xalqaro kuryerlik (1 kg brutto)
+    "2": 0.25,     # BYD o'zgartirish / qo'shimcha (1 dona)
+    "3a": 0.25,    # Ish vaqtidan tashqari rasmiylashtiruv (1 BYD)
+    "3b-1": 0.25,  # Bojxona ko'rigi — ish vaqtida (1 soat)
+    "3b-2": 2.0,   # Bojxona ko'rigi — ish vaqtidan tashqari (1 soat)
+    "4a": 0.03,    # Bojxona ombori: 1-10 sutka (1 tonna/kun)
+    "4b": 0.04,    # Bojxona ombori: 10+ sutka (1 tonna/kun)
+    "5a": 2.0,     # Avtomobil hamrohligi: 200 km gacha
+    "5b": 5.0,     # Avtomobil hamrohligi: 200 km dan ortiq
+    "6": 0.75,     # Dastlabki qarorni qabul qilish
+    "7a": 0.05,    # Chegara ombori: 1-5 kun (100 kg/kun)
+    "7b": 0.07,    # Chegara ombori: 6-15 kun (100 kg/kun)
+    "7v": 0.10,    # Chegara ombori: 15+ kun (100 kg/kun)
+    "7g": 0.15,    # Tez buziladigan — chegara ombori (100 kg/kun)
+    "8": 0.10,     # Tranzit deklaratsiyasiga o'zgartirish
+    "9": 1.0,      # Intellektual mulk reyestriga kiritish (1 obyekt)
+}
+
+# 1a-modda: qiymat chegaralari (USD, yuqori chegara kiradi) va stavkalar
+BYD_BREAKS = np.array([10000, 20000, 40000, 60000, 100000, 200000, 500000, 1000000], dtype=float)
+BYD_RATES = np.array([1.0, 1.5, 2.5, 4.0, 7.0, 10.0, 15.0, 20.0, 25.0])
+BYD_LABELS = np.array(["1 × BHM", "1.5 × BHM", "2.5 × BHM", "4 × BHM", "7 × BHM",
+                       "10 × BHM", "15 × BHM", "20 × BHM", "25 × BHM"])
+INITIAL_DISCOUNT = 0.2
+
+# 4- va 7-modda: kun bosqichlari chegaralari (har bosqich boshlanadigan kun soni)
+STORAGE_4_EDGES = np.array([0, 10], dtype=float)
+STORAGE_4_RATES = np.array([ARTICLE_RATES["4a"], ARTICLE_RATES["4b"]])
+STORAGE_7_EDGES = np.array([0, 5, 15], dtype=float)
+STORAGE_7_RATES = np.array([ARTICLE_RATES["7a"], ARTICLE_RATES["7b"], ARTICLE_RATES["7v"]])
+
+ESCORT_KM_LIMIT = 200
+
+
+def rate(code, rates=None):
+    # rates — sanaga bog'langan stavkalar {modda: stavka yoki qatorlar bo'yicha massiv} (Schedule.article_rates);
+    # berilmasa amaldagi VM № 55 stavkalari. Ro'yxatda yo'q modda shu sanada kuchga kirmagan — NaN
+    if rates is None:
+        return ARTICLE_RATES[code]
+    return np.asarray(rates.get(code, np.nan), dtype=float)
+
+
+def _tier_rates(default, codes, rates):
+    # Bosqich stavkalari oxirgi o'qda: (..., bosqichlar)
+    if rates is None:
+        return default
+    return np.stack(np.broadcast_arrays(*(rate(c, rates) for c in codes)), axis=-1)
+
+
+def _tier(usd):
+    # Bosqich indeksi va qiymat yaroqliligi (NaN va manfiy qiymatlar hech bir bosqichga tushmaydi)
+    usd = np.asarray(usd, dtype=float)
+    valid = usd >= 0
+    return np.searchsorted(BYD_BREAKS, np.where(valid, usd, 0.0), side="left"), valid
+
+
+def byd_tier(usd):
+    tier, valid = _tier(usd)
+    if not np.all(valid):
+        raise ValueError("Bojxona qiymati manfiy bo'lmagan son bo'lishi kerak")
+    return tier
+
+
+def byd_fee(usd, bhm):
+    # Yaroqsiz qiymat (NaN, manfiy) — NaN yig'im
+    tier, valid = _tier(usd)
+    return np.where(valid, BYD_RATES[tier], np.nan) * bhm
+
+
+def byd_label(usd):
+    tier, valid = _tier(usd)
+    return np.where(valid, BYD_LABELS[tier], "—")
+
+
+def byd_total(customs_usd, bhm, initial=False, after_hours=False, insp_h=0, insp_ot=0):
+    base = byd_fee(customs_usd, bhm)
+    disc = np.where(initial, base * INITIAL_DISCOUNT, 0.0)
+    ah_fee = np.where(after_hours, ARTICLE_RATES["3a"] * bhm, 0.0)
+    insp_fee = ARTICLE_RATES["3b-1"] * bhm * np.asarray(insp_h, dtype=float)
+    insp_ot_fee = ARTICLE_RATES["3b-2"] * bhm * np.asarray(insp_ot, dtype=float)
+    total = (base - disc) + ah_fee + insp_fee + insp_ot_fee
+    return {"base": base, "disc": disc, "ah_fee": ah_fee, "insp_fee": insp_fee,
+            "insp_ot_fee": insp_ot_fee, "total": total}
+
+
+def tier_days(days, edges):
+    # Har bosqichga tushgan kunlar: clip(kun - boshlanish, 0, bosqich uzunligi)
+    days = np.asarray(days, dtype=float)[..., None]
+    widths = np.append(np.diff(edges), np.inf)
+    return np.clip(days - edges, 0, widths)
+
+
+def storage_4(w_t, days, bhm, rates=None):
+    split = tier_days(days, STORAGE_4_EDGES)
+    fees = _tier_rates(STORAGE_4_RATES, ("4a", "4b"), rates) * np.asarray(bhm, dtype=float)[..., None] * np.asarray(w_t, dtype=float)[..., None] * split
+    return {"d1": split[..., 0], "d2": split[..., 1],
+            "f_d1": fees[..., 0], "f_d2": fees[..., 1],
+            "total": fees[..., 0] + fees[..., 1]}
+
+
+def storage_7(w_kg, days, bhm, perishable=False, rates=None):
+    h100 = np.asarray(w_kg, dtype=float) / 100.0
+    split = tier_days(days, STORAGE_7_EDGES)
+    fees = _tier_rates(STORAGE_7_RATES, ("7a", "7b", "7v"), rates) * np.asarray(bhm, dtype=float)[..., None] * h100[..., None] * split
+    perishable = np.asarray(perishable, dtype=bool)
+    pf = rate("7g", rates) * bhm * h100 * np.asarray(days, dtype=float)
+    tiered = fees[..., 0] + fees[..., 1] + fees[..., 2]
+    return {"a1": split[..., 0], "a2": split[..., 1], "a3": split[..., 2],
+            "pf1": fees[..., 0], "pf2": fees[..., 1], "pf3": fees[..., 2],
+            "total": np.where(perishable, pf, tiered)}
+
+
+def escort_rate(km, rates=None):
+    km = np.asarray(km, dtype=float)
+    return np.where(km <= ESCORT_KM_LIMIT, rate("5a", rates), rate("5b", rates))
+
+
+def escort_fee(km, vehicles, bhm, rates=None):
+    return escort_rate(km, rates) * bhm * np.asarray(vehicles, dtype=float)
+
+
+def flat_fee(article, n, bhm, rates=None):
+    # 1b, 1v, 1g, 1d, 2, 6, 8, 9 — miqdorga to'g'ri proporsional yig'imlar
+    return rate(article, rates) * bhm * np.asarray(n, dtype=float)
@@ -0,0 +1,167 @@
+import numpy as np
+
+from bojxona import fees
+
+# ─── Teskari hisob: yig'im byudjetiga sig'adigan eng katta qiymat va keyingi bosqich chegarasi ───
+# Har modda BHM=1 va birlik miqdor uchun bo'lakli-chiziqli funksiya (tugunlar) sifatida bir marta
+# quriladi. Sakrash bir x da ikki tugun bilan beriladi: yuqori chegara pastki bosqichga kiradi
+# (byd_fee dagi searchsorted side="left" kabi). So'rov — np.searchsorted (O(log n)) + interpolyatsiya.
+# Byudjet aniq chegaradagi yig'imga teng bo'lsa bo'linishdagi yaxlitlash xatosi shu nisbiy ulush bilan yutiladi
+EPS = 1e-12
+
+
+class Piecewise:
+    def __init__(self, x, y, tail=0.0, integer=False):
+        # x — kamaymaydigan, y — kamaymaydigan; tail — oxirgi tugundan keyingi qiyalik; integer — butun sonli o'q
+        self.x = np.asarray(x, dtype=float)
+        self.y = np.asarray(y, dtype=float)
+        self.tail = float(tail)
+        self.integer = integer
+        self.breaks = np.unique(self.x[1:])
+
+    def __call__(self, v):
+        x, y = self.x, self.y
+        v = np.asarray(v, dtype=float)
+        i = np.clip(np.searchsorted(x, v, side="left"), 1, len(x) - 1)
+        x0, x1, y0, y1 = x[i - 1], x[i], y[i - 1], y[i]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inside = y0 + (y1 - y0) * np.where(x1 > x0, (v - x0) / (x1 - x0), 1.0)
+        beyond = y[-1] + self.tail * (v - x[-1]) if self.tail else y[-1]
+        return np.where(v <= x[0], y[0], np.where(v > x[-1], beyond, inside))
+
+    def max_x(self, budget):
+        # f(x) <= budget bo'lgan eng katta x; birinchi tugundagi qiymat ham sig'masa — NaN, chegarasiz — inf
+        x, y = self.x, self.y
+        b = np.asarray(budget, dtype=float)
+        b = b + np.abs(b) * EPS
+        i = np.searchsorted(y, b, side="right") - 1
+        k = np.clip(i, 0, len(x) - 1)
+        j = np.minimum(k + 1, len(x) - 1)
+        x0, x1, y0, y1 = x[k], x[j], y[k], y[j]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            inside = x0 + np.where(y1 > y0, (b - y0) * (x1 - x0) / (y1 - y0), 0.0)
+            beyond = x[-1] + (b - y[-1]) / self.tail if self.tail > 0 else np.full(b.shape, np.inf)
+        res = np.where(i < 0, np.nan, np.where(k == len(x) - 1, beyond, inside))
+        return np.floor(res) if self.integer else res
+
+    def next_break(self, v):
+        # Joriy qiymat bosqichining oxirgi qiymati (chegaraning o'zida — o'zi); bo'lmasa — NaN
+        v = np.asarray(v, dtype=float)
+        k = np.searchsorted(self.breaks, v, side="left")
+        return np.where(k < len(self.breaks), self.breaks[np.minimum(k, len(self.breaks) - 1)], np.nan)
+
+    def rate(self, v):
+        # Pog'onali funksiyada qiymatdagi pog'ona, kunlarda — v-kun stavkasi (BHM ulushida)
+        v = np.asarray(v, dtype=float)
+        return self(v) - self(v - 1) if self.integer else self(v)
+
+    def after(self, v):
+        # Chegaradan keyingi birinchi qiymat (keyingi kun yoki chegaradan keyingi son)
+        return v + 1 if self.integer else np.nextafter(v, np.inf)
+
+
+def _steps(breaks, rates):
+    x, y = [0.0], [rates[0]]
+    for b, lo, hi in zip(breaks, rates[:-1], rates[1:]):
+        x += [b, b]
+        y += [lo, hi]
+    return Piecewise(x, y)
+
+
+def _tiers(edges, rates):
+    # Kun bosqichlari: har bosqichda qiyalik — shu bosqich stavkasi
+    y = np.concatenate([[0.0], np.cumsum(rates[:-1] * np.diff(edges))])
+    return Piecewise(edges, y, tail=rates[-1], integer=True)
+
+
+BYD = _steps(fees.BYD_BREAKS, fees.BYD_RATES)
+STORAGE_4 = _tiers(fees.STORAGE_4_EDGES, fees.STORAGE_4_RATES)
+STORAGE_7 = _tiers(fees.STORAGE_7_EDGES, fees.STORAGE_7_RATES)
+ESCORT = _steps([fees.ESCORT_KM_LIMIT], [fees.ARTICLE_RATES["5a"], fees.ARTICLE_RATES["5b"]])
+CURVES = {"byd": BYD, "storage4": STORAGE_4, "storage7": STORAGE_7, "escort": ESCORT}
+# Miqdorga proporsional moddalar (fees.flat_fee); 1d — kg (kasr), qolganlari — dona
+FLAT_ARTICLES = ("1b", "1v", "1g", "1d", "2", "6", "8", "9")
+FRACTIONAL = ("1d",)
+
+
+def _arr(v):
+    return np.asarray(v, dtype=float)
+
+
+def byd_value(budget, bhm, initial=False):
+    # Asosiy BYD yig'imi (dastlabki deklaratsiya chegirmasi bilan) byudjetga sig'adigan eng katta qiymat (USD)
+    factor = np.where(initial, 1 - fees.INITIAL_DISCOUNT, 1.0)
+    per = _arr(bhm) * factor
+    usd = BYD.max_x(_arr(budget) / per)
+    return {"max": usd, "fee": np.where(np.isnan(usd), np.nan, BYD(usd) * per)}
+
+
+def storage4_days(budget, w_t, bhm):
+    per = _arr(bhm) * _arr(w_t)
+    days = STORAGE_4.max_x(_arr(budget) / per)
+    return {"max": days, "fee": STORAGE_4(days) * per}
+
+
+def storage4_weight(budget, days, bhm):
+    per = _arr(bhm) * STORAGE_4(days)
+    with np.errstate(divide="ignore"):
+        w_t = _arr(budget) / per
+    return {"max": w_t, "fee": np.where(np.isinf(w_t), 0.0, w_t * per)}
+
+
+def _storage7_unit(days, perishable):
+    return np.where(perishable, fees.ARTICLE_RATES["7g"] * _arr(days), STORAGE_7(days))
+
+
+def storage7_days(budget, w_kg, bhm, perishable=False):
+    per = _arr(bhm) * _arr(w_kg) / 100.0
+    unit = _arr(budget) / per
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days = np.where(perishable, np.floor(unit * (1 + EPS) / fees.ARTICLE_RATES["7g"]), STORAGE_7.max_x(unit))
+    return {"max": days, "fee": _storage7_unit(days, perishable) * per}
+
+
+def storage7_weight(budget, days, bhm, perishable=False):
+    per = _arr(bhm) * _storage7_unit(days, perishable) / 100.0
+    with np.errstate(divide="ignore"):
+        w_kg = _arr(budget) / per
+    return {"max": w_kg, "fee": np.where(np.isinf(w_kg), 0.0, w_kg * per)}
+
+
+def escort_km(budget, vehicles, bhm):
+    per = _arr(bhm) * _arr(vehicles)
+    km = ESCORT.max_x(_arr(budget) / per)
+    return {"max": km, "fee": np.where(np.isnan(km), np.nan, ESCORT(km) * per)}
+
+
+def escort_vehicles(budget, km, bhm):
+    per = fees.escort_rate(km) * _arr(bhm)
+    n = np.floor(_arr(budget) * (1 + EPS) / per)
+    return {"max": n, "fee": n * per}
+
+
+def flat_n(budget, article, bhm):
+    # Byudjetga sig'adigan miqdor; article — bitta modda yoki har qator uchun
+    art = [str(a).strip() for a in np.atleast_1d(article)]
+    bad = sorted(set(art) - set(FLAT_ARTICLES))
+    if bad:
+        raise ValueError(f"Noma'lum modda: {', '.join(bad)} (ruxsat: {', '.join(FLAT_ARTICLES)})")
+    rate = np.array([fees.ARTICLE_RATES[a] for a in art])
+    frac = np.isin(art, FRACTIONAL)
+    if np.ndim(article) == 0:
+        rate, frac = rate[0], frac[0]
+    per = rate * _arr(bhm)
+    n = _arr(budget) / per
+    n = np.where(frac, n, np.floor(n * (1 + EPS)))
+    return {"max": n, "fee": n * per}
+
+
+def next_tier(kind, value):
+    # Joriy qiymat bosqichining oxiri, unga qadar zaxira va chegaradan keyingi stavka (BHM ulushida)
+    if kind not in CURVES:
+        raise ValueError(f"Noma'lum bosqichli modda: {kind}")
+    curve = CURVES[kind]
+    value = _arr(value)
+    nxt = curve.next_break(value)
+    after = np.where(np.isnan(nxt), np.nan, curve.rate(curve.after(nxt)))
+    return {"next": nxt, "headroom": nxt - value, "rate": curve.rate(value), "rate_next": after}
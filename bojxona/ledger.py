@@ -0,0 +1,203 @@
+import numpy as np
+
+from bojxona import batch, fees, schedule
+
+# ─── Ombor reyestri: ko'p yuk bo'yicha saqlash yig'imi (4- va 7-modda) ───
+# Yukning n kunlik yig'imi n ning bo'lakli-chiziqli funksiyasi: F(n) = Σ Δr_k · max(0, n − e_k).
+# Kelgan kun 1-kun, chiqarilgan kun ham hisobga kiradi, shuning uchun har bosqich chegarasi
+# b = kelish + e_k − 1 sanasida boshlanadigan "rampa" hodisasi (c = Δr_k · vazn); chiqarilganda
+# max(b, chiqish) sanasida −c hodisasi. Butun ombor bo'yicha D sanagacha yig'im:
+#   T(D) = Σ c_j · max(0, D − t_j) = D · Σc − Σ(c · t)   (t_j < D)
+# hodisalar sanasi bo'yicha prefiks yig'indilardan searchsorted bilan — yuklar bo'yicha siklsiz.
+# Miqdorlar BHM ulushida saqlanadi; so'mga so'rov paytida bitta BHM bilan o'tkaziladi.
+ARTICLES = ("4", "7")
+UNIT_KG = {"4": 1000.0, "7": 100.0}
+TIERS = {
+    "4": (fees.STORAGE_4_EDGES, fees.STORAGE_4_RATES),
+    "7": (fees.STORAGE_7_EDGES, fees.STORAGE_7_RATES),
+    "7g": (np.zeros(1), np.array([fees.ARTICLE_RATES["7g"]])),
+}
+COLUMNS = ("id", "article", "weight_kg", "arrival", "release", "perishable")
+
+
+def _days(dates):
+    # datetime64[D] -> epoch kunlari (int64) va NaT maskasi
+    d = np.asarray(schedule.as_days(dates), dtype="datetime64[D]")
+    return d.astype(np.int64), np.isnat(d)
+
+
+class StorageLedger:
+    def __init__(self):
+        self.ids = np.array([], dtype=object)
+        self.kind = np.array([], dtype=object)
+        self.units = np.zeros(0)
+        self.arrival = np.zeros(0, dtype=np.int64)
+        self.release = np.zeros(0, dtype=np.int64)
+        self.is_open = np.zeros(0, dtype=bool)
+        self._row = {}
+        # Hodisalar: sana bo'yicha yig'ilgan (t, c); yangilari _pending da, so'rovda qo'shiladi
+        self._t = np.zeros(0, dtype=np.int64)
+        self._c = np.zeros(0)
+        self._pending = []
+        self._cum_c = self._cum_ct = np.zeros(1)
+        # Kunlik inkremental holat: joriy sana, shu sanagacha jami va kunlik o'sish (BHM ulushida)
+        self.day = None
+        self.total = 0.0
+        self.slope = 0.0
+
+    def __len__(self):
+        return len(self.ids)
+
+    @staticmethod
+    def _tier_events(kind, units, arrival):
+        t, c, rows = [], [], []
+        for k in np.unique(kind):
+            edges, rates = TIERS[k]
+            m = np.flatnonzero(kind == k)
+            step = np.diff(rates, prepend=0.0)
+            t.append((arrival[m, None] + edges.astype(np.int64) - 1).ravel())
+            c.append((units[m, None] * step).ravel())
+            rows.append(np.repeat(m, len(edges)))
+        if not t:
+            return np.zeros(0, dtype=np.int64), np.zeros(0), np.zeros(0, dtype=np.int64)
+        return np.concatenate(t), np.concatenate(c), np.concatenate(rows)
+
+    def _push(self, t, c):
+        if not len(t):
+            return
+        if self.day is not None:
+            past = t <= self.day
+            self.total += float((c * np.maximum(self.day - t, 0)).sum())
+            self.slope += float(c[past].sum())
+        self._pending.append((t, c))
+
+    def _events(self):
+        if self._pending:
+            t = np.concatenate([self._t] + [p[0] for p in self._pending])
+            c = np.concatenate([self._c] + [p[1] for p in self._pending])
+            self._t, inv = np.unique(t, return_inverse=True)
+            self._c = np.bincount(inv, weights=c, minlength=len(self._t))
+            self._cum_c = np.concatenate([[0.0], np.cumsum(self._c)])
+            self._cum_ct = np.concatenate([[0.0], np.cumsum(self._c * self._t)])
+            self._pending = []
+        return self._t, self._c
+
+    def add(self, ids, articles, weight_kg, arrival, release=None, perishable=False):
+        ids = np.asarray(ids, dtype=object)
+        n = len(ids)
+        articles = np.broadcast_to(np.asarray(articles, dtype=str), n)
+        bad = sorted(set(articles.tolist()) - set(ARTICLES))
+        if bad:
+            raise ValueError(f"Noma'lum ombor moddasi: {', '.join(bad)} (4 yoki 7 bo'lishi kerak)")
+        dup = [i for i in ids.tolist() if i in self._row]
+        if dup or len(set(ids.tolist())) != n:
+            raise ValueError(f"Takrorlangan yuk raqami: {dup[0] if dup else 'fayl ichida'}")
+        w = np.broadcast_to(np.asarray(weight_kg, dtype=float), n)
+        if (w <= 0).any() or np.isnan(w).any():
+            raise ValueError("Og'irlik musbat bo'lishi kerak")
+        a, a_nat = (np.broadcast_to(x, n) for x in _days(arrival))
+        if a_nat.any():
+            raise ValueError("Kelish sanasi ko'rsatilmagan qatorlar bor")
+        if release is None:
+            r, r_open = np.zeros(n, dtype=np.int64), np.ones(n, dtype=bool)
+        else:
+            r, r_open = (np.broadcast_to(x, n) for x in _days(release))
+        if (~r_open & (r < a)).any():
+            raise ValueError("Chiqarish sanasi kelish sanasidan oldin bo'lishi mumkin emas")
+        kind = np.where((articles == "7") & np.broadcast_to(np.asarray(perishable, dtype=bool), n), "7g", articles).astype(object)
+        units = w / np.where(articles == "4", UNIT_KG["4"], UNIT_KG["7"])
+
+        t, c, rows = self._tier_events(kind, units, a)
+        closed = ~r_open[rows]
+        self._push(np.concatenate([t, np.maximum(t, r[rows])[closed]]), np.concatenate([c, -c[closed]]))
+
+        start = len(self.ids)
+        self.ids = np.concatenate([self.ids, ids])
+        self.kind = np.concatenate([self.kind, kind])
+        self.units = np.concatenate([self.units, units])
+        self.arrival = np.concatenate([self.arrival, a])
+        self.release = np.concatenate([self.release, r])
+        self.is_open = np.concatenate([self.is_open, r_open])
+        self._row.update(zip(ids.tolist(), range(start, start + n)))
+
+    def release_items(self, ids, dates):
+        # Omborda turgan yuklarni chiqarish: faqat shu yuklarning hodisalari qo'shiladi
+        try:
+            rows = np.array([self._row[i] for i in np.atleast_1d(np.asarray(ids, dtype=object)).tolist()], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Reyestrda bunday yuk yo'q: {e.args[0]}")
+        if not self.is_open[rows].all():
+            raise ValueError("Yuk allaqachon chiqarilgan")
+        r, nat = _days(dates)
+        r = np.broadcast_to(r, len(rows))
+        if np.any(nat) or (r < self.arrival[rows]).any():
+            raise ValueError("Chiqarish sanasi noto'g'ri")
+        t, c, sub = self._tier_events(self.kind[rows], self.units[rows], self.arrival[rows])
+        self._push(np.maximum(t, r[sub]), -c)
+        self.release[rows] = r
+        self.is_open[rows] = False
+
+    def _at(self, days):
+        t, _ = self._events()
+        idx = np.searchsorted(t, days, side="left")
+        return days * self._cum_c[idx] - self._cum_ct[idx], self._cum_c[idx]
+
+    def accrued(self, dates, bhm):
+        # D sanagacha (D kiradi) butun ombor bo'yicha hisoblangan yig'im, so'm
+        d, nat = _days(dates)
+        total, _ = self._at(d)
+        return np.where(nat, np.nan, total * bhm)
+
+    def daily(self, dates, bhm):
+        # D kuni uchun hisoblangan yig'im (butun ombor), so'm
+        d, nat = _days(dates)
+        _, slope = self._at(d)
+        return np.where(nat, np.nan, slope * bhm)
+
+    def advance(self, date):
+        # Joriy sanani oldinga surish: faqat oraliqda bosqichi o'zgargan yuklarning hodisalari ishlanadi
+        d = int(_days(date)[0])
+        t, c = self._events()
+        if self.day is None:
+            total, _ = self._at(np.int64(d))
+            self.day, self.total = d, float(total)
+            self.slope = float(self._cum_c[np.searchsorted(t, d, side="right")])
+            return self.total
+        if d < self.day:
+            raise ValueError("Reyestr sanasini orqaga surib bo'lmaydi")
+        lo, hi = np.searchsorted(t, [self.day, d], side="right")
+        wt, wc = t[lo:hi], c[lo:hi]
+        self.total += self.slope * (d - self.day) + float((wc * (d - wt)).sum())
+        self.slope += float(wc.sum())
+        self.day = d
+        return self.total
+
+    def items(self, date, bhm):
+        # Har bir yuk bo'yicha D sanagacha saqlangan kunlar va yig'im (formulalar fees dan)
+        d = int(_days(date)[0])
+        end = np.where(self.is_open, d, np.minimum(self.release, d))
+        days = np.maximum(end - self.arrival + 1, 0).astype(float)
+        fee = np.zeros(len(self))
+        m4 = self.kind == "4"
+        fee[m4] = fees.storage_4(self.units[m4], days[m4], bhm)["total"]
+        m7 = ~m4
+        fee[m7] = fees.storage_7(self.units[m7] * UNIT_KG["7"], days[m7], bhm, self.kind[m7] == "7g")["total"]
+        in_stock = (self.arrival <= d) & (self.is_open | (self.release >= d))
+        return {"days": days, "fee": fee, "in_stock": in_stock}
+
+    @classmethod
+    def from_frame(cls, df):
+        missing = [k for k in ("article", "weight_kg", "arrival") if k not in df]
+        if missing:
+            raise ValueError(f"Faylda ustun(lar) yo'q: {', '.join(missing)}")
+        ids = df["id"].astype(str).to_numpy() if "id" in df else np.arange(1, len(df) + 1).astype(str)
+        articles = df["article"].astype(str).str.strip().str.removesuffix(".0").to_numpy()
+        try:
+            arrival = schedule.as_days(df["arrival"])
+            release = schedule.as_days(df["release"]) if "release" in df else None
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Sana ustunida noto'g'ri qiymat: {e}")
+        perishable = batch.to_flags(df["perishable"]) if "perishable" in df else False
+        ledger = cls()
+        ledger.add(ids, articles, batch.to_numbers(df["weight_kg"]), arrival, release, perishable)
+        return ledger
@@ -0,0 +1,227 @@
+import bisect
+import contextlib
+import logging
+import threading
+import time
+
+from bojxona import settings
+
+# ─── Ish vaqtidagi o'lchovlar: hisoblagichlar, gistogrammalar, Prometheus matn formati ───
+# BOJXONA_METRICS o'chiq bo'lsa (standart) inc/observe/timer hech narsa yozmaydi: bitta
+# mantiqiy tekshiruv va umumiy bo'sh kontekst menejeri. Yoqilganda yozuvlar bitta qulf ostida
+# lug'atga tushadi; eksport paytida "kollektorlar" (kesh statistikasi, sessiyalar) chaqiriladi.
+ENABLED = settings.METRICS
+# Sekundlarda; oxirgi bucket — +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Shu vaqt ichida rerun qilgan sessiya faol hisoblanadi
+SESSION_WINDOW = 300
+
+HELP = {
+    "bojxona_rerun_seconds": "Streamlit rerun davomiyligi (sahifa bo'yicha; fragment yorlig'i — faqat fragment qayta ishga tushishi)",
+    "bojxona_cbu_fetch_seconds": "cbu.uz so'rovi davomiyligi",
+    "bojxona_cbu_fetch_failures_total": "Muvaffaqiyatsiz cbu.uz so'rovlari",
+    "bojxona_page_views_total": "Sahifa ochilishlari",
+    "bojxona_api_request_seconds": "HTTP API so'rovi davomiyligi (kalkulyator bo'yicha)",
+    "bojxona_cache_hits_total": "Kesh topilishlari",
+    "bojxona_cache_misses_total": "Kesh topilmasliklari",
+    "bojxona_cache_hit_ratio": "Kesh topilish ulushi",
+    "bojxona_cache_entries": "Keshdagi yozuvlar soni",
+    "bojxona_active_sessions": f"Oxirgi {SESSION_WINDOW} s ichida rerun qilgan sessiyalar",
+}
+
+_lock = threading.Lock()
+_counters = {}
+_histograms = {}
+_collectors = []
+_sessions = {}
+_NOOP = contextlib.nullcontext()
+_pruner = None
+log = logging.getLogger(__name__)
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def inc(name, value=1, **labels):
+    if not ENABLED:
+        return
+    k = _key(name, labels)
+    with _lock:
+        _counters[k] = _counters.get(k, 0) + value
+
+
+def observe(name, seconds, **labels):
+    if not ENABLED:
+        return
+    k = _key(name, labels)
+    i = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        h = _histograms.get(k)
+        if h is None:
+            h = _histograms[k] = [[0] * (len(BUCKETS) + 1), 0.0, 0]
+        h[0][i] += 1
+        h[1] += seconds
+        h[2] += 1
+
+
+class _Timer:
+    __slots__ = ("name", "labels", "t0")
+
+    def __init__(self, name, labels):
+        self.name, self.labels = name, labels
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe(self.name, time.perf_counter() - self.t0, **self.labels)
+
+
+def timer(name, **labels):
+    return _Timer(name, labels) if ENABLED else _NOOP
+
+
+def session_seen(session_id):
+    global _pruner
+    if not ENABLED:
+        return
+    with _lock:
+        _sessions[session_id] = time.time()
+        if _pruner is None:
+            # Eksport bo'lmasa ham eski sessiyalar har SESSION_WINDOW da tozalanadi
+            _pruner = threading.Thread(target=_prune_loop, daemon=True, name="metrics-sessions")
+            _pruner.start()
+
+
+def _prune_loop():
+    while True:
+        time.sleep(SESSION_WINDOW)
+        active_sessions()
+
+
+def active_sessions():
+    cutoff = time.time() - SESSION_WINDOW
+    with _lock:
+        for sid in [s for s, t in _sessions.items() if t < cutoff]:
+            del _sessions[sid]
+        return len(_sessions)
+
+
+def register(collector):
+    # collector() → [(nom, {yorliqlar}, qiymat), ...] — eksport paytida o'qiladigan o'lchovlar
+    _collectors.append(collector)
+
+
+def cache_collector(name, cache):
+    def collect():
+        s = cache.stats()
+        return [("bojxona_cache_hits_total", {"cache": name}, s["hits"]),
+                ("bojxona_cache_misses_total", {"cache": name}, s["misses"]),
+                ("bojxona_cache_hit_ratio", {"cache": name}, s["hit_ratio"]),
+                ("bojxona_cache_entries", {"cache": name}, s["size"])]
+    register(collect)
+
+
+def reset():
+    with _lock:
+        _counters.clear()
+        _histograms.clear()
+        _sessions.clear()
+
+
+def snapshot():
+    # {"counters": {(nom, yorliqlar): qiymat}, "histograms": {(nom, yorliqlar): (bucketlar, yig'indi, soni)}, "gauges": ...}
+    with _lock:
+        counters = dict(_counters)
+        histograms = {k: (list(b), s, n) for k, (b, s, n) in _histograms.items()}
+    gauges = {("bojxona_active_sessions", ()): active_sessions()}
+    for collect in _collectors:
+        for name, labels, value in collect():
+            gauges[_key(name, labels)] = value
+    return {"counters": counters, "histograms": histograms, "gauges": gauges}
+
+
+def quantile(buckets, q):
+    # Gistogrammadan kvantil bahosi (bucket ichida chiziqli, Prometheus histogram_quantile kabi)
+    n = sum(buckets)
+    if not n:
+        return float("nan")
+    rank, seen = q * n, 0
+    for i, c in enumerate(buckets):
+        if seen + c >= rank and c:
+            lo = BUCKETS[i - 1] if i else 0.0
+            if i == len(BUCKETS):
+                return lo
+            return lo + (BUCKETS[i] - lo) * (rank - seen) / c
+        seen += c
+    return BUCKETS[-1]
+
+
+def _labels(labels, extra=()):
+    items = list(labels) + list(extra)
+    if not items:
+        return ""
+    esc = (str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n") for _, v in items)
+    return "{" + ",".join(f'{k}="{v}"' for (k, _), v in zip(items, esc)) + "}"
+
+
+def render():
+    # Prometheus text exposition format 0.0.4
+    snap = snapshot()
+    out, typed = [], set()
+
+    def head(name, kind):
+        if name not in typed:
+            typed.add(name)
+            out.append(f"# HELP {name} {HELP.get(name, name)}")
+            out.append(f"# TYPE {name} {kind}")
+
+    for (name, labels), value in sorted(snap["counters"].items()):
+        head(name, "counter")
+        out.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), value in sorted(snap["gauges"].items()):
+        head(name, "counter" if name.endswith("_total") else "gauge")
+        out.append(f"{name}{_labels(labels)} {value}")
+    for (name, labels), (buckets, total, count) in sorted(snap["histograms"].items()):
+        head(name, "histogram")
+        cum = 0
+        for le, c in zip(BUCKETS + ("+Inf",), buckets):
+            cum += c
+            out.append(f"{name}_bucket{_labels(labels, [('le', le)])} {cum}")
+        out.append(f"{name}_sum{_labels(labels)} {total}")
+        out.append(f"{name}_count{_labels(labels)} {count}")
+    return "\n".join(out) + "\n"
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def serve(port, host=None):
+    # Streamlit jarayoni uchun alohida /metrics serveri (fon oqimida); port band bo'lsa — None
+    host = settings.METRICS_HOST if host is None else host
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        server = ThreadingHTTPServer((host, port), Handler)
+    except OSError as e:
+        log.warning("/metrics serveri ishga tushmadi (%s:%s): %s", host, port, e)
+        return None
+    threading.Thread(target=server.serve_forever, daemon=True, name="metrics-http").start()
+    return server
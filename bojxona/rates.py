@@ -0,0 +1,318 @@
+import argparse
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from bojxona import metrics, settings
+
+# ─── CBU valyuta kurslari: diskdagi ombor + fonda yangilash ───
+RETRY_AFTER = 60
+# Tarixiy yuklash: har kun uchun urinishlar soni va birinchi kutish (keyin ikki baravardan)
+BACKFILL_RETRIES = 3
+BACKFILL_BACKOFF = 0.5
+
+
+def cbu_date(iso):
+    return datetime.strptime(iso, "%Y-%m-%d").strftime("%d.%m.%Y")
+
+
+def iso_date(cbu):
+    return datetime.strptime(cbu, "%d.%m.%Y").strftime("%Y-%m-%d")
+
+
+def fetch_all(day=None, base_url=None, timeout=None):
+    # Bitta so'rov bilan sanadagi barcha valyutalar: {ccy: (1 birlik uchun so'm, sana)}
+    import requests
+
+    day = day or date.today().isoformat()
+    url = f"{base_url or settings.CBU_URL}/all/{day}/"
+    try:
+        with metrics.timer("bojxona_cbu_fetch_seconds"):
+            resp = requests.get(url, timeout=timeout or settings.CBU_TIMEOUT)
+            resp.raise_for_status()
+            data = resp.json()
+    except Exception:
+        metrics.inc("bojxona_cbu_fetch_failures_total")
+        raise
+    if not data:
+        raise ValueError(f"CBU javobi bo'sh: {day}")
+    return {item["Ccy"]: (float(item["Rate"]) / float(item.get("Nominal") or 1), iso_date(item["Date"]))
+            for item in data}
+
+
+def _factorize(ccys, shape, strict=True):
+    # strict=False — valyutasi bo'sh qatorlar kodi -1 bo'lib qoladi
+    if np.ndim(ccys) == 0:
+        return np.zeros(shape, dtype=int), [str(ccys).strip().upper()]
+    import pandas as pd
+
+    codes, uniq = pd.factorize(pd.Series(ccys, dtype="string").str.strip().str.upper())
+    if strict and (codes < 0).any():
+        raise ValueError("Valyuta ko'rsatilmagan qatorlar bor")
+    return codes, list(uniq)
+
+
+def to_uzs(values, ccys, table):
+    # Valyuta ustunini bir marta faktorizatsiya qilib, kurslarni massiv sifatida qo'llash
+    values = np.asarray(values, dtype=float)
+    codes, uniq = _factorize(ccys, values.shape)
+    missing = [c for c in uniq if c != "UZS" and c not in table]
+    if missing:
+        raise ValueError(f"Noma'lum valyuta: {', '.join(missing)}")
+    per_unit = np.array([1.0 if c == "UZS" else table[c] for c in uniq])
+    return values * per_unit[codes]
+
+
+class RateStore:
+    def __init__(self, path=None):
+        self.path = path or settings.data_path("rates.sqlite")
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("""CREATE TABLE IF NOT EXISTS rates (
+            ccy TEXT NOT NULL, date TEXT NOT NULL, rate REAL NOT NULL,
+            fetched_at REAL NOT NULL, PRIMARY KEY (ccy, date))""")
+        # So'ralgan kunlar (dam olish kunlari CBU oldingi sana kursini qaytaradi — qayta so'ralmasligi uchun)
+        self._db.execute("CREATE TABLE IF NOT EXISTS fetched_days (day TEXT PRIMARY KEY, fetched_at REAL NOT NULL)")
+        self._db.commit()
+
+    def put_many(self, rows, fetched_at=None):
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)",
+                                 [(ccy, day, rate, fetched_at) for ccy, day, rate in rows])
+            self._db.commit()
+
+    def put_day(self, day, rows, fetched_at=None):
+        # Bir kunlik javob: kurslar va "kun olingan" belgisi bitta tranzaksiyada
+        fetched_at = fetched_at or time.time()
+        with self._lock:
+            self._db.executemany("INSERT OR REPLACE INTO rates VALUES (?, ?, ?, ?)",
+                                 [(ccy, d, rate, fetched_at) for ccy, d, rate in rows])
+            self._db.execute("INSERT OR REPLACE INTO fetched_days VALUES (?, ?)", (day, fetched_at))
+            self._db.commit()
+
+    def fetched_days(self, start, end):
+        with self._lock:
+            rows = self._db.execute("SELECT day FROM fetched_days WHERE day BETWEEN ? AND ?", (start, end)).fetchall()
+        return {d for d, in rows}
+
+    def history(self, ccys=None):
+        # [(ccy, sana, kurs), ...] valyuta va sana bo'yicha saralangan (PRIMARY KEY indeksi orqali)
+        sql, args = "SELECT ccy, date, rate FROM rates", ()
+        if ccys is not None:
+            ccys = list(ccys)
+            sql += f" WHERE ccy IN ({','.join('?' * len(ccys))})"
+            args = ccys
+        with self._lock:
+            return self._db.execute(sql + " ORDER BY ccy, date", args).fetchall()
+
+    def put(self, ccy, day, rate, fetched_at=None):
+        self.put_many([(ccy, day, rate)], fetched_at)
+
+    def get(self, ccy, day):
+        with self._lock:
+            row = self._db.execute("SELECT rate FROM rates WHERE ccy = ? AND date = ?", (ccy, day)).fetchone()
+        return row[0] if row else None
+
+    def latest(self):
+        # {ccy: (kurs, sana, olingan vaqt)} — har valyuta uchun eng so'nggi sana
+        with self._lock:
+            rows = self._db.execute("""SELECT r.ccy, r.rate, r.date, r.fetched_at FROM rates r
+                JOIN (SELECT ccy, MAX(date) AS date FROM rates GROUP BY ccy) m
+                ON r.ccy = m.ccy AND r.date = m.date""").fetchall()
+        return {ccy: (rate, day, fetched_at) for ccy, rate, day, fetched_at in rows}
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+def _fetch_day(day, base_url, retries, backoff):
+    for attempt in range(retries + 1):
+        try:
+            return fetch_all(day, base_url)
+        except Exception:
+            if attempt == retries:
+                raise
+            time.sleep(backoff * 2 ** attempt)
+
+
+def backfill(start, end=None, store=None, base_url=None, workers=None, retries=BACKFILL_RETRIES,
+             backoff=BACKFILL_BACKOFF, progress=None):
+    # [start, end] oralig'idagi har kun uchun barcha valyutalar diskka yoziladi; avval olingan kunlar
+    # so'ralmaydi. Bir vaqtda ko'pi bilan `workers` ta so'rov; xato bo'lsa kun qayta urinib ko'riladi.
+    # Natija: {"days": oraliqdagi kunlar, "fetched": yangi olinganlar, "failed": {kun: xato}}
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    store = store or RateStore()
+    start = date.fromisoformat(str(start)[:10])
+    end = min(date.fromisoformat(str(end or date.today())[:10]), date.today())
+    if end < start:
+        raise ValueError("Oraliq oxiri boshidan oldin")
+    days = [(start + timedelta(n)).isoformat() for n in range((end - start).days + 1)]
+    have = store.fetched_days(days[0], days[-1])
+    todo = [d for d in days if d not in have]
+    fetched, failed = 0, {}
+    with ThreadPoolExecutor(workers or settings.BACKFILL_WORKERS, thread_name_prefix="cbu-backfill") as ex:
+        futures = {ex.submit(_fetch_day, d, base_url, retries, backoff): d for d in todo}
+        for i, fut in enumerate(as_completed(futures), 1):
+            day = futures[fut]
+            try:
+                got = fut.result()
+            except Exception as e:
+                failed[day] = str(e)
+            else:
+                store.put_day(day, [(ccy, d, rate) for ccy, (rate, d) in got.items()])
+                fetched += 1
+            if progress:
+                progress(i, len(todo))
+    return {"days": len(days), "fetched": fetched, "failed": dict(sorted(failed.items()))}
+
+
+class RateHistory:
+    # Sana bo'yicha kurslar: valyuta → (saralangan sanalar, kurslar). Qator sanasiga "as-of" bog'lanadi —
+    # shu sanagacha e'lon qilingan oxirgi kurs (np.searchsorted, valyuta bo'yicha bittadan).
+    def __init__(self, rows):
+        # rows — valyuta va sana bo'yicha saralangan (RateStore.history)
+        from itertools import groupby
+
+        self.series = {}
+        for ccy, grp in groupby(rows, key=lambda r: r[0]):
+            _, days, values = zip(*grp)
+            self.series[ccy] = (np.array(days, dtype="datetime64[D]"), np.array(values, dtype=float))
+
+    @classmethod
+    def load(cls, store=None, ccys=None):
+        return cls((store or RateStore()).history(ccys))
+
+    def __len__(self):
+        return sum(len(d) for d, _ in self.series.values())
+
+    def span(self, ccy="USD"):
+        days = self.series.get(ccy, ((),))[0]
+        return (str(days[0]), str(days[-1])) if len(days) else None
+
+    def asof(self, ccys, days):
+        # (1 birlik uchun so'm, kurs sanasi) massivlari; UZS — 1.0. Sanasi yoki valyutasi bo'sh, valyutasi
+        # noma'lum yoki sanasi yuklangan kurslardan oldin bo'lgan qatorlar — NaN / NaT (xato ko'tarilmaydi:
+        # ommaviy hisobda bunday qatorlar error ustuniga tushadi, qolganlari hisoblanadi)
+        from bojxona import schedule
+
+        days = np.atleast_1d(schedule.as_days(days))
+        codes, uniq = _factorize(ccys, days.shape, strict=False)
+        out = np.full(days.shape, np.nan)
+        when = np.full(days.shape, np.datetime64("NaT"), dtype="datetime64[D]")
+        dated = ~np.isnat(days)
+        for i, ccy in enumerate(uniq):
+            rows = np.flatnonzero((codes == i) & dated)
+            if ccy == "UZS":
+                out[rows], when[rows] = 1.0, days[rows]
+                continue
+            if ccy not in self.series:
+                continue
+            known, values = self.series[ccy]
+            idx = np.searchsorted(known, days[rows], side="right") - 1
+            rows, idx = rows[idx >= 0], idx[idx >= 0]
+            out[rows], when[rows] = values[idx], known[idx]
+        return out, when
+
+    def to_uzs(self, values, ccys, days):
+        return np.asarray(values, dtype=float) * self.asof(ccys, days)[0]
+
+
+class RateService:
+    # Oxirgi kurslar xotirada va diskda; eskirgan bo'lsa barchasi bitta so'rov bilan fonda yangilanadi
+    def __init__(self, store=None, base_url=None, max_age=None):
+        self.store = store or RateStore()
+        self.base_url = base_url
+        self.max_age = settings.RATE_MAX_AGE if max_age is None else max_age
+        self.last_error = None
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._thread = None
+        self._next_check = 0.0
+        self._latest = self.store.latest()
+
+    def rates(self):
+        # Xotiradagi kurslar yangi bo'lsa — "hit", fonda yangilash boshlansa — "miss"
+        if self._due():
+            self.misses += 1
+            self.refresh()
+        else:
+            self.hits += 1
+        return {ccy: (rate, day) for ccy, (rate, day, _) in self._latest.items()}
+
+    def rate_table(self):
+        return {ccy: rate for ccy, (rate, _) in self.rates().items()}
+
+    def rate(self, ccy="USD"):
+        return self.rates().get(ccy)
+
+    def _due(self):
+        now = time.time()
+        if now < self._next_check:
+            return False
+        usd = self._latest.get("USD")
+        return usd is None or usd[1] < date.today().isoformat() or now - usd[2] >= self.max_age
+
+    def refresh(self, wait=False):
+        with self._lock:
+            t = self._thread
+            if t is None or not t.is_alive():
+                t = self._thread = threading.Thread(target=self._refresh, daemon=True, name="cbu-refresh")
+                t.start()
+        if wait:
+            t.join()
+
+    def _fresh_on_disk(self):
+        # Boshqa jarayon (masalan, API ishchisi) allaqachon yangilagan bo'lsa, CBU ga so'rov yuborilmaydi
+        latest = self.store.latest()
+        usd = latest.get("USD")
+        if usd is None or usd[1] < date.today().isoformat() or time.time() - usd[2] >= self.max_age:
+            return False
+        self._latest = latest
+        self._next_check = usd[2] + self.max_age
+        return True
+
+    def _refresh(self):
+        if self._fresh_on_disk():
+            return
+        try:
+            got = fetch_all(base_url=self.base_url)
+            now = time.time()
+            self.store.put_many([(ccy, day, rate) for ccy, (rate, day) in got.items()], now)
+            self._latest = {**self._latest, **{ccy: (rate, day, now) for ccy, (rate, day) in got.items()}}
+            self.last_error = None
+            self._next_check = now + self.max_age
+        except Exception as e:
+            self.last_error = e
+            self._next_check = time.time() + RETRY_AFTER
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._latest),
+                "maxsize": None, "hit_ratio": self.hits / total if total else 0.0}
+
+    def usd_rate(self):
+        got = self.rate("USD")
+        if got is None:
+            return settings.FALLBACK_USD_RATE, "Avtomatik olinmadi", False
+        return got[0], cbu_date(got[1]), True
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description="CBU kurslarini sana oralig'i bo'yicha diskka yuklash")
+    p.add_argument("start", help="YYYY-MM-DD")
+    p.add_argument("end", nargs="?", help="YYYY-MM-DD (standart — bugun)")
+    p.add_argument("--workers", type=int)
+    p.add_argument("--base-url")
+    a = p.parse_args()
+    res = backfill(a.start, a.end, base_url=a.base_url, workers=a.workers,
+                   progress=lambda i, n: print(f"\r{i}/{n}", end="", flush=True))
+    print(f"\n{res['days']} kun: {res['fetched']} ta yangi yuklandi, {len(res['failed'])} ta xato")
+    for day, err in res["failed"].items():
+        print(f"  {day}: {err}")
@@ -0,0 +1,354 @@
+import io
+import math
+import os
+import pickle
+import re
+import zipfile
+from collections import deque
+
+from bojxona import fees, settings
+
+# ─── Hisob-varaqlar: har deklaratsiya (yoki mijoz) uchun Excel/PDF, bitta ZIP ga oqim bilan ───
+# Narxlangan qatorlar bo'laklab o'qiladi; hisob-varaqlar BATCH tadan vazifalarga bo'linib
+# jarayonlar hovuzida chiziladi. Bir vaqtda ko'pi bilan workers × 2 ta vazifa ishlov berilmoqda —
+# tayyor fayllar darhol ZIP ga yoziladi, shuning uchun xotira partiya hajmiga bog'liq emas.
+FORMATS = ("xlsx", "pdf")
+BATCH = 100
+# Mijoz bo'yicha guruhlashda vaqtinchalik fayllarga yozish/o'qish qismi (qatorlar)
+SPILL_BATCH = 1000
+ID_COLUMNS = ("declaration_id", "id")
+CLIENT_COLUMN = "client"
+TITLE = "BOJXONA YIG'IMLARI BO'YICHA HISOB-VARAQ"
+SUBTITLE = "VM No 55 · 31.01.2025 qarori"
+# Narxlab bo'lmagan qatorlar (xato ustuni to'ldirilgan yoki jami NaN) 0 so'm deb chop etilmaydi;
+# ERROR_COLUMN — batch.ERROR_COLUMN (ishchi jarayonlarga pandas yuklamaslik uchun import qilinmaydi)
+NA = "stavka mavjud emas"
+ERROR_COLUMN = "error"
+
+
+def _fmt(n):
+    return f"{n:,.0f}"
+
+
+def _num(rec, key, default=0.0):
+    # Ustun yo'q yoki bo'sh — default; o'qib bo'lmaydigan qiymat — NaN (0 ga aylantirilmaydi)
+    v = rec.get(key)
+    if v is None:
+        return default
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def _priced(rec):
+    return not rec.get(ERROR_COLUMN) and math.isfinite(_num(rec, "total", float("nan")))
+
+
+def _amount(v):
+    return v if math.isfinite(v) else NA
+
+
+# ─── Hisob-varaq tarkibi (format-mustaqil) ───
+def statement(key, recs, meta, by=None):
+    # {"name", "title", "fields": [(nom, qiymat)], "columns", "rows", "total"}
+    bhm = _num(recs[0], "bhm", meta.get("bhm", 0.0))
+    usd_rate = meta.get("usd_rate") or 0.0
+    # Bitta qator narxlanmagan bo'lsa ham jami chop etilmaydi — qisman yig'indi noto'g'ri hisob bo'ladi
+    total = sum(_num(r, "total") for r in recs) if all(map(_priced, recs)) else None
+    fields = [("Mijoz", str(recs[0].get(CLIENT_COLUMN, "—")) if by is None else str(key))]
+    if by is None:
+        fields.append(("Deklaratsiya", str(key)))
+    else:
+        fields.append(("Deklaratsiyalar soni", f"{len(recs):,}"))
+    fields += [("Sana", str(recs[0].get("date") or meta.get("date", ""))[:10]),
+               ("BHM", f"{_fmt(bhm)} so'm" if math.isfinite(bhm) else NA), ("1 USD", f"{_fmt(usd_rate)} so'm" if usd_rate else "—")]
+    if by is None:
+        r = recs[0]
+        usd = _num(r, "customs_usd", float("nan"))
+        fields.append(("Bojxona qiymati", f"${usd:,.2f}" if math.isfinite(usd) else "—"))
+        if not _priced(r):
+            fields.append(("Xato", str(r.get(ERROR_COLUMN) or NA)))
+            rows = [(f"Asosiy yig'im ({fees.byd_label(usd)})", NA)]
+        else:
+            rows = [(f"Asosiy yig'im ({fees.byd_label(usd)})", _num(r, "base"))]
+            if _num(r, "disc"):
+                rows.append(("Dastlabki chegirma (-20%)", _amount(-_num(r, "disc"))))
+            if _num(r, "ah_fee"):
+                rows.append(("Ish vaqtidan tashqari (BHM 25%)", _amount(_num(r, "ah_fee"))))
+            if _num(r, "insp_fee"):
+                rows.append((f"Ko'rik ish vaqtida ({_num(r, 'insp_h'):g} soat × BHM 25%)", _amount(_num(r, "insp_fee"))))
+            if _num(r, "insp_ot_fee"):
+                rows.append((f"Ko'rik ish vaqtidan tashqari ({_num(r, 'insp_ot'):g} soat × BHM 2)", _amount(_num(r, "insp_ot_fee"))))
+        columns = ("Qism", "Miqdor (so'm)")
+    else:
+        columns = ("Deklaratsiya", "Qiymat (USD)", "Stavka", "Chegirma", "Qo'shimcha", "Jami (so'm)")
+        rows = []
+        for i, r in enumerate(recs, 1):
+            usd = _num(r, "customs_usd", float("nan"))
+            if _priced(r):
+                rows.append((_decl_id(r, i), usd if math.isfinite(usd) else "—", str(fees.byd_label(usd)), -_num(r, "disc") or 0.0,
+                             _amount(_num(r, "ah_fee") + _num(r, "insp_fee") + _num(r, "insp_ot_fee")), _num(r, "total")))
+            else:
+                rows.append((_decl_id(r, i), usd if math.isfinite(usd) else "—", str(fees.byd_label(usd)), "—", "—", NA))
+    return {"name": str(key), "title": TITLE, "fields": fields, "columns": columns, "rows": rows,
+            "total": total, "total_usd": total / usd_rate if usd_rate and total is not None else None}
+
+
+def _decl_id(rec, default):
+    for k in ID_COLUMNS:
+        if rec.get(k) is not None and rec.get(k) == rec.get(k):
+            return str(rec[k])
+    return str(default)
+
+
+# ─── Excel (openpyxl, write_only: varaq oqim bilan yoziladi) ───
+XLSX_INT, XLSX_USD = "#,##0", "#,##0.00"
+
+
+def render_xlsx(st):
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+    from openpyxl.utils import get_column_letter
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Hisob-varaq")
+    ncol = len(st["columns"])
+    ws.column_dimensions["A"].width = 48
+    for j in range(2, ncol + 1):
+        ws.column_dimensions[get_column_letter(j)].width = 18
+    bold = Font(bold=True)
+
+    def cell(v, strong=False, fmt=None):
+        c = WriteOnlyCell(ws, value=v)
+        if strong:
+            c.font = bold
+        if fmt:
+            c.number_format = fmt
+        return c
+
+    ws.append([cell(st["title"], True)])
+    ws.append([SUBTITLE])
+    ws.append([])
+    for k, v in st["fields"]:
+        ws.append([cell(k, True), v])
+    ws.append([])
+    ws.append([cell(c, True) for c in st["columns"]])
+    usd_col = 1 if ncol > 2 else -1
+    for r in st["rows"]:
+        ws.append([cell(v, fmt=XLSX_USD if j == usd_col else XLSX_INT) if isinstance(v, float) else v for j, v in enumerate(r)])
+    pad = [None] * (ncol - 2)
+    ws.append([cell("JAMI", True), *pad, cell(NA, True) if st["total"] is None else cell(round(st["total"]), True, XLSX_INT)])
+    if st["total_usd"] is not None:
+        ws.append(["USD da", *pad, cell(round(st["total_usd"], 2), fmt=XLSX_USD)])
+    buf = io.BytesIO()
+    wb.save(buf)
+    return buf.getvalue()
+
+
+# ─── PDF (fpdf2) ───
+# Matn Latin-1 ga sig'sa — standart Helvetica/Courier shriftlari (fayl kichik). Sig'masa (masalan, kirill
+# ismlar) — settings.REPORT_FONT dagi (yoki tizimdagi DejaVuSans) TrueType shrift qism-to'plam sifatida
+# joylanadi. Shrift topilmasa — xato: "?" chop etilmaydi.
+PAGE_W, MARGIN = 595, 50
+LINE = 16
+FONT_PATHS = ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+              "/usr/share/fonts/TTF/DejaVuSans.ttf", "/Library/Fonts/Arial Unicode.ttf", "C:/Windows/Fonts/arial.ttf")
+_PDF_SUBST = str.maketrans({"−": "-", "≈": "~", "№": "No", "ʻ": "'", "‘": "'", "’": "'"})
+
+
+def _pdf_text(s):
+    return str(s).translate(_PDF_SUBST)
+
+
+def _unicode_font():
+    path = settings.REPORT_FONT or next((p for p in FONT_PATHS if os.path.exists(p)), None)
+    if not path:
+        return None, None
+    bold = re.sub(r"(\.[ot]tf)$", r"-Bold\1", path, flags=re.I)
+    return path, bold if os.path.exists(bold) else path
+
+
+def _pdf_fonts(pdf, st):
+    # (matn shrifti, raqamlar shrifti)
+    texts = [st["title"], SUBTITLE, *(t for kv in st["fields"] for t in kv), *st["columns"],
+             *(v for r in st["rows"] for v in r if isinstance(v, str))]
+    try:
+        _pdf_text("\n".join(map(str, texts))).encode("latin-1")
+    except UnicodeEncodeError as e:
+        regular, bold = _unicode_font()
+        if regular is None:
+            raise ValueError(f"PDF: '{e.object[e.start:e.end]}' belgisi uchun Unicode shrift topilmadi — "
+                             "BOJXONA_REPORT_FONT ga TrueType (.ttf) shrift yo'lini bering yoki Excel formatini tanlang") from None
+        pdf.add_font("unicode", "", regular)
+        pdf.add_font("unicode", "B", bold)
+        return "unicode", "unicode"
+    return "helvetica", "courier"
+
+
+def render_pdf(st):
+    from fpdf import FPDF
+
+    pdf = FPDF(unit="pt", format="A4")
+    pdf.set_margins(MARGIN, MARGIN)
+    pdf.set_auto_page_break(True, MARGIN)
+    text_font, num_font = _pdf_fonts(pdf, st)
+    ncol = len(st["columns"])
+    width = PAGE_W - 2 * MARGIN
+    # Birinchi ustun — matn, qolganlari o'ngga tekislangan
+    first = width * (0.6 if ncol == 2 else 0.22)
+    rest = (width - first) / max(ncol - 1, 1)
+
+    def row(cells, style=""):
+        if pdf.will_page_break(LINE) and cells is not st["columns"]:
+            pdf.add_page()
+            row(st["columns"], "B")
+        cells = [(f"{v:,.2f}" if j == 1 and ncol > 2 else _fmt(v)) if isinstance(v, float) else _pdf_text(v) for j, v in enumerate(cells)]
+        pdf.set_font(text_font, style, 10)
+        pdf.cell(first, LINE, cells[0])
+        pdf.set_font(num_font, style, 10)
+        for v in cells[1:]:
+            pdf.cell(rest, LINE, v, align="R")
+        pdf.ln(LINE)
+
+    def rule():
+        pdf.line(MARGIN, pdf.get_y(), PAGE_W - MARGIN, pdf.get_y())
+
+    pdf.add_page()
+    pdf.set_font(text_font, "B", 14)
+    pdf.cell(width, LINE + 4, _pdf_text(st["title"]), new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(text_font, "", 9)
+    pdf.cell(width, LINE * 1.5, _pdf_text(SUBTITLE), new_x="LMARGIN", new_y="NEXT")
+    for k, v in st["fields"]:
+        pdf.set_font(text_font, "B", 10)
+        pdf.cell(150, LINE, _pdf_text(f"{k}:"))
+        pdf.set_font(text_font, "", 10)
+        pdf.cell(width - 150, LINE, _pdf_text(v), new_x="LMARGIN", new_y="NEXT")
+    pdf.ln(LINE / 2)
+    row(st["columns"], "B")
+    rule()
+    for r in st["rows"]:
+        row(r)
+    rule()
+    row(["JAMI", *[""] * (ncol - 2), NA if st["total"] is None else f"{_fmt(st['total'])} so'm"], "B")
+    if st["total_usd"] is not None:
+        row(["USD da", *[""] * (ncol - 2), f"~ ${st['total_usd']:,.2f}"])
+    return bytes(pdf.output())
+
+
+RENDERERS = {"xlsx": render_xlsx, "pdf": render_pdf}
+
+
+def _render_batch(fmt, items, meta, by):
+    # Ishchi jarayonda: [(kalit, qatorlar), ...] → [(kalit, fayl baytlari), ...]
+    render = RENDERERS[fmt]
+    return [(key, render(statement(key, recs, meta, by))) for key, recs in items]
+
+
+# ─── Guruhlash va ZIP ───
+def iter_statements(chunks, by=None):
+    # by=None — har qator alohida; by="client" — mijoz bo'yicha (mijoz qatorlari bitta guruhga yig'iladi,
+    # mijozlar nomi bo'yicha tartiblangan)
+    if by is None:
+        n = 0
+        for df in chunks:
+            recs = df.to_dict("records")
+            for i, r in enumerate(recs, n + 1):
+                yield _decl_id(r, i), [r]
+            n += len(recs)
+        return
+    # Tashqi saralash: har bo'lak mijoz bo'yicha saralanib vaqtinchalik faylga yoziladi, so'ng fayllar
+    # birlashtirib o'qiladi — xotirada bir vaqtda faqat bitta mijozning qatorlari turadi
+    import heapq
+    import itertools
+    import tempfile
+
+    with tempfile.TemporaryDirectory(prefix="bojxona-stmt-") as folder:
+        runs = []
+        for i, df in enumerate(chunks):
+            if by not in df:
+                raise ValueError(f"Faylda '{by}' ustuni yo'q")
+            runs.append(_spill(df, by, os.path.join(folder, f"run-{i}.pkl")))
+        merged = heapq.merge(*map(_read_run, runs), key=lambda r: r[by])
+        for key, g in itertools.groupby(merged, key=lambda r: r[by]):
+            yield key, list(g)
+
+
+def _spill(df, by, path):
+    df = df.assign(**{by: df[by].astype(str)}).sort_values(by, kind="stable")
+    recs = df.to_dict("records")
+    with open(path, "wb") as f:
+        for i in range(0, len(recs), SPILL_BATCH):
+            pickle.dump(recs[i:i + SPILL_BATCH], f, pickle.HIGHEST_PROTOCOL)
+    return path
+
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            try:
+                recs = pickle.load(f)
+            except EOFError:
+                return
+            yield from recs
+
+
+def _safe_name(key, used):
+    base = re.sub(r"[^\w.-]+", "_", str(key)).strip("._")[:80] or "hisob"
+    name, k = base, 1
+    while name in used:
+        k += 1
+        name = f"{base}_{k}"
+    used.add(name)
+    return name
+
+
+def write_zip(chunks, dst, fmt="xlsx", by=None, meta=None, workers=None, batch=BATCH, progress=None):
+    # chunks — narxlangan DataFrame bo'laklari; natija — ZIP dagi hisob-varaqlar soni
+    if fmt not in FORMATS:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan format: {fmt}")
+    meta = meta or {}
+    workers = workers or settings.REPORT_WORKERS or os.cpu_count() or 1
+    # xlsx allaqachon siqilgan — qayta siqilmaydi
+    compression = zipfile.ZIP_STORED if fmt == "xlsx" else zipfile.ZIP_DEFLATED
+    done, used = 0, set()
+
+    def batches():
+        buf = []
+        for item in iter_statements(chunks, by):
+            buf.append(item)
+            if len(buf) == batch:
+                yield buf
+                buf = []
+        if buf:
+            yield buf
+
+    def emit(zf, results):
+        nonlocal done
+        for key, data in results:
+            zf.writestr(f"{_safe_name(key, used)}.{fmt}", data)
+        done += len(results)
+        if progress:
+            progress(done)
+
+    with zipfile.ZipFile(dst, "w", compression) as zf:
+        if workers <= 1:
+            for items in batches():
+                emit(zf, _render_batch(fmt, items, meta, by))
+        else:
+            import multiprocessing
+            from concurrent.futures import ProcessPoolExecutor
+
+            # spawn: Streamlit serveri oqimlari bilan fork qilish xavfli
+            with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+                pending = deque()
+                for items in batches():
+                    pending.append(pool.submit(_render_batch, fmt, items, meta, by))
+                    if len(pending) >= 2 * workers:
+                        emit(zf, pending.popleft().result())
+                while pending:
+                    emit(zf, pending.popleft().result())
+    if done == 0:
+        raise ValueError("Faylda deklaratsiyalar topilmadi")
+    return done
@@ -0,0 +1,105 @@
+import csv
+import os
+
+import numpy as np
+
+from bojxona import fees, schedule, settings
+
+# ─── 5-modda: karvon manifesti — postlar orasidagi masofa matritsasi bo'yicha hamrohlik yig'imi ───
+# Matritsa oflayn fayldan yuklanadi (kvadrat: "post" ustuni + har post ustuni, yoki
+# origin,destination,km qatorlari). Nom → indeks lug'ati keshlanadi; manifest nomlari bir marta
+# faktorizatsiya qilinadi, masofalar esa bitta fancy-index bilan olinadi.
+# Masofa 200 km bosqichini hal qiladi, shuning uchun standart matritsa yo'q: tasdiqlangan fayl
+# BOJXONA_DISTANCES orqali beriladi yoki yuklanadi. Paketdagi namuna taxminiy (to'g'ri chiziq × 1.3)
+# va faqat fayl formatini ko'rsatadi — yig'im hisoblashda ishlatilmaydi.
+SAMPLE_PATH = os.path.join(schedule.DATA_DIR, "distances_sample.csv")
+NOT_CONFIGURED = "Masofa matritsasi sozlanmagan: tasdiqlangan faylni BOJXONA_DISTANCES orqali bering yoki km ni ko'rsating"
+MANIFEST_COLUMNS = ("origin", "destination", "vehicles")
+
+
+def _key(name):
+    return " ".join(str(name).split()).casefold().replace("‘", "'").replace("ʻ", "'").replace("’", "'")
+
+
+class DistanceMatrix:
+    def __init__(self, names, km):
+        self.names = list(names)
+        self.km = np.asarray(km, dtype=float)
+        if self.km.shape != (len(self.names), len(self.names)):
+            raise ValueError("Masofa matritsasi kvadrat bo'lishi kerak")
+        self._index = {}
+        for i, n in enumerate(self.names):
+            if self._index.setdefault(_key(n), i) != i:
+                raise ValueError(f"Takrorlangan post nomi: {n}")
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or settings.DISTANCES
+        if not path:
+            raise ValueError(NOT_CONFIGURED)
+        try:
+            with open(path, encoding="utf-8", newline="") as f:
+                rows = list(csv.reader(f))
+        except OSError as e:
+            raise ValueError(f"Masofa faylini o'qib bo'lmadi: {e}")
+        return cls.from_rows(rows)
+
+    @classmethod
+    def from_rows(cls, rows):
+        rows = [r for r in rows if any(c.strip() for c in r)]
+        if not rows:
+            raise ValueError("Masofa fayli bo'sh")
+        head = [h.strip().lower() for h in rows[0]]
+        try:
+            if head[:3] == ["origin", "destination", "km"]:
+                # Juftliklar ro'yxati: ikki tomonlama deb olinadi
+                names = sorted({r[0].strip() for r in rows[1:]} | {r[1].strip() for r in rows[1:]}, key=_key)
+                pos = {_key(n): i for i, n in enumerate(names)}
+                km = np.full((len(names), len(names)), np.nan)
+                np.fill_diagonal(km, 0.0)
+                for o, d, v, *_ in rows[1:]:
+                    i, j = pos[_key(o)], pos[_key(d)]
+                    km[i, j] = km[j, i] = float(v)
+                return cls(names, km)
+            names = [h.strip() for h in rows[0][1:]]
+            if [r[0].strip() for r in rows[1:]] != names:
+                raise ValueError("Matritsa satr va ustun nomlari bir xil tartibda bo'lishi kerak")
+            km = [[float(v) if v.strip() else np.nan for v in r[1:len(names) + 1]] for r in rows[1:]]
+        except (IndexError, ValueError) as e:
+            raise ValueError(f"Masofa fayli noto'g'ri: {e}")
+        return cls(names, km)
+
+    def codes(self, names):
+        # Nomlar massivi → indekslar; noyob nomlar bo'yicha bir marta qidiriladi
+        names = np.asarray(names, dtype=object)
+        uniq, inv = np.unique(names.astype(str), return_inverse=True)
+        idx = np.array([self._index.get(_key(n), -1) for n in uniq], dtype=int)
+        if (idx < 0).any():
+            raise ValueError(f"Noma'lum post: {', '.join(uniq[idx < 0][:5])}")
+        return idx[inv].reshape(names.shape)
+
+    def distance(self, origins, destinations):
+        km = self.km[self.codes(origins), self.codes(destinations)]
+        if np.isnan(km).any():
+            raise ValueError("Ba'zi yo'nalishlar uchun masofa matritsada yo'q")
+        return km
+
+
+def price_manifest(origins, destinations, vehicles, bhm, matrix=None, rates=None):
+    # Har qator — bitta yo'nalish (vehicles ta avtomobil); natija ustunlar ko'rinishida
+    km = (matrix if matrix is not None else default()).distance(origins, destinations)
+    vehicles = np.broadcast_to(np.asarray(vehicles, dtype=float), km.shape)
+    if not (vehicles >= 1).all():
+        raise ValueError("Avtomobillar soni 1 dan kam yoki noto'g'ri qatorlar bor")
+    rate = fees.escort_rate(km, rates)
+    return {"km": km, "rate": rate, "total": fees.escort_fee(km, vehicles, bhm, rates)}
+
+
+_default = None
+
+
+def default():
+    global _default
+    if _default is None:
+        _default = DistanceMatrix.load()
+    return _default
@@ -0,0 +1,120 @@
+import csv
+import json
+import os
+from datetime import date, datetime
+
+import numpy as np
+
+from bojxona import fees
+
+# ─── Sanaga bog'langan tarif jadvali va BHM tarixi ───
+# Har versiya [start, keyingi start) oralig'ida amal qiladi; qator sanasi bo'yicha
+# versiya tartiblangan boshlanish sanalari ustida searchsorted bilan topiladi.
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+
+
+def as_days(dates):
+    # Sidebar sanasi (date) uchun pandas yuklanmaydi; ustunlar/satrlar pandas orqali
+    if isinstance(dates, datetime):
+        return np.datetime64(dates.date(), "D")
+    if isinstance(dates, date):
+        return np.datetime64(dates, "D")
+    import pandas as pd
+
+    d = pd.to_datetime(dates)
+    if isinstance(d, pd.Timestamp):
+        return np.datetime64(d.date(), "D")
+    return np.asarray(d, dtype="datetime64[D]")
+
+
+class Schedule:
+    def __init__(self, versions, bhm_history):
+        versions = sorted(versions, key=lambda v: v["start"])
+        self.codes = list(fees.ARTICLE_RATES)
+        self.notes = [v.get("note", "") for v in versions]
+        self.starts = np.array([v["start"] for v in versions], dtype="datetime64[D]")
+        self.rates = np.array([[v["rates"].get(c, np.nan) for c in self.codes] for v in versions])
+        n_tiers = max(len(v.get("byd_rates", ())) for v in versions)
+        self.byd_breaks = np.full((len(versions), max(n_tiers - 1, 0)), np.inf)
+        self.byd_rates = np.full((len(versions), n_tiers), np.nan)
+        for i, v in enumerate(versions):
+            if "byd_rates" in v:
+                self.byd_breaks[i, :len(v["byd_breaks"])] = v["byd_breaks"]
+                self.byd_rates[i, :len(v["byd_rates"])] = v["byd_rates"]
+        self.discount = np.array([v.get("initial_discount", np.nan) for v in versions])
+        bhm_history = sorted(bhm_history)
+        self.bhm_starts = np.array([s for s, _ in bhm_history], dtype="datetime64[D]")
+        self.bhm_values = np.array([b for _, b in bhm_history], dtype=float)
+
+    @classmethod
+    def load(cls, tariffs_path=None, bhm_path=None):
+        with open(tariffs_path or os.path.join(DATA_DIR, "tariffs.json"), encoding="utf-8") as f:
+            versions = json.load(f)
+        with open(bhm_path or os.path.join(DATA_DIR, "bhm.csv"), encoding="utf-8") as f:
+            history = [(r["start"], float(r["bhm"])) for r in csv.DictReader(f)]
+        return cls(versions, history)
+
+    @staticmethod
+    def _lookup(starts, dates):
+        days = as_days(dates)
+        idx = np.searchsorted(starts, days, side="right") - 1
+        return np.maximum(idx, 0), (idx >= 0) & ~np.isnat(days)
+
+    def version(self, dates):
+        idx, ok = self._lookup(self.starts, dates)
+        return np.where(ok, idx, -1)
+
+    def bhm(self, dates):
+        idx, ok = self._lookup(self.bhm_starts, dates)
+        return np.where(ok, self.bhm_values[idx], np.nan)
+
+    def rate(self, code, dates):
+        idx, ok = self._lookup(self.starts, dates)
+        return np.where(ok, self.rates[idx, self.codes.index(code)], np.nan)
+
+    def article_rates(self, dates):
+        # {modda: qatorlar bo'yicha stavka} — fees funksiyalarining rates argumenti; kuchga kirmagan — NaN
+        idx, ok = self._lookup(self.starts, dates)
+        return {c: np.where(ok, self.rates[idx, i], np.nan) for i, c in enumerate(self.codes)}
+
+    def in_force(self, code, dates):
+        if code == "1a":
+            idx, ok = self._lookup(self.starts, dates)
+            return ok & ~np.isnan(self.byd_rates[idx, 0])
+        return ~np.isnan(self.rate(code, dates))
+
+    def byd_mult(self, customs_usd, dates):
+        idx, ok = self._lookup(self.starts, dates)
+        usd = np.broadcast_to(np.asarray(customs_usd, dtype=float), np.shape(idx))
+        mult = np.full(np.shape(idx), np.nan)
+        # Versiyalar soni kichik: qatorlar emas, versiyalar bo'yicha aylanamiz
+        for v in np.unique(idx[ok]):
+            sel = ok & (idx == v)
+            mult[sel] = self.byd_rates[v][np.searchsorted(self.byd_breaks[v], np.where(usd[sel] >= 0, usd[sel], 0.0), side="left")]
+        # NaN va manfiy qiymatlar hech bir bosqichga tushmaydi (fees.byd_fee kabi)
+        mult[~(usd >= 0)] = np.nan
+        return mult[()] if mult.ndim == 0 else mult
+
+    def byd_total(self, customs_usd, dates, initial=False, after_hours=False, insp_h=0, insp_ot=0, bhm=None):
+        # bhm berilmasa har qator o'z sanasidagi BHM bilan hisoblanadi
+        idx, ok = self._lookup(self.starts, dates)
+        bhm = self.bhm(dates) if bhm is None else np.asarray(bhm, dtype=float)
+        rate = lambda code: np.where(ok, self.rates[idx, self.codes.index(code)], np.nan)
+        base = self.byd_mult(customs_usd, dates) * bhm
+        disc = np.where(initial, base * np.where(ok, self.discount[idx], np.nan), 0.0)
+        ah_fee = np.where(after_hours, rate("3a") * bhm, 0.0)
+        insp_fee = rate("3b-1") * bhm * np.asarray(insp_h, dtype=float)
+        insp_ot_fee = rate("3b-2") * bhm * np.asarray(insp_ot, dtype=float)
+        total = (base - disc) + ah_fee + insp_fee + insp_ot_fee
+        return {"bhm": bhm, "base": base, "disc": disc, "ah_fee": ah_fee, "insp_fee": insp_fee,
+                "insp_ot_fee": insp_ot_fee, "total": total}
+
+
+_default = None
+
+
+def default():
+    global _default
+    if _default is None:
+        _default = Schedule.load()
+    return _default
@@ -0,0 +1,34 @@
+import os
+
+# ─── Umumiy sozlamalar (muhit o'zgaruvchilari orqali o'zgartiriladi) ───
+DATA_DIR = os.environ.get("BOJXONA_DATA_DIR", os.path.join(os.path.expanduser("~"), ".bojxona"))
+CBU_URL = os.environ.get("CBU_BASE_URL", "https://cbu.uz/uz/arkhiv-kursov-valyut/json").rstrip("/")
+CBU_TIMEOUT = float(os.environ.get("CBU_TIMEOUT", "5"))
+RATE_MAX_AGE = int(os.environ.get("RATE_MAX_AGE", "3600"))
+# Tarixiy kurslarni yuklashda bir vaqtdagi so'rovlar soni (cbu.uz ni ortiqcha yuklamaslik uchun)
+BACKFILL_WORKERS = int(os.environ.get("BOJXONA_BACKFILL_WORKERS", "4"))
+FALLBACK_USD_RATE = 12900.0
+# 5-modda karvon manifesti: tasdiqlangan postlar orasidagi masofa matritsasi (CSV). Berilmasa manifest
+# faqat yuklangan matritsa bilan hisoblanadi; paketdagi distances_sample.csv — faqat format namunasi
+DISTANCES = os.environ.get("BOJXONA_DISTANCES", "")
+# O'lchovlar: BOJXONA_METRICS=1 bilan yoqiladi; METRICS_PORT=0 — alohida /metrics serverisiz
+METRICS = os.environ.get("BOJXONA_METRICS", "").lower() not in ("", "0", "false", "no")
+METRICS_PORT = int(os.environ.get("BOJXONA_METRICS_PORT", "9464"))
+# /metrics serveri standart holatda faqat lokal (sessiyalar soni va sahifalar tarmoqqa ochilmaydi)
+METRICS_HOST = os.environ.get("BOJXONA_METRICS_HOST", "127.0.0.1")
+# Hisob-varaqlarni tayyorlovchi jarayonlar soni (0 — protsessor yadrolari soni)
+REPORT_WORKERS = int(os.environ.get("BOJXONA_REPORT_WORKERS", "0"))
+# PDF hisob-varaqlar uchun Unicode TrueType shrift (kirill ismlar va h.k.); berilmasa tizimdagi DejaVuSans qidiriladi
+REPORT_FONT = os.environ.get("BOJXONA_REPORT_FONT", "")
+# Kalkulyator natijalari va tafsilot qatorlari uchun sessiyalar o'rtasida umumiy kesh hajmi (yozuvlar)
+RESULT_CACHE = int(os.environ.get("BOJXONA_RESULT_CACHE", "4096"))
+# Audit jurnali (standart yoqilgan): DATA_DIR/audit ostida Parquet segmentlar
+AUDIT = os.environ.get("BOJXONA_AUDIT", "1").lower() not in ("", "0", "false", "no")
+# Boshqaruv sahifalari (Monitoring, Audit jurnali — barcha sessiyalar ma'lumoti): standart holatda
+# BOJXONA_METRICS bilan birga yoqiladi, BOJXONA_ADMIN bilan alohida boshqariladi
+ADMIN = os.environ.get("BOJXONA_ADMIN", os.environ.get("BOJXONA_METRICS", "")).lower() not in ("", "0", "false", "no")
+
+
+def data_path(name):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, name)
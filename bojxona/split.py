@@ -0,0 +1,189 @@
+import numpy as np
+
+from bojxona import fees
+
+# ─── Yukni BYDlarga taqsimlash: eng arzon guruhlash (1a-modda bosqichli yig'imi) ───
+# BYD narxi faqat yig'indi bosqichiga bog'liq: k-bosqich — sig'imi BYD_BREAKS[k] bo'lgan "quti",
+# narxi c_k = stavka_k · BHM · (1 − chegirma) + BYD boshiga qo'shimchalar (3a, 3b).
+# 1) Branch-and-bound: sig'imlar yig'indisi ≥ jami qiymat va narxi bitta BYD dan arzon bo'lgan
+#    barcha quti to'plamlari (bosqichlar bo'yicha sonlar) sanab chiqiladi; kasr quyi chegara
+#    (qolgan qiymat × min c_j / B_j) bilan kesiladi. Nomzodlar soni qatorlar soniga bog'liq emas.
+# 2) Nomzodlar narx bo'yicha o'sish tartibida tekshiriladi: qatorlar kamayish tartibida
+#    "best fit" bilan qutilarga joylanadi; birinchi joylangan nomzod — yechim.
+# Eng arzon nomzod narxi — quyi chegara: yechim unga teng bo'lsa, optimal ekani isbotlangan.
+EPS = 1e-9
+# Best fit topolmasa aniq qidiruv faqat shu qatorlar sonigacha va shu tugunlar sonigacha
+SEARCH_MAX_LINES = 200
+SEARCH_NODES = 50_000
+
+
+def _tier_costs(bhm, initial, after_hours, insp_h, insp_ot):
+    res = fees.byd_total(fees.BYD_BREAKS.tolist() + [np.inf], bhm, initial, after_hours, insp_h, insp_ot)
+    return np.append(fees.BYD_BREAKS, np.inf), np.asarray(res["total"], dtype=float)
+
+
+def _candidates(total, caps, costs, upper, max_bins):
+    # Bosqichlar sig'im bo'yicha kamayish tartibida; cheksiz bosqichdan ko'pi bilan bitta quti
+    order = np.argsort(-caps, kind="stable")
+    caps, costs = caps[order], costs[order]
+    # k-bosqichdan keyingi (kichikroq) bosqichlarning eng arzon "so'm / USD" nisbati
+    ratio = np.where(np.isinf(caps), 0.0, costs / caps)
+    tail = np.minimum.accumulate(ratio[::-1])[::-1]
+    out = []
+
+    def walk(k, left, cost, counts, n):
+        if k == len(caps):
+            if left <= 0:
+                out.append((cost, n, counts.copy()))
+            return
+        # Sig'im yetgan bo'lsa ham qo'shimcha qutilar ko'rib chiqiladi (joylash qiyin bo'lganda kerak)
+        limit = int((upper - cost - EPS) // costs[k])
+        if np.isinf(caps[k]):
+            limit = min(limit, 1)
+        for m in range(min(limit, max_bins - n), -1, -1):
+            rest = left - m * caps[k] if m else left
+            bound = cost + m * costs[k]
+            if rest > 0:
+                bound += rest * tail[k + 1] if k + 1 < len(caps) else np.inf
+            if bound >= upper - EPS:
+                continue
+            counts[order[k]] = m
+            walk(k + 1, rest, cost + m * costs[k], counts, n + m)
+            counts[order[k]] = 0
+
+    walk(0, total, 0.0, np.zeros(len(caps), dtype=int), 0)
+    out.sort(key=lambda x: (x[0], x[1]))
+    return out
+
+
+def _best_fit(values, order, bin_caps):
+    # Best fit decreasing: har qator sig'imi yetadigan eng to'la qutiga
+    left = list(bin_caps)
+    groups = np.empty(len(values), dtype=int)
+    for i in order:
+        v = values[i]
+        best, room = -1, np.inf
+        for j, r in enumerate(left):
+            if v <= r and r < room:
+                best, room = j, r
+        if best < 0:
+            return None
+        left[best] -= v
+        groups[i] = best
+    return groups
+
+
+class _Budget(Exception):
+    pass
+
+
+def _search(values, order, bin_caps, budget=SEARCH_NODES):
+    # Aniq qidiruv (kichik yuklar uchun): bir xil bo'sh joyli qutilar bir marta sinaladi,
+    # qolgan qatorlar sig'maydigan holatlar kesiladi. None — joylab bo'lmasligi isbotlangan.
+    vals = values[order]
+    rest = np.append(np.cumsum(vals[::-1])[::-1], 0.0).tolist()
+    vals, smallest = vals.tolist(), float(vals[-1])
+    left = list(bin_caps)
+    assign = [0] * len(vals)
+    nodes = 0
+
+    def dfs(i):
+        nonlocal nodes
+        if i == len(vals):
+            return True
+        nodes += 1
+        if nodes > budget:
+            raise _Budget
+        if sum(r for r in left if r >= smallest) < rest[i]:
+            return False
+        v, seen = vals[i], set()
+        for j, r in enumerate(left):
+            if v <= r and r not in seen:
+                seen.add(r)
+                left[j] -= v
+                assign[i] = j
+                if dfs(i + 1):
+                    return True
+                left[j] += v
+        return False
+
+    if not dfs(0):
+        return None
+    groups = np.empty(len(vals), dtype=int)
+    groups[order] = assign
+    return groups
+
+
+def _pack(values, order, bin_caps):
+    # (guruhlar yoki None, joylab bo'lmasligi isbotlanganmi)
+    groups = _best_fit(values, order, bin_caps)
+    if groups is not None or len(values) > SEARCH_MAX_LINES:
+        return groups, False
+    try:
+        groups = _search(values, order, bin_caps)
+    except _Budget:
+        return None, False
+    return groups, groups is None
+
+
+def optimize(values, bhm, initial=False, after_hours=False, insp_h=0, insp_ot=0):
+    values = np.asarray(values, dtype=float).ravel()
+    if (values < 0).any() or np.isnan(values).any():
+        raise ValueError("Qator qiymatlari manfiy bo'lmasligi kerak")
+    # Sentlarda (butun sonli float) — yig'indilar aniq, chegaradagi qiymatlar bosqichini o'zgartirmaydi
+    cents = np.round(values * 100)
+    n = len(cents)
+    total = float(cents.sum())
+    caps, costs = _tier_costs(bhm, initial, after_hours, insp_h, insp_ot)
+    caps = caps * 100
+    single = float(costs[fees.byd_tier(total / 100)])
+    groups, lower = np.zeros(n, dtype=int), single
+    if n > 1:
+        order = np.argsort(-cents, kind="stable")
+        # Quyi chegara — joylab bo'lmasligi isbotlanmagan eng arzon nomzod narxi
+        proven = True
+        for cost, _, counts in _candidates(total, caps, costs, single, n):
+            if proven:
+                lower = cost
+            bin_caps = np.repeat(caps, counts)
+            if bin_caps.max() < cents[order[0]]:
+                continue
+            packed, infeasible = _pack(cents, order, bin_caps)
+            if packed is not None:
+                groups = packed
+                break
+            proven = proven and infeasible
+        else:
+            if proven:
+                lower = single
+    # Bo'sh qutilar tashlanadi, raqamlar yig'indi bo'yicha kamayish tartibida
+    sums = np.bincount(groups, weights=cents) / 100
+    used = np.flatnonzero(np.bincount(groups, minlength=len(sums)) > 0)
+    used = used[np.argsort(-sums[used], kind="stable")]
+    remap = np.empty(len(sums), dtype=int)
+    remap[used] = np.arange(len(used))
+    groups, sums = remap[groups], sums[used]
+    res = fees.byd_total(sums, bhm, initial, after_hours, insp_h, insp_ot)
+    decl_fees = np.asarray(res["total"], dtype=float)
+    best = float(decl_fees.sum())
+    if best > single + EPS:
+        groups, sums, decl_fees, best = np.zeros(n, dtype=int), np.array([total / 100]), np.array([single]), single
+    return {"groups": groups, "sums": sums, "fees": decl_fees, "total": best, "single": single,
+            "lower_bound": min(lower, best), "optimal": best <= lower + EPS}
+
+
+def split_frame(df, bhm, initial=False, after_hours=False, insp_h=0, insp_ot=0):
+    # Ommaviy foydalanish: customs_usd ustuni; shipment ustuni bo'lsa har yuk alohida taqsimlanadi
+    from bojxona import batch
+
+    if "customs_usd" not in df:
+        raise ValueError("Faylda 'customs_usd' ustuni yo'q")
+    values = batch.to_numbers(df["customs_usd"])
+    df["declaration"] = 0
+    df["decl_fee"] = 0.0
+    keys = df["shipment"] if "shipment" in df else np.zeros(len(df), dtype=int)
+    for _, idx in df.groupby(keys, sort=False).indices.items():
+        res = optimize(values[idx], bhm, initial, after_hours, insp_h, insp_ot)
+        df.iloc[idx, df.columns.get_loc("declaration")] = res["groups"] + 1
+        df.iloc[idx, df.columns.get_loc("decl_fee")] = res["fees"][res["groups"]]
+    return df
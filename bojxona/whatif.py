@@ -0,0 +1,121 @@
+import numpy as np
+
+from bojxona import batch, fees, rates
+
+# ─── What-if: deklaratsiyalar portfeli bo'yicha jami yig'im BHM × USD kursi × chegirma to'rida ───
+# Portfel yig'imi BHM ga chiziqli: T(b, x, d) = b · (A(x) − d · A₀(x) + E), bu yerda
+#   A(x)  — barcha BYD stavkalari yig'indisi (BHM ulushida), A₀(x) — dastlabki deklaratsiyalar uchun,
+#   E     — BYD boshiga qo'shimchalar (3a, 3b) yig'indisi.
+# USD (va boshqa valyutalar, kross-kurs o'zgarmas) qiymatlari bosqichi x ga bog'liq emas.
+# So'mdagi qiymatlar uchun bosqich uzs / x > B_k ⇔ uzs > x · B_k, shuning uchun
+#   A(x) = n · r₀ + Σ_k Δr_k · #{uzs > x · B_k}
+# — tartiblangan qiymatlar ustida searchsorted; qatorlar × kurslar massivi yaratilmaydi.
+CHUNK_CELLS = 1_000_000
+CUBE_COLUMNS = ("bhm", "usd_rate", "discount", "total_uzs", "total_usd")
+
+
+class Portfolio:
+    def __init__(self, usd, uzs, initial, extra):
+        # usd: kursga bog'liq bo'lmagan qiymatlar (USD); uzs: so'mdagi qiymatlar
+        self.n = len(usd) + len(uzs)
+        self._step = np.diff(fees.BYD_RATES)
+        rate = fees.BYD_RATES[fees.byd_tier(usd)]
+        self.fixed = float(rate.sum())
+        self.fixed_init = float(rate[initial[:len(usd)]].sum())
+        self.uzs = np.sort(uzs)
+        self.uzs_init = np.sort(uzs[initial[len(usd):]])
+        self.extra = float(extra.sum())
+
+    @classmethod
+    def from_frame(cls, df, fx=None):
+        # customs_usd yoki customs_value + currency (UZS ham bo'lishi mumkin), initial_decl, after_hours, insp_h, insp_ot
+        n = len(df)
+        if "currency" in df and "customs_value" in df:
+            ccy = df["currency"].astype(str).str.strip().str.upper().to_numpy()
+            value = batch.to_numbers(df["customs_value"])
+            is_uzs = ccy == "UZS"
+            if not fx or "USD" not in fx:
+                raise ValueError("Valyuta kurslari mavjud emas")
+            usd = np.zeros(n)
+            if (~is_uzs).any():
+                usd[~is_uzs] = rates.to_uzs(value[~is_uzs], ccy[~is_uzs], fx) / fx["USD"]
+            uzs = value[is_uzs]
+        elif "customs_usd" in df:
+            is_uzs = np.zeros(n, dtype=bool)
+            value = usd = batch.to_numbers(df["customs_usd"])
+            uzs = np.zeros(0)
+        else:
+            raise ValueError("Faylda 'customs_usd' yoki 'customs_value' + 'currency' ustunlari yo'q")
+        rows = batch.failed_rows(~(value >= 0))
+        if rows:
+            raise ValueError(f"Bojxona qiymati bo'sh yoki noto'g'ri qatorlar: {', '.join(map(str, rows[:10]))}{' …' if len(rows) > 10 else ''}")
+        zeros = np.zeros(n)
+        initial = batch.to_flags(df["initial_decl"]) if "initial_decl" in df else zeros.astype(bool)
+        extra = (fees.ARTICLE_RATES["3a"] * (batch.to_flags(df["after_hours"]) if "after_hours" in df else zeros)
+                 + fees.ARTICLE_RATES["3b-1"] * (batch.to_numbers(df["insp_h"], 0.0) if "insp_h" in df else zeros)
+                 + fees.ARTICLE_RATES["3b-2"] * (batch.to_numbers(df["insp_ot"], 0.0) if "insp_ot" in df else zeros))
+        # Tartib: avval kursga bog'liq bo'lmagan qatorlar, keyin so'mdagilar
+        order = np.concatenate([np.flatnonzero(~is_uzs), np.flatnonzero(is_uzs)])
+        return cls(usd[~is_uzs], uzs, initial[order], extra)
+
+    def _rate_sum(self, sorted_uzs, x):
+        # Σ stavka (BHM ulushida) so'mdagi qatorlar uchun, har bir kurs x bo'yicha
+        thresholds = x[:, None] * fees.BYD_BREAKS
+        above = len(sorted_uzs) - np.searchsorted(sorted_uzs, thresholds, side="right")
+        return len(sorted_uzs) * fees.BYD_RATES[0] + above @ self._step
+
+    def rate_sums(self, usd_rates):
+        x = np.asarray(usd_rates, dtype=float).ravel()
+        return self.fixed + self._rate_sum(self.uzs, x), self.fixed_init + self._rate_sum(self.uzs_init, x)
+
+    def grid(self, bhm_values, usd_rates, discounts):
+        # (BHM, kurs, chegirma) kubi, so'mda
+        a, a0 = self.rate_sums(usd_rates)
+        b = np.asarray(bhm_values, dtype=float).ravel()
+        d = np.asarray(discounts, dtype=float).ravel()
+        per_bhm = a[:, None] - a0[:, None] * d + self.extra
+        return b[:, None, None] * per_bhm
+
+    def iter_cube(self, bhm_values, usd_rates, discounts, chunk_cells=CHUNK_CELLS):
+        # Kub uzun jadval ko'rinishida BHM bo'yicha bo'laklab: xotira bo'lak hajmi bilan chegaralangan
+        import pandas as pd
+
+        b = np.asarray(bhm_values, dtype=float).ravel()
+        x = np.asarray(usd_rates, dtype=float).ravel()
+        d = np.asarray(discounts, dtype=float).ravel()
+        a, a0 = self.rate_sums(x)
+        per_bhm = a[:, None] - a0[:, None] * d + self.extra
+        step = max(chunk_cells // max(per_bhm.size, 1), 1)
+        for i in range(0, len(b), step):
+            bs = b[i:i + step]
+            total = bs[:, None, None] * per_bhm
+            shape = total.shape
+            yield pd.DataFrame({
+                "bhm": np.repeat(bs, shape[1] * shape[2]),
+                "usd_rate": np.tile(np.repeat(x, shape[2]), shape[0]),
+                "discount": np.tile(d, shape[0] * shape[1]),
+                "total_uzs": total.ravel(),
+                "total_usd": (total / x[None, :, None]).ravel(),
+            })
+
+
+def write_cube(portfolio, dst, out_type, bhm_values, usd_rates, discounts, chunk_cells=CHUNK_CELLS):
+    if out_type not in batch.OUTPUT_TYPES:
+        raise ValueError(f"Qo'llab-quvvatlanmaydigan natija formati: {out_type}")
+    rows, writer = 0, None
+    try:
+        for chunk in portfolio.iter_cube(bhm_values, usd_rates, discounts, chunk_cells):
+            if out_type == "csv":
+                chunk.to_csv(dst, mode="w" if rows == 0 else "a", header=rows == 0, index=False)
+            else:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(dst, table.schema, compression="zstd")
+                writer.write_table(table)
+            rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows
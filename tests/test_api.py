@@ -0,0 +1,78 @@
+import unittest
+
+import numpy as np
+
+from bojxona import api
+
+# ─── HTTP API hisobi: api.price to'g'ridan-to'g'ri (HTTP serversiz) ───
+FX = {"USD": 12500.0}
+
+
+def records(calc, items, bhm=None, registry=api.CALCULATORS):
+    return api._records(api.price(calc, items, bhm, FX, registry))
+
+
+class DatedRatesTest(unittest.TestCase):
+    def test_after_hours_not_in_force_before_2026(self):
+        before, after, plain = records("transit", [{"after_hours": True, "date": "2025-06-01"},
+                                                   {"after_hours": True, "date": "2026-02-01"},
+                                                   {"after_hours": False, "date": "2025-06-01"}])
+        self.assertIsNone(before["total"])
+        self.assertEqual(before["error"], api.NO_RATE)
+        self.assertEqual((after["total"], after["error"]), (2 * 0.25 * 412000, None))
+        self.assertEqual((plain["total"], plain["error"]), (0.25 * 375000, None))
+
+    def test_articles_before_first_version(self):
+        for calc, item in [("storage4", {"w_t": 1, "days": 3}), ("storage7", {"w_kg": 100, "days": 3, "perishable": True}),
+                           ("escort", {"km": 50}), ("cash", {}), ("service", {"article": "9"})]:
+            rec, = records(calc, [{**item, "date": "2024-06-01"}])
+            self.assertIsNone(rec["total"], calc)
+            self.assertEqual(rec["error"], api.NO_RATE)
+
+    def test_per_item_dates(self):
+        recs = records("service", [{"article": "6", "date": "2025-06-01"}, {"article": "6", "date": "2024-06-01"},
+                                   {"article": "9", "date": "2026-02-01"}])
+        self.assertEqual([r["total"] for r in recs], [0.75 * 375000, None, 412000.0])
+        recs = records("storage4", [{"w_t": 2, "days": 12, "date": "2025-06-01"}, {"w_t": 2, "days": 12, "date": "2026-02-01"}])
+        np.testing.assert_allclose([r["total"] for r in recs], [(10 * 0.03 + 2 * 0.04) * 2 * b for b in (375000, 412000)])
+        self.assertNotIn("error", recs[0])
+
+    def test_without_date_uses_current_rates(self):
+        rec, = records("transit", [{"after_hours": True}], bhm=400000)
+        self.assertEqual(rec["total"], 2 * 0.25 * 400000)
+
+
+class ValidationTest(unittest.TestCase):
+    def assert_rejected(self, calc, item, message, registry=api.CALCULATORS):
+        with self.assertRaisesRegex(ValueError, message):
+            api.price(calc, [item], 412000.0, FX, registry)
+
+    def test_non_scalar_fields(self):
+        self.assert_rejected("byd", {"customs_usd": [1, 2]}, "'customs_usd' maydoni son bo'lishi kerak")
+        self.assert_rejected("cash", {"n": {"a": 1}}, "'n' maydoni son bo'lishi kerak")
+        self.assert_rejected("byd", {"customs_usd": 1, "after_hours": [True]}, "'after_hours' maydoni true/false")
+
+    def test_counts_are_whole_numbers(self):
+        self.assert_rejected("transit", {"n": 2.5}, "'n' maydoni butun son")
+        self.assert_rejected("service", {"article": "2", "n": 0.5}, "'n' maydoni butun son")
+        self.assert_rejected("escort", {"km": 10, "vehicles": 1.5}, "'vehicles' maydoni butun son")
+        self.assert_rejected("escort", {"km": 10, "vehicles": 0}, "'vehicles' maydoni musbat")
+        rec, = records("courier", [{"kg": 2.5}], bhm=400000)
+        self.assertEqual(rec["total"], 0.02 * 400000 * 2.5)
+
+    def test_inverse_divisors_are_positive(self):
+        for calc, item in [("storage4_days", {"w_t": 0}), ("storage7_days", {"w_kg": 0}), ("storage4_weight", {"days": 0}),
+                           ("storage7_weight", {"days": 0}), ("escort_km", {"vehicles": 0}), ("escort_vehicles", {"km": 0})]:
+            self.assert_rejected(calc, {"budget": 1e6, **item}, f"'{next(iter(item))}' maydoni musbat", api.INVERSE)
+
+    def test_byd_before_first_version_has_error(self):
+        rec, = records("byd", [{"customs_usd": 5000, "date": "2025-06-01"}])
+        self.assertIsNone(rec["total"])
+        self.assertEqual(rec["error"], api.NO_RATE)
+        rec, = records("byd", [{"customs_usd": 5000, "date": "2026-03-01"}], bhm=400000)
+        self.assertEqual(rec["total"], 400000.0)
+        self.assertNotIn("error", rec)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import tempfile
+import unittest
+from datetime import date
+
+import numpy as np
+
+from bojxona import audit
+
+# ─── Audit jurnali: yozish, qayta o'qish, bufer chegarasi ───
+
+
+class AuditLogTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log = audit.AuditLog(tmp.name, flush_rows=10, flush_seconds=60, max_pending=20)
+        self.addCleanup(self.log.close)
+
+    def test_scalar_rate(self):
+        self.log.append("byd", "1a", 412000.0, 412000.0, 12900.0, date(2025, 3, 3), date(2025, 3, 3), {"customs_usd": 100})
+        self.log.extend("byd_batch", "1a", [1.0, 2.0], 412000.0, 12900.0, date(2025, 3, 3), date(2025, 3, 4))
+        rec = self.log.records().sort_values("total")
+        self.assertEqual(rec["usd_rate"].tolist(), [12900.0] * 3)
+        self.assertEqual([str(d)[:10] for d in rec["calc_date"]], ["2025-03-04", "2025-03-04", "2025-03-03"])
+
+    def test_per_row_rates(self):
+        # Sana rejimi: har qator o'z kursi, kurs sanasi va hisob sanasi bilan
+        self.log.extend("byd_batch", "1a", [1.0, 2.0, 3.0], np.array([340000.0, 375000.0, 412000.0]),
+                        np.array([12300.0, 12350.0, np.nan]),
+                        np.array(["2024-01-03", "2024-01-05", "NaT"], dtype="datetime64[D]"),
+                        np.array(["2024-01-04", "2024-01-06", "2024-01-08"], dtype=object))
+        rec = self.log.records().sort_values("total")
+        np.testing.assert_array_equal(rec["usd_rate"], [12300.0, 12350.0, np.nan])
+        np.testing.assert_array_equal(rec["bhm"], [340000.0, 375000.0, 412000.0])
+        self.assertEqual([None if d is None else str(d)[:10] for d in rec["rate_date"]], ["2024-01-03", "2024-01-05", None])
+        self.assertEqual([str(d)[:10] for d in rec["calc_date"]], ["2024-01-04", "2024-01-06", "2024-01-08"])
+
+    def test_buffer_is_bounded_when_writes_fail(self):
+        self.log.root = "/proc/audit-test/unwritable"
+        for _ in range(6):
+            self.log.extend("byd_batch", "1a", np.ones(10), 412000.0)
+        self.assertLessEqual(len(self.log), self.log.max_pending)
+        self.assertGreater(self.log.dropped, 0)
+        self.assertIsNotNone(self.log.last_error)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.log.root = tmp.name
+        self.log.flush()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+
+import numpy as np
+
+from bojxona import fees
+
+# ─── VM № 55 stavkalari: bosqich chegaralari, yaroqsiz qiymatlar, chegirma ───
+BHM = 412000.0
+NAN = float("nan")
+
+
+class BydTest(unittest.TestCase):
+    def test_upper_bound_is_included(self):
+        usd = [0.0, 9999.99, 10000.0, 10000.01, 15000.0, 20000.0, 20000.01, 1000000.0, 1000000.01]
+        np.testing.assert_array_equal(fees.byd_tier(usd), [0, 0, 0, 1, 1, 1, 2, 7, 8])
+        np.testing.assert_array_equal(fees.byd_fee(usd, BHM) / BHM, [1, 1, 1, 1.5, 1.5, 1.5, 2.5, 20, 25])
+        self.assertEqual(str(fees.byd_label(15000.0)), "1.5 × BHM")
+        self.assertEqual(str(fees.byd_label(10000.0)), "1 × BHM")
+
+    def test_every_break(self):
+        np.testing.assert_array_equal(fees.byd_tier(fees.BYD_BREAKS), np.arange(len(fees.BYD_BREAKS)))
+        np.testing.assert_array_equal(fees.byd_tier(np.nextafter(fees.BYD_BREAKS, np.inf)), np.arange(1, len(fees.BYD_RATES)))
+
+    def test_invalid_values(self):
+        for bad in (NAN, -0.01, [100.0, NAN]):
+            with self.assertRaisesRegex(ValueError, "manfiy bo'lmagan"):
+                fees.byd_tier(bad)
+        fee = fees.byd_fee([100.0, NAN, -5.0], BHM)
+        self.assertEqual(fee[0], BHM)
+        self.assertTrue(np.isnan(fee[1:]).all())
+        self.assertEqual(fees.byd_label([100.0, NAN, -5.0]).tolist(), ["1 × BHM", "—", "—"])
+        self.assertTrue(np.isnan(fees.byd_total(NAN, BHM, initial=True)["total"]))
+
+    def test_initial_discount_and_extras(self):
+        res = fees.byd_total([15000.0, 15000.0], BHM, initial=[True, False], after_hours=[False, True], insp_h=2, insp_ot=1)
+        np.testing.assert_array_equal(res["disc"], [1.5 * BHM * 0.2, 0.0])
+        np.testing.assert_array_equal(res["ah_fee"], [0.0, 0.25 * BHM])
+        np.testing.assert_allclose(res["total"], [1.5 * BHM * 0.8 + 0.5 * BHM + 2 * BHM,
+                                                  1.5 * BHM + 0.25 * BHM + 0.5 * BHM + 2 * BHM])
+
+
+class StorageTest(unittest.TestCase):
+    def test_storage_4_tiers(self):
+        days = [1, 10, 11, 30]
+        res = fees.storage_4(2.0, days, BHM)
+        np.testing.assert_array_equal(res["d1"], [1, 10, 10, 10])
+        np.testing.assert_array_equal(res["d2"], [0, 0, 1, 20])
+        np.testing.assert_allclose(res["total"], [2 * BHM * (0.03 * d1 + 0.04 * d2) for d1, d2 in [(1, 0), (10, 0), (10, 1), (10, 20)]])
+
+    def test_storage_7_tiers(self):
+        days = [5, 6, 15, 16]
+        res = fees.storage_7(250.0, days, BHM)
+        np.testing.assert_array_equal(np.stack([res["a1"], res["a2"], res["a3"]], axis=-1),
+                                      [[5, 0, 0], [5, 1, 0], [5, 10, 0], [5, 10, 1]])
+        np.testing.assert_allclose(res["total"], [2.5 * BHM * (0.05 * a + 0.07 * b + 0.10 * c)
+                                                  for a, b, c in [(5, 0, 0), (5, 1, 0), (5, 10, 0), (5, 10, 1)]])
+        np.testing.assert_allclose(fees.storage_7(250.0, 16, BHM, perishable=True)["total"], 2.5 * BHM * 0.15 * 16)
+
+    def test_dated_rates(self):
+        # Kuchga kirmagan modda (rates da yo'q) — NaN; qatorlar bo'yicha stavkalar massivi
+        self.assertTrue(np.isnan(fees.flat_fee("3a", 1, BHM, {"1b": 0.25})))
+        res = fees.storage_4(1.0, [12, 12], BHM, {"4a": np.array([0.03, 0.05]), "4b": np.array([0.04, NAN])})
+        np.testing.assert_allclose(res["total"][:1], [BHM * (10 * 0.03 + 2 * 0.04)])
+        self.assertTrue(np.isnan(res["total"][1]))
+
+
+class EscortTest(unittest.TestCase):
+    def test_200_km_is_lower_rate(self):
+        km = [1, 199.9, 200, 200.1, 1000]
+        np.testing.assert_array_equal(fees.escort_rate(km), [2, 2, 2, 5, 5])
+        np.testing.assert_array_equal(fees.escort_fee(km, 3, BHM), np.array([2, 2, 2, 5, 5]) * 3 * BHM)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+
+import numpy as np
+
+from bojxona import fees, inverse
+
+# ─── Teskari hisob: topilgan qiymat fees bo'yicha byudjetga sig'adi, keyingisi sig'maydi ───
+BHM = 412000.0
+TOL = 1 + 1e-9
+
+
+class InverseTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        self.rng = rng
+        # Tasodifiy byudjetlar va aynan chegaradagi yig'imlar (1, 1.5, 2.5 … × BHM)
+        self.budget = np.concatenate([rng.uniform(0, 30, 500), fees.BYD_RATES, [0.99, 25.0, 26.0]]) * BHM
+
+    def assert_fits(self, fee, budget):
+        ok = np.isfinite(fee)
+        self.assertTrue((fee[ok] <= budget[ok] * TOL).all())
+
+    def test_byd_value(self):
+        for initial in (False, True):
+            res = inverse.byd_value(self.budget, BHM, initial)
+            usd, budget = res["max"], self.budget
+            factor = 1 - fees.INITIAL_DISCOUNT if initial else 1.0
+            finite = np.isfinite(usd)
+            fee = fees.byd_fee(usd[finite], BHM) * factor
+            self.assert_fits(fee, budget[finite])
+            np.testing.assert_allclose(res["fee"][finite], fee)
+            # Bir sent ko'p qiymat — keyingi bosqich, byudjetdan oshadi
+            over = fees.byd_fee(usd[finite] + 0.01, BHM) * factor
+            self.assertTrue((over > budget[finite]).all())
+            # 1 × BHM dan kam — hech narsa sig'maydi; 25 × BHM va undan ko'p — chegara yo'q
+            np.testing.assert_array_equal(np.isnan(usd), budget < BHM * factor * (1 - 1e-12))
+            self.assertTrue(np.isinf(usd[budget >= 25 * BHM * factor]).all())
+
+    def test_storage4_days(self):
+        w_t = self.rng.uniform(0.1, 20, len(self.budget))
+        days = inverse.storage4_days(self.budget, w_t, BHM)["max"]
+        self.assert_fits(fees.storage_4(w_t, days, BHM)["total"], self.budget)
+        self.assertTrue((fees.storage_4(w_t, days + 1, BHM)["total"] > self.budget).all())
+
+    def test_storage4_weight(self):
+        days = self.rng.integers(1, 60, len(self.budget))
+        w_t = inverse.storage4_weight(self.budget, days, BHM)["max"]
+        np.testing.assert_allclose(fees.storage_4(w_t, days, BHM)["total"], self.budget)
+
+    def test_storage7_days(self):
+        w_kg = self.rng.uniform(10, 5000, len(self.budget))
+        for perishable in (False, True):
+            days = inverse.storage7_days(self.budget, w_kg, BHM, perishable)["max"]
+            self.assert_fits(fees.storage_7(w_kg, days, BHM, perishable)["total"], self.budget)
+            self.assertTrue((fees.storage_7(w_kg, days + 1, BHM, perishable)["total"] > self.budget).all())
+
+    def test_storage7_weight(self):
+        days = self.rng.integers(1, 60, len(self.budget))
+        for perishable in (False, True):
+            w_kg = inverse.storage7_weight(self.budget, days, BHM, perishable)["max"]
+            np.testing.assert_allclose(fees.storage_7(w_kg, days, BHM, perishable)["total"], self.budget)
+
+    def test_escort(self):
+        vehicles = self.rng.integers(1, 4, len(self.budget))
+        km = inverse.escort_km(self.budget, vehicles, BHM)["max"]
+        finite = np.isfinite(km)
+        self.assert_fits(fees.escort_fee(km[finite], vehicles[finite], BHM), self.budget[finite])
+        # 200 km chegarasi kiradi: 2 × BHM ga 200 km, 5 × BHM dan kam bo'lsa undan ortig'i emas
+        np.testing.assert_array_equal(km[finite & (self.budget < 5 * BHM * vehicles)] <= fees.ESCORT_KM_LIMIT, True)
+        distance = self.rng.uniform(1, 600, len(self.budget))
+        n = inverse.escort_vehicles(self.budget, distance, BHM)["max"]
+        self.assert_fits(fees.escort_fee(distance, n, BHM), self.budget)
+        self.assertTrue((fees.escort_fee(distance, n + 1, BHM) > self.budget).all())
+
+    def test_flat(self):
+        for article in inverse.FLAT_ARTICLES:
+            n = inverse.flat_n(self.budget, article, BHM)["max"]
+            self.assert_fits(fees.flat_fee(article, n, BHM), self.budget)
+            if article not in inverse.FRACTIONAL:
+                self.assertTrue((fees.flat_fee(article, n + 1, BHM) > self.budget).all())
+                np.testing.assert_array_equal(n, np.floor(n))
+
+    def test_next_tier(self):
+        res = inverse.next_tier("byd", [5000.0, 10000.0, 10000.01, 2e6])
+        np.testing.assert_array_equal(res["next"][:3], [10000.0, 10000.0, 20000.0])
+        self.assertTrue(np.isnan(res["next"][3]))
+        np.testing.assert_array_equal(res["rate"][:3], fees.BYD_RATES[fees.byd_tier([5000.0, 10000.0, 10000.01])])
+        np.testing.assert_array_equal(res["rate_next"][:3], [1.5, 1.5, 2.5])
+
+
+if __name__ == "__main__":
+    unittest.main()
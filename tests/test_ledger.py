@@ -0,0 +1,73 @@
+import unittest
+
+import numpy as np
+
+from bojxona import ledger
+
+# ─── Ombor reyestri: prefiks yig'indilar har bir yuk bo'yicha fees hisobiga teng ───
+BHM = 412000.0
+START = np.datetime64("2025-06-01")
+# Hodisalar epoch kunlari bilan ko'paytiriladi (D · Σc − Σ(c · t)) — mutlaq emas, nisbiy aniqlik
+RTOL = 1e-9
+
+
+def random_ledger(rng, n=60):
+    book = ledger.StorageLedger()
+    arrival = START + rng.integers(0, 40, n)
+    release = np.where(rng.random(n) < 0.5, arrival + rng.integers(0, 30, n), np.datetime64("NaT"))
+    book.add([f"Y{i}" for i in range(n)], rng.choice(["4", "7"], n), rng.uniform(50, 20000, n).round(1),
+             arrival, release.astype("datetime64[D]"), rng.random(n) < 0.3)
+    return book
+
+
+class LedgerTest(unittest.TestCase):
+    def setUp(self):
+        self.rng = np.random.default_rng(7)
+        self.book = random_ledger(self.rng)
+        self.days = START + np.arange(-2, 90)
+
+    def assert_matches_items(self, book, days):
+        for d in days:
+            np.testing.assert_allclose(book.accrued(d, BHM), book.items(d, BHM)["fee"].sum(), rtol=RTOL, err_msg=str(d))
+
+    def test_accrued_equals_sum_of_items(self):
+        self.assert_matches_items(self.book, self.days)
+        np.testing.assert_allclose(self.book.accrued(self.days, BHM),
+                                   [self.book.items(d, BHM)["fee"].sum() for d in self.days], rtol=RTOL)
+
+    def test_daily_is_difference_of_accrued(self):
+        acc = self.book.accrued(self.days, BHM)
+        np.testing.assert_allclose(self.book.daily(self.days[1:], BHM), np.diff(acc), rtol=RTOL, atol=1e-3)
+
+    def test_advance_matches_accrued(self):
+        for d in self.days[::3]:
+            np.testing.assert_allclose(self.book.advance(d) * BHM, self.book.accrued(d, BHM), rtol=RTOL)
+
+    def test_release_and_add_after_advance(self):
+        self.book.advance(START + 20)
+        open_ids = self.book.ids[self.book.is_open & (self.book.arrival <= (START + 20).astype(np.int64))][:5]
+        self.book.release_items(open_ids, START + 25)
+        self.book.add(["N1", "N2"], ["4", "7"], [3000.0, 400.0], START + 22)
+        np.testing.assert_allclose(self.book.advance(START + 60) * BHM, self.book.accrued(START + 60, BHM), rtol=RTOL)
+        self.assert_matches_items(self.book, START + np.array([21, 25, 26, 60]))
+
+    def test_tier_boundaries(self):
+        book = ledger.StorageLedger()
+        book.add(["A"], "4", 1000.0, START)
+        # 1-10 kunlar 4a, 11-kundan 4b; kelgan kun 1-kun
+        self.assertAlmostEqual(float(book.accrued(START + 9, BHM)), 10 * 0.03 * BHM)
+        self.assertAlmostEqual(float(book.accrued(START + 10, BHM)), (10 * 0.03 + 0.04) * BHM)
+        self.assertEqual(float(book.accrued(START - 1, BHM)), 0.0)
+
+    def test_bad_input(self):
+        with self.assertRaisesRegex(ValueError, "Noma'lum ombor moddasi"):
+            ledger.StorageLedger().add(["A"], "5", 10.0, START)
+        with self.assertRaisesRegex(ValueError, "Takrorlangan"):
+            self.book.add(["Y1"], "4", 10.0, START)
+        with self.assertRaisesRegex(ValueError, "allaqachon chiqarilgan"):
+            closed = self.book.ids[~self.book.is_open][0]
+            self.book.release_items([closed], START + 80)
+
+
+if __name__ == "__main__":
+    unittest.main()
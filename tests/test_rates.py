@@ -0,0 +1,160 @@
+import io
+import os
+import tempfile
+import time
+import unittest
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from bojxona import api, batch, cbu_stub, rates
+
+# ─── Tarixiy kurslar: lokal CBU server (cbu_stub) bilan, tarmoqsiz ───
+# 2024-01-05 — juma, 06/07 — dam olish kunlari (CBU oldingi ish kuni kursini qaytaradi), 08 — dushanba
+SERIES = {"USD": {"2024-01-03": 12300.0, "2024-01-05": 12350.0, "2024-01-08": 12400.0},
+          "EUR": {"2024-01-03": 13500.0}}
+
+
+class BackfillTest(unittest.TestCase):
+    def setUp(self):
+        self.srv = cbu_stub.serve(SERIES)
+        self.addCleanup(self.srv.shutdown)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = rates.RateStore(os.path.join(tmp.name, "rates.sqlite"))
+        self.addCleanup(self.store.close)
+
+    def backfill(self, start, end):
+        return rates.backfill(start, end, self.store, self.srv.base_url, workers=2, retries=0, backoff=0)
+
+    def test_fills_only_missing_days(self):
+        self.assertEqual(self.backfill("2024-01-03", "2024-01-04"), {"days": 2, "fetched": 2, "failed": {}})
+        self.assertEqual(self.backfill("2024-01-07", "2024-01-08")["fetched"], 2)
+        hits = self.srv.hits
+        res = self.backfill("2024-01-03", "2024-01-08")
+        self.assertEqual(res, {"days": 6, "fetched": 2, "failed": {}})
+        self.assertEqual(self.srv.hits - hits, 2)
+        self.assertEqual(self.store.fetched_days("2024-01-01", "2024-01-31"),
+                         {f"2024-01-0{d}" for d in range(3, 9)})
+        self.assertEqual(self.backfill("2024-01-03", "2024-01-08")["fetched"], 0)
+
+    def test_failed_days_are_retried_next_run(self):
+        self.srv.fail = True
+        res = self.backfill("2024-01-03", "2024-01-05")
+        self.assertEqual((res["fetched"], sorted(res["failed"])), (0, ["2024-01-03", "2024-01-04", "2024-01-05"]))
+        self.assertEqual(self.store.fetched_days("2024-01-03", "2024-01-05"), set())
+        self.srv.fail = False
+        self.assertEqual(self.backfill("2024-01-03", "2024-01-05"), {"days": 3, "fetched": 3, "failed": {}})
+
+    def test_weekend_uses_friday_rate(self):
+        self.backfill("2024-01-03", "2024-01-08")
+        # Dam olish kunlari uchun yangi kurs yozilmaydi — juma sanasi bilan qaytgan kurs saqlanadi
+        self.assertIsNone(self.store.get("USD", "2024-01-06"))
+        hist = rates.RateHistory.load(self.store, ["USD"])
+        days = ["2024-01-05", "2024-01-06", "2024-01-07", "2024-01-08"]
+        value, when = hist.asof(["USD"] * 4, days)
+        np.testing.assert_array_equal(value, [12350.0, 12350.0, 12350.0, 12400.0])
+        self.assertEqual([str(d) for d in when], ["2024-01-05", "2024-01-05", "2024-01-05", "2024-01-08"])
+
+    def test_mixed_currencies_and_uzs(self):
+        self.backfill("2024-01-03", "2024-01-08")
+        hist = rates.RateHistory.load(self.store)
+        got = hist.to_uzs([1.0, 2.0, 100.0], ["usd", "EUR", "UZS"], [date(2024, 1, 4), date(2024, 1, 8), date(2024, 1, 8)])
+        np.testing.assert_array_equal(got, [12300.0, 27000.0, 100.0])
+
+    def test_date_before_first_rate(self):
+        self.backfill("2024-01-01", "2024-01-04")
+        # Birinchi kurs e'lon qilinishidan oldingi kunlar uchun CBU bo'sh javob qaytaradi
+        self.assertEqual(self.store.fetched_days("2024-01-01", "2024-01-02"), set())
+        hist = rates.RateHistory.load(self.store)
+        self.assertEqual(hist.span("USD"), ("2024-01-03", "2024-01-03"))
+        # Kursi yo'q qatorlar — NaN/NaT, qolganlari hisoblanadi
+        value, when = hist.asof(["USD", "USD", "RUB", None, "USD"], ["2024-01-03", "2024-01-02", "2024-01-04", "2024-01-04", None])
+        np.testing.assert_array_equal(value, [12300.0, np.nan, np.nan, np.nan, np.nan])
+        self.assertEqual([str(d) for d in when], ["2024-01-03", "NaT", "NaT", "NaT", "NaT"])
+
+    def test_price_file_keeps_going_past_rows_without_rate(self):
+        self.backfill("2024-01-03", "2024-01-08")
+        hist = rates.RateHistory.load(self.store)
+        src = io.BytesIO(b"customs_value,currency,date\n"
+                         b"1000,USD,2024-01-04\n2000,EUR,2024-01-06\n"
+                         b"1000,USD,2023-12-29\n1000,RUB,2024-01-04\n1000,USD,\n1000,USD,abc\n"
+                         b"500,UZS,2024-01-08\n")
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "out.csv")
+            res = batch.price_file(src, "in.csv", 412000.0, dst, chunk_rows=2, history=hist)
+            out = pd.read_csv(dst, keep_default_na=False)
+        self.assertEqual((res["rows"], res["failed"], res["failed_rows"]), (7, 4, [3, 4, 5, 6]))
+        self.assertEqual(out["error"].tolist(), ["", "", "sana uchun kurs yo'q", "sana uchun kurs yo'q",
+                                                 "sana bo'sh yoki noto'g'ri", "sana bo'sh yoki noto'g'ri", ""])
+        self.assertAlmostEqual(float(out["customs_usd"][1]), 2000 * 13500.0 / 12350.0)
+        self.assertEqual(out["rate_date"].tolist()[:2], ["2024-01-03", "2024-01-05"])
+        self.assertEqual(out["total"][2], "")
+
+
+class RateServiceTest(unittest.TestCase):
+    # Joriy kurslar: birinchi so'rov, yangilash, CBU ishlamaganda diskdagi eski kurs va bo'sh ombor
+    def setUp(self):
+        self.srv = cbu_stub.serve({"USD": 12650.0, "EUR": 13720.0})
+        self.addCleanup(self.srv.shutdown)
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.store = rates.RateStore(os.path.join(tmp.name, "rates.sqlite"))
+        self.addCleanup(self.store.close)
+
+    def service(self, max_age=3600):
+        return rates.RateService(self.store, self.srv.base_url, max_age)
+
+    def test_first_fetch(self):
+        svc = self.service()
+        svc.rate_table()
+        svc.refresh(wait=True)
+        self.assertEqual(svc.rate_table(), {"USD": 12650.0, "EUR": 13720.0})
+        self.assertEqual(svc.usd_rate(), (12650.0, rates.cbu_date(date.today().isoformat()), True))
+        self.assertEqual((svc.misses, self.srv.hits), (1, 1))
+        # Yangi kurs diskda: boshqa jarayon CBU ga so'rov yubormaydi
+        other = self.service()
+        self.assertEqual(other.rate_table()["USD"], 12650.0)
+        other.refresh(wait=True)
+        self.assertEqual(self.srv.hits, 1)
+
+    def test_refresh_after_max_age(self):
+        svc = self.service(max_age=0)
+        svc.refresh(wait=True)
+        self.srv.rates["USD"] = 12700.0
+        svc.rate_table()
+        svc.refresh(wait=True)
+        self.assertEqual(svc.rate("USD")[0], 12700.0)
+        self.assertEqual(self.store.latest()["USD"][0], 12700.0)
+        self.assertEqual(self.srv.hits, 2)
+
+    def test_stale_rate_served_while_cbu_is_down(self):
+        yesterday = (date.today() - timedelta(days=1)).isoformat()
+        self.store.put("USD", yesterday, 12600.0, time.time() - 86400)
+        self.srv.fail = True
+        svc = self.service()
+        self.assertEqual(svc.rate_table(), {"USD": 12600.0})
+        svc.refresh(wait=True)
+        self.assertIsNotNone(svc.last_error)
+        self.assertEqual(svc.usd_rate(), (12600.0, rates.cbu_date(yesterday), True))
+        # Xatodan keyin qayta urinish RETRY_AFTER gacha kutadi — so'rovlar CBU ga yog'ilmaydi
+        hits = self.srv.hits
+        svc.rate_table()
+        self.assertEqual(self.srv.hits, hits)
+
+    def test_empty_store_has_no_fallback_rate(self):
+        self.srv.fail = True
+        svc = self.service()
+        svc.refresh(wait=True)
+        self.assertIsNotNone(svc.last_error)
+        self.assertEqual(svc.rate_table(), {})
+        self.assertFalse(svc.usd_rate()[2])
+        # API taxminiy kurs ishlatmaydi: total_usd null
+        cols = api.price("cash", [{"n": 1}], 412000.0, svc.rate_table())
+        self.assertTrue(np.isnan(cols["total_usd"]).all())
+        self.assertEqual(cols["total"].tolist(), [2.5 * 412000.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+import importlib.util
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+
+import pandas as pd
+
+from bojxona import reports
+
+# ─── Hisob-varaqlar: tayyor fayllar kutubxona bilan qayta ochilib tekshiriladi ───
+NAN = float("nan")
+ROW = {"declaration_id": "D1", "client": "Ivanov", "customs_usd": 15000.0, "base": 618000.0, "disc": 123600.0,
+       "ah_fee": 103000.0, "insp_fee": 0.0, "insp_ot_fee": 0.0, "total": 597400.0, "bhm": 412000.0, "error": ""}
+BAD = {**ROW, "declaration_id": "D2", "customs_usd": NAN, "base": NAN, "disc": NAN, "ah_fee": NAN, "total": NAN,
+       "error": "noto'g'ri qiymat: customs_usd"}
+META = {"bhm": 412000.0, "usd_rate": 12500.0, "date": "2025-03-01"}
+
+
+def xlsx_rows(data):
+    from openpyxl import load_workbook
+
+    return [tuple(v for v in r if v is not None) for r in load_workbook(io.BytesIO(data)).active.iter_rows(values_only=True)]
+
+
+def pdf_text(data):
+    from pypdf import PdfReader
+
+    return "\n".join(p.extract_text() for p in PdfReader(io.BytesIO(data)).pages)
+
+
+class StatementTest(unittest.TestCase):
+    def test_declaration(self):
+        st = reports.statement("D1", [ROW], META)
+        self.assertIn(("Mijoz", "Ivanov"), st["fields"])
+        self.assertEqual(st["rows"][:2], [("Asosiy yig'im (1.5 × BHM)", 618000.0), ("Dastlabki chegirma (-20%)", -123600.0)])
+        self.assertEqual((st["total"], st["total_usd"]), (597400.0, 597400.0 / 12500.0))
+
+    def test_unpriced_row_is_not_zero(self):
+        st = reports.statement("D2", [BAD], META)
+        self.assertIn(("Xato", "noto'g'ri qiymat: customs_usd"), st["fields"])
+        self.assertEqual(st["rows"][0][1], reports.NA)
+        self.assertIsNone(st["total"])
+        self.assertIsNone(st["total_usd"])
+
+    def test_client_with_missing_value(self):
+        st = reports.statement("Ivanov", [ROW, BAD], META, reports.CLIENT_COLUMN)
+        self.assertEqual(st["rows"][1], ("D2", "—", "—", "—", "—", reports.NA))
+        self.assertIsNone(st["total"])
+
+
+class XlsxTest(unittest.TestCase):
+    def test_reopens_with_values(self):
+        rows = xlsx_rows(reports.render_xlsx(reports.statement("D1", [ROW], META)))
+        self.assertEqual(rows[0], (reports.TITLE,))
+        self.assertIn(("Deklaratsiya", "D1"), rows)
+        self.assertIn(("JAMI", 597400), rows)
+        self.assertIn(("USD da", 47.79), rows)
+
+    def test_client_statement(self):
+        rows = xlsx_rows(reports.render_xlsx(reports.statement("Ivanov", [ROW, BAD], META, reports.CLIENT_COLUMN)))
+        self.assertIn(("D1", 15000, "1.5 × BHM", -123600, 103000, 597400), rows)
+        self.assertIn(("D2", "—", "—", "—", "—", reports.NA), rows)
+        self.assertEqual(rows[-1], ("JAMI", reports.NA))
+
+
+class PdfTest(unittest.TestCase):
+    def setUp(self):
+        if importlib.util.find_spec("pypdf") is None:
+            self.skipTest("pypdf o'rnatilmagan")
+
+    def test_latin_text(self):
+        text = pdf_text(reports.render_pdf(reports.statement("D1", [ROW], META)))
+        self.assertIn("Mijoz: Ivanov", text)
+        self.assertIn("JAMI 597,400 so'm", text)
+
+    def test_cyrillic_name(self):
+        if reports._unicode_font()[0] is None:
+            self.skipTest("Unicode TrueType shrift topilmadi")
+        text = pdf_text(reports.render_pdf(reports.statement("D1", [{**ROW, "client": "Иванов Пётр"}], META)))
+        self.assertIn("Иванов Пётр", text)
+        self.assertNotIn("?", text)
+
+    def test_cyrillic_without_font_fails(self):
+        old = reports.FONT_PATHS, reports.settings.REPORT_FONT
+        reports.FONT_PATHS, reports.settings.REPORT_FONT = (), ""
+        self.addCleanup(lambda: (setattr(reports, "FONT_PATHS", old[0]), setattr(reports.settings, "REPORT_FONT", old[1])))
+        with self.assertRaisesRegex(ValueError, "Unicode shrift topilmadi"):
+            reports.render_pdf(reports.statement("D1", [{**ROW, "client": "Иванов"}], META))
+
+    def test_long_statement_repeats_header(self):
+        recs = [{**ROW, "declaration_id": f"D{i}"} for i in range(120)]
+        text = pdf_text(reports.render_pdf(reports.statement("Ivanov", recs, META, reports.CLIENT_COLUMN)))
+        self.assertGreater(text.count("Deklaratsiya Qiymat (USD)"), 1)
+        self.assertIn("D119", text)
+        self.assertIn(f"JAMI {597400 * 120:,} so'm", text)
+
+
+class ZipTest(unittest.TestCase):
+    def test_per_client_grouping(self):
+        chunks = [pd.DataFrame([{**ROW, "declaration_id": f"A{i}", "client": c} for i, c in enumerate("bab")]),
+                  pd.DataFrame([{**ROW, "declaration_id": "B0", "client": "a"}])]
+        with tempfile.TemporaryDirectory() as tmp:
+            dst = os.path.join(tmp, "out.zip")
+            self.assertEqual(reports.write_zip(iter(chunks), dst, "xlsx", reports.CLIENT_COLUMN, META, workers=1), 2)
+            with zipfile.ZipFile(dst) as z:
+                self.assertEqual(z.namelist(), ["a.xlsx", "b.xlsx"])
+                rows = xlsx_rows(z.read("b.xlsx"))
+        self.assertEqual([r[0] for r in rows if r and str(r[0]).startswith("A")], ["A0", "A2"])
+        self.assertIn(("Deklaratsiyalar soni", "2"), rows)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+import numpy as np
+
+from bojxona import fees, split
+
+# ─── BYD taqsimlash: kichik yuklarda barcha bo'linishlar bilan solishtirish ───
+BHM = 412000.0
+
+
+def partitions(n):
+    # Barcha bo'linishlar: qator i guruhi ≤ oldingi guruhlar soni (restricted growth)
+    def walk(i, groups, k):
+        if i == n:
+            yield list(groups)
+            return
+        for g in range(k + 1):
+            groups.append(g)
+            yield from walk(i + 1, groups, max(k, g + 1))
+            groups.pop()
+    yield from walk(0, [], 0)
+
+
+def brute_force(values, **extra):
+    best = np.inf
+    for groups in partitions(len(values)):
+        sums = np.bincount(groups, weights=values)
+        best = min(best, float(fees.byd_total(sums, BHM, **extra)["total"].sum()))
+    return best
+
+
+class SplitTest(unittest.TestCase):
+    def check(self, values, **extra):
+        res = split.optimize(values, BHM, **extra)
+        # Natija o'zi izchil: guruh yig'indilari va yig'imlari fees bo'yicha
+        np.testing.assert_allclose(res["sums"], np.bincount(res["groups"], weights=values), atol=1e-6)
+        np.testing.assert_allclose(res["fees"], fees.byd_total(res["sums"], BHM, **extra)["total"])
+        self.assertAlmostEqual(res["total"], brute_force(np.asarray(values, dtype=float), **extra), delta=1e-6, msg=values)
+        self.assertTrue(res["optimal"])
+        self.assertLessEqual(res["lower_bound"], res["total"] + split.EPS)
+        return res
+
+    def test_random_small_loads(self):
+        rng = np.random.default_rng(11)
+        for _ in range(60):
+            n = int(rng.integers(1, 8))
+            scale = rng.choice([5000, 15000, 60000, 300000])
+            self.check(rng.uniform(0, scale, n).round(2).tolist())
+
+    def test_random_with_per_declaration_extras(self):
+        rng = np.random.default_rng(12)
+        for _ in range(30):
+            n = int(rng.integers(2, 7))
+            self.check(rng.uniform(0, 40000, n).round(2).tolist(), initial=True, after_hours=True, insp_h=1)
+
+    def test_exact_tier_boundaries(self):
+        # Yuqori chegara kiradi: 40000 — bitta BYD (2.5 × BHM); 1 sentga oshsa 4 × BHM, bo'lish arzon (1 + 2.5)
+        res = self.check([10000.0, 30000.0])
+        self.assertEqual((res["total"], len(res["sums"])), (2.5 * BHM, 1))
+        res = self.check([10000.0, 30000.01])
+        self.assertEqual((res["total"], res["single"], len(res["sums"])), (3.5 * BHM, 4 * BHM, 2))
+
+    def test_negative_value_rejected(self):
+        with self.assertRaisesRegex(ValueError, "manfiy"):
+            split.optimize([100.0, -1.0], BHM)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from bojxona import fees, whatif
+
+# ─── What-if to'ri: har bir katak fees.byd_total bilan qatorma-qator hisobga teng ───
+FX = {"USD": 12500.0, "EUR": 13600.0, "RUB": 140.0}
+
+
+def direct(df, bhm, usd_rate, discount):
+    # Kurs x bo'lsa: so'mdagi qiymatlar x ga bo'linadi, boshqa valyutalar (kross-kurs o'zgarmas) — fx bo'yicha
+    ccy = df["currency"].to_numpy()
+    value = df["customs_value"].to_numpy(dtype=float)
+    usd = np.where(ccy == "UZS", value / usd_rate, value * np.array([FX.get(c, 1.0) for c in ccy]) / FX["USD"])
+    res = fees.byd_total(usd, bhm, False, df["after_hours"].to_numpy(), df["insp_h"].to_numpy(), df["insp_ot"].to_numpy())
+    return float(res["total"].sum() - discount * res["base"][df["initial_decl"].to_numpy()].sum())
+
+
+class GridTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 300
+        ccy = rng.choice(["USD", "EUR", "RUB", "UZS"], n)
+        value = np.where(ccy == "UZS", rng.uniform(0, 3e9, n), np.where(ccy == "RUB", rng.uniform(0, 2e8, n), rng.uniform(0, 250000, n)))
+        # Chegaradagi qiymatlar: 12500 kursda aynan 10000 va 40000 USD
+        value[:4] = [10000.0, 40000.0, 10000.0 * 12500, 40000.0 * 12500]
+        ccy[:4] = ["USD", "USD", "UZS", "UZS"]
+        self.df = pd.DataFrame({"customs_value": value.round(2), "currency": ccy,
+                                "initial_decl": rng.random(n) < 0.4, "after_hours": rng.random(n) < 0.2,
+                                "insp_h": rng.integers(0, 3, n), "insp_ot": rng.integers(0, 2, n)})
+        self.portfolio = whatif.Portfolio.from_frame(self.df, FX)
+        self.bhm = [375000.0, 412000.0]
+        self.usd_rates = [11000.0, 12500.0, 12499.99, 13800.0]
+        self.discounts = [0.0, 0.2, 0.5]
+
+    def test_grid_matches_fees(self):
+        grid = self.portfolio.grid(self.bhm, self.usd_rates, self.discounts)
+        self.assertEqual(grid.shape, (2, 4, 3))
+        want = [[[direct(self.df, b, x, d) for d in self.discounts] for x in self.usd_rates] for b in self.bhm]
+        np.testing.assert_allclose(grid, want, rtol=1e-12)
+
+    def test_cube_chunks_match_grid(self):
+        grid = self.portfolio.grid(self.bhm, self.usd_rates, self.discounts)
+        cube = pd.concat(self.portfolio.iter_cube(self.bhm, self.usd_rates, self.discounts, chunk_cells=5), ignore_index=True)
+        self.assertEqual(list(cube.columns), list(whatif.CUBE_COLUMNS))
+        np.testing.assert_allclose(cube["total_uzs"], grid.ravel())
+        np.testing.assert_allclose(cube["total_usd"], cube["total_uzs"] / cube["usd_rate"])
+
+    def test_invalid_value_rejected(self):
+        self.df.loc[7, "customs_value"] = -1.0
+        with self.assertRaisesRegex(ValueError, "noto.g.ri qatorlar: 8$"):
+            whatif.Portfolio.from_frame(self.df, FX)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+import pandas as pd
+import plotly.graph_objects as go
+
+from bojxona import fees, metrics
+from bojxona.cache import LRUCache
+from views.common import fmt
+
+# ─── Grafiklar va statik jadvallar: BHM bo'yicha bir marta quriladi, barcha sessiyalarga umumiy ───
+# Sahifalar bu obyektlarni faqat chizadi (st.plotly_chart / st.dataframe), o'zgartirmaydi.
+CACHE = LRUCache(maxsize=64)
+metrics.cache_collector("artifacts", CACHE)
+
+ARTICLES = [
+    ("1a","BYD — tovar qiymatiga qarab (import/eksport)","BHM × 1 dan 25 gacha"),
+    ("1b","Tranzit / Qayta ishlash rejimi (1 deklaratsiya)","BHM × 25%"),
+    ("1v","Naqd chet el valyutasi deklaratsiyasi (yuridik)","BHM × 2.5"),
+    ("1g","Bojxona kirim orderi (1 dona)","BHM × 25%"),
+    ("1d","Xalqaro kuryerlik jo'natmasi (1 kg brutto)","BHM × 2%"),
+    ("2","BYDga o'zgartirish / qo'shimcha kiritish","BHM × 25%"),
+    ("3a","Ish vaqtidan tashqari rasmiylashtiruv (1 BYD)","BHM × 25%"),
+    ("3b-1","Bojxona ko'rigi — ish vaqtida (1 soat)","BHM × 25%"),
+    ("3b-2","Bojxona ko'rigi — ish vaqtidan tashqari (1 soat)","BHM × 2"),
+    ("4a","Bojxona ombori: 1-10 sutka (1 tonna/kun)","BHM × 3%"),
+    ("4b","Bojxona ombori: 10+ sutka (1 tonna/kun)","BHM × 4%"),
+    ("5a","Avtomobil hamrohligi: 200 km gacha","BHM × 2"),
+    ("5b","Avtomobil hamrohligi: 200 km dan ortiq","BHM × 5"),
+    ("6","Dastlabki qarorni qabul qilish","BHM × 75%"),
+    ("7a","Chegara ombori: 1-5 kun (100 kg/kun)","BHM × 5%"),
+    ("7b","Chegara ombori: 6-15 kun (100 kg/kun)","BHM × 7%"),
+    ("7v","Chegara ombori: 15+ kun (100 kg/kun)","BHM × 10%"),
+    ("7g","Tez buziladigan — chegara ombori (100 kg/kun)","BHM × 15%"),
+    ("8","Tranzit deklaratsiyasiga o'zgartirish","BHM × 10%"),
+    ("9","Intellektual mulk reyestriga kiritish (1 obyekt)","BHM × 1"),
+]
+BYD_BANDS = ["≤10,000","≤20,000","≤40,000","≤60,000","≤100,000","≤200,000","≤500,000","≤1,000,000",">1,000,000"]
+SERVICE_NAMES = [
+    "Tranzit/Qayta ishlash (1 deklaratsiya)","Naqd valyuta deklaratsiyasi (yuridik)",
+    "Bojxona kirim orderi (1 dona)","Xalqaro kuryerlik (1 kg brutto)",
+    "BYD o'zgartirish/qo'shimcha (1 dona)","Ish vaqtidan tashqari rasmiylashtiruv (1 BYD)",
+    "Bojxona ko'rigi — ish vaqtida (1 soat)","Bojxona ko'rigi — ish vaqtidan tashqari (1 soat)",
+    "Ombor: 1-10 sutka (1 tonna/kun)","Ombor: 10+ sutka (1 tonna/kun)",
+    "Avtomobil hamrohligi: 200 km gacha","Avtomobil hamrohligi: 200 km dan ortiq",
+    "Dastlabki qarorni qabul qilish","Chegara ombori: 1-5 kun (100 kg/kun)",
+    "Chegara ombori: 6-15 kun (100 kg/kun)","Chegara ombori: 15+ kun (100 kg/kun)",
+    "Tez buziladigan — chegara ombori (100 kg/kun)","Tranzit deklaratsiyasiga o'zgartirish",
+    "Intellektual mulk reyestriga kiritish (1 obyekt)"
+]
+SERVICE_RATES = ["BHM 25%","BHM 2.5×","BHM 25%","BHM 2%","BHM 25%","BHM 25%","BHM 25%","BHM 2×","BHM 3%","BHM 4%","BHM 2×","BHM 5×","BHM 75%","BHM 5%","BHM 7%","BHM 10%","BHM 15%","BHM 10%","BHM 1×"]
+
+
+# ─── Statik jadvallar ───
+@CACHE.memoize
+def articles_table():
+    return pd.DataFrame(ARTICLES, columns=["Modda", "Yig'im turi", "Stavka"])
+
+
+@CACHE.memoize
+def byd_bands_table():
+    return pd.DataFrame({
+        "Qiymat (USD)": BYD_BANDS,
+        "Stavka": ["1×BHM","1.5×BHM","2.5×BHM","4×BHM","7×BHM","10×BHM","15×BHM","20×BHM","25×BHM"],
+    })
+
+
+@CACHE.memoize
+def byd_rates_table(bhm):
+    byd_rates = fees.BYD_RATES.tolist()
+    return pd.DataFrame({
+        "Bojxona qiymati (USD)": BYD_BANDS,
+        "Stavka (BHM)": byd_rates,
+        "Yig'im (so'm)": [round(r*bhm) for r in byd_rates],
+        "Chegirmali -20% (so'm)": [round(r*bhm*(1 - fees.INITIAL_DISCOUNT)) for r in byd_rates],
+    })
+
+
+@CACHE.memoize
+def services_table(bhm):
+    sp_codes = list(fees.ARTICLE_RATES)
+    return pd.DataFrame({
+        "Modda": sp_codes,
+        "Xizmat turi": SERVICE_NAMES,
+        "Stavka": SERVICE_RATES,
+        "Yig'im (so'm)": [round(fees.ARTICLE_RATES[c]*bhm) for c in sp_codes],
+    })
+
+
+# ─── Grafiklar ───
+@CACHE.memoize
+def byd_chart(bhm):
+    vals = [5000,15000,30000,50000,80000,150000,350000,750000,1500000]
+    fees_n = fees.byd_fee(vals, bhm).tolist()
+    fees_d = (fees.byd_fee(vals, bhm)*(1 - fees.INITIAL_DISCOUNT)).tolist()
+    fig = go.Figure()
+    fig.add_trace(go.Scatter(x=vals,y=fees_n,mode='lines+markers',name="Oddiy",line=dict(color='#2563eb',width=3),marker=dict(size=9)))
+    fig.add_trace(go.Scatter(x=vals,y=fees_d,mode='lines+markers',name="Dastlabki (−20%)",line=dict(color='#10b981',width=2,dash='dash'),marker=dict(size=8)))
+    fig.update_layout(title="BYD Rasmiylashtiruv Yig'imi",xaxis_title="Tovar qiymati (USD)",yaxis_title="Yig'im (so'm)",template='plotly_white',hovermode='x unified')
+    return fig
+
+
+@CACHE.memoize
+def services_chart(bhm):
+    svcs = ["Tranzit","Valyuta","Kirim orderi","Kuryer(1kg)","BYD o'zg.","Ish tashq.","Ko'rig(ish)","Ko'rig(tash.)","Avto 200km-","Avto 200km+","Dastl. qaror","Intel. mulk"]
+    sfees = [fees.ARTICLE_RATES[c]*bhm for c in ("1b","1v","1g","1d","2","3a","3b-1","3b-2","5a","5b","6","9")]
+    fig = go.Figure(go.Bar(x=svcs,y=sfees,marker_color='#2563eb',text=[fmt(f) for f in sfees],textposition='outside',textfont=dict(size=9)))
+    fig.update_layout(title="Maxsus Xizmatlar Yig'imi",yaxis_title="Yig'im (so'm)",template='plotly_white',xaxis_tickangle=-30)
+    return fig
+
+
+@CACHE.memoize
+def storage_chart(bhm):
+    drange = list(range(1,31))
+    sfees2 = fees.storage_4(1.0, drange, bhm)["total"].tolist()
+    fig = go.Figure(go.Scatter(x=drange,y=sfees2,mode='lines+markers',fill='tozeroy',line=dict(color='#7c3aed',width=2),marker=dict(size=7)))
+    fig.add_vline(x=10,line_dash="dash",line_color="red",annotation_text="10-kun chegara")
+    fig.update_layout(title="Ombor saqlash jami xarajati (1 tonna, 1–30 kun)",xaxis_title="Kunlar soni",yaxis_title="Jami xarajat (so'm)",template='plotly_white')
+    return fig
+
+
+@CACHE.memoize
+def escort_chart(bhm):
+    distances = list(range(50, 501, 50))
+    esc_fees = fees.escort_fee(distances, 1, bhm).tolist()
+    fig = go.Figure(go.Bar(
+        x=distances, y=esc_fees,
+        marker_color=['#2563eb' if d<=fees.ESCORT_KM_LIMIT else '#dc2626' for d in distances],
+        text=[fmt(f) for f in esc_fees], textposition='outside'
+    ))
+    fig.update_layout(title="Masofaga qarab hamrohlik yig'imi (1 avtomobil)", xaxis_title="Masofa (km)", yaxis_title="Yig'im (so'm)", template='plotly_white')
+    return fig
@@ -0,0 +1,33 @@
+# 1. ASOSIY MA'LUMOT
+import streamlit as st
+
+from views import artifacts
+
+st.markdown("## 📝 VM № 55 Qaror haqida")
+col1, col2 = st.columns(2)
+with col1:
+    st.markdown("""
+    <div class='info-box'>
+    <h4>🎯 Asosiy maqsad</h4>
+    <ul>
+    <li>Bojxona yig'imlarini JST talablariga moslashtirish</li>
+    <li>Import va eksport yig'imlarini muvofiqlashtirish</li>
+    <li>Hisoblash tizimini soddalashtirish</li>
+    </ul>
+    </div>""", unsafe_allow_html=True)
+with col2:
+    st.markdown("""
+    <div class='info-box'>
+    <h4>✨ Asosiy o'zgarishlar</h4>
+    <ul>
+    <li>9 bosqichli stavkalar tizimi (BHM × 1 dan 25 gacha)</li>
+    <li>Dastlabki deklaratsiyada 20% chegirma</li>
+    <li>Ish vaqtidan tashqari uchun qo'shimcha to'lov</li>
+    <li>Jismoniy shaxslar uchun alohida stavkalar</li>
+    </ul>
+    </div>""", unsafe_allow_html=True)
+
+st.markdown("### 📌 Barcha yig'im turlari (VM № 55, 1-ilova)")
+st.dataframe(artifacts.articles_table(), use_container_width=True, hide_index=True)
+st.info("🎁 **Dastlabki deklaratsiyalashda 1a-modda bo'yicha 20% chegirma beriladi!**")
+st.warning("⚠️ 1a-modda va 3-modda — 2026-yil 1-yanvardan kuchga kiradi. Qolganlari 2025-yil 1-maydan.")
@@ -0,0 +1,68 @@
+# 7. BOSHQA XIZMATLAR
+import streamlit as st
+
+from bojxona import fees
+from views.common import audit, ctx, fmt, fragment, not_in_force
+
+
+@fragment
+def byd_change(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>2-modda:</b> Deklarant murojaatiga asosan BYDga o'zgartirish va/yoki qo'shimcha kiritish.<br>• Qog'oz: 1 dona BYD uchun; Elektron: 1 dona tuzatish shakli uchun<br><b>Stavka: BHM × 25%</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "2"):
+        return
+    n = st.number_input("O'zgartirish soni:", min_value=1, max_value=1000, value=1, key="bch_n")
+    f = float(fees.flat_fee("2", n, bhm, c.rates))
+    audit(c, "byd_change", "2", f, {"n": n})
+    c1,c2=st.columns(2); c1.metric("Yig'im",f"{fmt(f)} so'm",f"{n} × BHM 25%"); c2.metric("USD da",f"${f/USD_RATE:.2f}")
+
+
+@fragment
+def ruling(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>6-modda:</b> Tovar bo'yicha dastlabki qarorni qabul qilish.<br><b>Stavka: BHM × 75%</b><br><i>Qaror bekor qilinsa yoki o'zgartirilsa to'lov qaytarilmaydi.</i></div>", unsafe_allow_html=True)
+    if not_in_force(c, "6"):
+        return
+    n2 = st.number_input("Qarorlar soni:", min_value=1, max_value=100, value=1, key="pq_n")
+    f2 = float(fees.flat_fee("6", n2, bhm, c.rates))
+    audit(c, "ruling", "6", f2, {"n": n2})
+    c1,c2=st.columns(2); c1.metric("Yig'im",f"{fmt(f2)} so'm",f"{n2} × BHM 75%"); c2.metric("USD da",f"${f2/USD_RATE:.2f}")
+    st.warning("⚠️ Qaror bekor qilinsa to'lov qaytarilmaydi!")
+
+
+@fragment
+def transit_change(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>8-modda:</b> Deklarantning murojaatiga asosan bojxona organi tomonidan tranzit deklaratsiyasiga o'zgartirish.<br>(Axborot tizimida deklaratsiyalovchi shaxs tomonidan o'zgartirishlar bundan mustasno)<br><b>Stavka: BHM × 10%</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "8"):
+        return
+    n3 = st.number_input("O'zgartirish soni:", min_value=1, max_value=1000, value=1, key="tch_n")
+    f3 = float(fees.flat_fee("8", n3, bhm, c.rates))
+    audit(c, "transit_change", "8", f3, {"n": n3})
+    c1,c2=st.columns(2); c1.metric("Yig'im",f"{fmt(f3)} so'm",f"{n3} × BHM 10%"); c2.metric("USD da",f"${f3/USD_RATE:.2f}")
+
+
+@fragment
+def ip_register(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>9-modda:</b> Bir intellektual mulk obyektini bojxona reyestriga kiritish.<br><b>Stavka: BHM × 1</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "9"):
+        return
+    n4 = st.number_input("Obyektlar soni:", min_value=1, max_value=100, value=1, key="ip_n")
+    f4 = float(fees.flat_fee("9", n4, bhm, c.rates))
+    audit(c, "ip_register", "9", f4, {"n": n4})
+    c1,c2=st.columns(2); c1.metric("Yig'im",f"{fmt(f4)} so'm",f"{n4} × BHM 1"); c2.metric("USD da",f"${f4/USD_RATE:.2f}")
+
+
+c = ctx()
+st.markdown("## 📜 Boshqa Bojxona Xizmatlari")
+tab1, tab2, tab3, tab4 = st.tabs(["✏️ BYD O'zgartirish","⚖️ Dastlabki qaror","🔄 Tranzit o'zgartirish","🧠 Intellektual mulk"])
+
+with tab1:
+    byd_change(c)
+with tab2:
+    ruling(c)
+with tab3:
+    transit_change(c)
+with tab4:
+    ip_register(c)
@@ -0,0 +1,107 @@
+import functools
+import uuid
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from bojxona import audit as audit_log
+from bojxona import fees, metrics, rates
+from bojxona.schedule import Schedule
+
+
+# ─── Sahifalar uchun umumiy kontekst (sidebar qiymatlari, sessiya bo'yicha) ───
+@dataclass(frozen=True)
+class Ctx:
+    bhm: int
+    usd_rate: float
+    usd_date: str
+    usd_ok: bool
+    fx: dict
+    calc_date: date
+    schedule: Schedule
+
+    def byd_fee(self, usd):
+        return float(fees.byd_fee(usd, self.bhm))
+
+    @functools.cached_property
+    def rates(self):
+        # Hisoblash sanasida kuchga kirgan moddalar stavkalari (fees funksiyalarining rates argumenti)
+        return {k: float(v) for k, v in self.schedule.article_rates(self.calc_date).items() if not np.isnan(v)}
+
+    @property
+    def rate_day(self):
+        return date.fromisoformat(rates.iso_date(self.usd_date)) if self.usd_ok else None
+
+
+def ctx():
+    return st.session_state["ctx"]
+
+
+def not_in_force(c, *codes):
+    # Sanada kuchga kirmagan moddalar bo'yicha ogohlantirish; hisob ko'rsatilmaydi
+    missing = [code for code in codes if code not in c.rates]
+    if missing:
+        st.warning(f"⚠️ {c.calc_date:%d.%m.%Y} sanasida {', '.join(missing)}-modda hali kuchga kirmagan.")
+    return bool(missing)
+
+
+def session_id():
+    return st.session_state.setdefault("sid", uuid.uuid4().hex)
+
+
+# ─── Fragmentlar: st.fragment + o'lchov ───
+# BOJXONA_METRICS=1 bo'lsa fragmentning o'zi qayta ishga tushishi (to'liq skriptsiz) bojxona_rerun_seconds
+# ga fragment yorlig'i bilan yoziladi; to'liq rerun (fragmentlar ichida) app.py da o'lchanadi.
+def fragment(fn):
+    if not metrics.ENABLED:
+        return st.fragment(fn)
+
+    @functools.wraps(fn)
+    def timed(*args, **kwargs):
+        run = get_script_run_ctx()
+        if run is None or not run.fragment_ids_this_run:
+            return fn(*args, **kwargs)
+        with metrics.timer("bojxona_rerun_seconds", page=st.session_state.get("metrics_page", ""), fragment=fn.__name__):
+            return fn(*args, **kwargs)
+    return st.fragment(timed)
+
+
+# ─── Audit jurnali: fragmentlar har rerunda chaqiradi, yozuv faqat natija o'zgarganda qo'shiladi ───
+def audit(c, calc, article, total, inputs, breakdown=None):
+    log = audit_log.default()
+    if log is None:
+        return
+    key = (c.bhm, c.usd_rate, c.calc_date, tuple(inputs.items()))
+    last = st.session_state.setdefault("audit_last", {})
+    if last.get(calc) == key:
+        return
+    last[calc] = key
+    log.append(calc, article, total, c.bhm, c.usd_rate, c.rate_day, c.calc_date, inputs, breakdown, session_id())
+
+
+def audit_many(c, calc, article, total, inputs, breakdown=None, bhm=None, key=None, usd_rate=None, rate_date=None, calc_date=None):
+    # key berilsa (masalan, jadval xeshi) — o'sha kiritish qayta yozilmaydi. bhm/usd_rate/rate_date/calc_date —
+    # qator bo'yicha massivlar (sana rejimi); berilmasa sidebar qiymatlari
+    log = audit_log.default()
+    if log is None:
+        return
+    if key is not None:
+        key = (c.bhm, c.usd_rate, c.calc_date, key)
+        last = st.session_state.setdefault("audit_last", {})
+        if last.get(calc) == key:
+            return
+        last[calc] = key
+    log.extend(calc, article, total, c.bhm if bhm is None else bhm, c.usd_rate if usd_rate is None else usd_rate,
+               c.rate_day if rate_date is None else rate_date, c.calc_date if calc_date is None else calc_date,
+               inputs, breakdown, session_id())
+
+
+def fmt(n):
+    return f"{n:,.0f}"
+
+
+def byd_label(usd):
+    return str(fees.byd_label(usd))
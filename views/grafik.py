@@ -0,0 +1,21 @@
+# 9. GRAFIK TAHLIL
+import streamlit as st
+
+from views import artifacts
+from views.common import ctx, fmt
+
+
+c = ctx()
+bhm, USD_RATE = c.bhm, c.usd_rate
+st.markdown("## 📈 Grafik Tahlil")
+st.caption(f"BHM = {bhm:,} so'm · 1 USD = {fmt(USD_RATE)} so'm")
+
+col1, col2 = st.columns(2)
+with col1:
+    st.plotly_chart(artifacts.byd_chart(bhm), use_container_width=True)
+
+with col2:
+    st.plotly_chart(artifacts.services_chart(bhm), use_container_width=True)
+
+st.markdown("### 🏪 Omborda Saqlash Xarajati (1 tonna, kunlar bo'yicha)")
+st.plotly_chart(artifacts.storage_chart(bhm), use_container_width=True)
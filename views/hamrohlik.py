@@ -0,0 +1,103 @@
+# 5. AVTOMOBIL HAMROHLIGI
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bojxona import batch, fees, routes, settings
+from views import artifacts, results
+from views.common import audit, audit_many, ctx, fmt, fragment, not_in_force
+
+
+@fragment
+def calculator(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    if not_in_force(c, "5a", "5b"):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        km = st.number_input("Masofa (km):", min_value=1, max_value=5000, value=150, step=10)
+        vehicles = st.number_input("Avtomobil soni:", min_value=1, max_value=100, value=1)
+    with col2:
+        label = "BHM × 2 (200 km gacha)" if km <= fees.ESCORT_KM_LIMIT else "BHM × 5 (200 km dan ortiq)"
+        res = results.escort(km, vehicles, bhm, c.rates)
+        fee_e = res["fee"]
+        audit(c, "escort", "5", fee_e, {"km": km, "vehicles": vehicles}, {"rate_bhm": res["rate_bhm"]})
+        st.markdown(f"<div class='result-box'><h3 style='color:white;margin:0;'>{label}</h3><h2 style='color:white;margin:10px 0;'>{fmt(fee_e)} so'm</h2><p style='margin:0;opacity:0.8;'>{vehicles} avtomobil · ${fee_e/USD_RATE:.2f}</p></div>", unsafe_allow_html=True)
+
+
+@fragment
+def manifest(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    if "5a" not in c.rates or "5b" not in c.rates:
+        return
+    with st.expander("📋 Karvon manifesti — ko'p avtomobil, postlar orasidagi masofa bo'yicha", expanded=False):
+        st.caption("Masofalar postlar orasidagi tasdiqlangan masofa matritsasidan olinadi (km — 200 km bosqichini hal qiladi). Format: kvadrat CSV (`post` + postlar) yoki `origin,destination,km` qatorlari.")
+        mx_file = st.file_uploader("Masofa matritsasi (CSV):", type=["csv"], key="conv_matrix")
+        try:
+            if mx_file is None:
+                if not settings.DISTANCES:
+                    st.info("ℹ️ Manifestni hisoblash uchun tasdiqlangan masofa matritsasini yuklang.")
+                    with open(routes.SAMPLE_PATH, "rb") as fh:
+                        st.download_button("⬇️ Format namunasi (CSV)", fh, file_name="masofalar_namuna.csv", key="conv_sample")
+                    st.caption("⚠️ Namunadagi masofalar taxminiy (to'g'ri chiziq × 1.3), haqiqiy yo'l masofasi emas — faqat fayl formatini ko'rsatadi, yig'im hisoblash uchun yaramaydi.")
+                    return
+                matrix = routes.default()
+            else:
+                if st.session_state.get("conv_matrix_id") != mx_file.file_id:
+                    rows = list(csv.reader(io.TextIOWrapper(mx_file, encoding="utf-8-sig")))
+                    st.session_state["conv_matrix_id"], st.session_state["conv_matrix_obj"] = mx_file.file_id, routes.DistanceMatrix.from_rows(rows)
+                matrix = st.session_state["conv_matrix_obj"]
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+
+        st.caption(f"Manifest ustunlari: **{'**, **'.join(routes.MANIFEST_COLUMNS[:2])}**, {routes.MANIFEST_COLUMNS[2]} (bo'lmasa 1).")
+        up = st.file_uploader("Manifest fayli (ixtiyoriy):", type=list(batch.INPUT_TYPES), key="conv_file")
+        if up is not None:
+            df = pd.concat(batch.iter_chunks(up, up.name), ignore_index=True)
+        else:
+            df = st.data_editor(
+                pd.DataFrame({"origin": matrix.names[:1], "destination": matrix.names[-1:], "vehicles": [1]}),
+                num_rows="dynamic", hide_index=True, use_container_width=True, key="conv_lines",
+                column_config={"origin": st.column_config.SelectboxColumn("Qayerdan", options=matrix.names, required=True),
+                               "destination": st.column_config.SelectboxColumn("Qayerga", options=matrix.names, required=True),
+                               "vehicles": st.column_config.NumberColumn("Avtomobil", min_value=1, step=1, default=1)}).dropna(subset=["origin", "destination"])
+        if not len(df):
+            return
+        missing = [k for k in routes.MANIFEST_COLUMNS[:2] if k not in df]
+        if missing:
+            st.error(f"❌ Faylda ustun(lar) yo'q: {', '.join(missing)}")
+            return
+        vehicles = batch.to_numbers(df["vehicles"], 1.0) if "vehicles" in df else 1.0
+        try:
+            res = routes.price_manifest(df["origin"].to_numpy(), df["destination"].to_numpy(), vehicles, bhm, matrix, c.rates)
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        out = df.assign(km=res["km"], rate_bhm=res["rate"], fee=res["total"])
+        audit_many(c, "escort_manifest", "5", res["total"],
+                   {"origin": df["origin"], "destination": df["destination"], "vehicles": np.broadcast_to(vehicles, len(df)), "km": res["km"]},
+                   {"rate_bhm": res["rate"]}, key=(mx_file and mx_file.file_id, int(pd.util.hash_pandas_object(df, index=False).sum())))
+        n_veh = float(out["vehicles"].sum()) if "vehicles" in out else float(len(out))
+        total = float(res["total"].sum())
+        m1, m2, m3 = st.columns(3)
+        m1.metric("Avtomobillar", f"{n_veh:,.0f}", f"{len(out):,} yo'nalish")
+        m2.metric("200 km dan ortiq", f"{int((res['km'] > fees.ESCORT_KM_LIMIT).sum()):,} yo'nalish")
+        m3.metric("💰 JAMI", f"{fmt(total)} so'm", f"${total/USD_RATE:,.2f}")
+        st.dataframe(out.head(1000), hide_index=True, use_container_width=True)
+        st.download_button("⬇️ Manifest hisobi (CSV)", out.to_csv(index=False).encode("utf-8"), file_name="karvon_manifest.csv", key="conv_dl")
+
+
+c = ctx()
+bhm = c.bhm
+st.markdown("## 🚗 Avtotransport Hamrohligi Yig'imi")
+st.markdown("<div class='info-box'><b>5-modda:</b> O'zbekiston hududida bitta avtotransport vositasini bojxona hamrohligida kuzatib borganlik uchun:<br>• 200 km gacha: BHM × 2<br>• 200 km dan ortiq: BHM × 5</div>", unsafe_allow_html=True)
+
+calculator(c)
+
+st.plotly_chart(artifacts.escort_chart(bhm), use_container_width=True)
+
+manifest(c)
@@ -0,0 +1,23 @@
+# 8. BARCHA STAVKALAR JADVALI
+import streamlit as st
+
+from views import artifacts
+from views.common import ctx, fmt
+
+
+c = ctx()
+bhm, USD_RATE = c.bhm, c.usd_rate
+st.markdown("## 📊 Barcha Bojxona Yig'imlari Stavkalari Jadvali")
+st.caption(f"BHM = {bhm:,} so'm · 1 USD = {fmt(USD_RATE)} so'm")
+
+tab1, tab2 = st.tabs(["📦 BYD asosiy stavkalar","🔧 Barcha boshqa xizmatlar"])
+
+with tab1:
+    df1 = artifacts.byd_rates_table(bhm)
+    st.dataframe(df1.style.format({"Yig'im (so'm)":"{:,.0f}","Chegirmali -20% (so'm)":"{:,.0f}"}), use_container_width=True, hide_index=True)
+    st.success("✅ 'Chegirmali' ustun — dastlabki deklaratsiyalashda 20% chegirma qo'llanilganda")
+
+with tab2:
+    df2 = artifacts.services_table(bhm)
+    st.dataframe(df2.style.format({"Yig'im (so'm)":"{:,.0f}"}), use_container_width=True, hide_index=True)
+    st.caption(f"Barcha miqdorlar BHM = {bhm:,} so'm asosida hisoblangan")
@@ -0,0 +1,51 @@
+# 6. JISMONIY SHAXSLAR
+import streamlit as st
+
+from bojxona import fees
+from views import results
+from views.common import audit, byd_label, ctx, fmt, fragment, not_in_force
+
+
+@fragment
+def border_storage(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>7-modda:</b> Notijorat maqsadlarda, belgilangan me'yordan ortiq bo'lgan tovarlar.</div>", unsafe_allow_html=True)
+    if not_in_force(c, "7a", "7b", "7v", "7g"):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        w = st.number_input("Og'irlik (kg brutto):", min_value=1.0, max_value=50000.0, value=100.0, key="ph2w")
+        d = st.number_input("Saqlash kunlari:", min_value=1, max_value=180, value=7, key="ph2d")
+        per2 = st.checkbox("Tez buziladigan", key="ph2p")
+    with col2:
+        st7 = results.storage7(w, d, bhm, per2, c.rates)
+        tf = st7["total"]
+        audit(c, "storage_7_person", "7", tf, {"w_kg": w, "days": d, "perishable": per2},
+              {k: st7[k] for k in ("pf1", "pf2", "pf3")} if not per2 else None)
+        if per2:
+            st.metric("Jami yig'im", f"{fmt(tf)} so'm", "BHM 15%/100kg/kun")
+        else:
+            st.dataframe(results.storage7_table(w, d, bhm, c.rates), hide_index=True, use_container_width=True)
+            st.metric("JAMI", f"{fmt(tf)} so'm", f"${tf/USD_RATE:.2f}")
+
+
+@fragment
+def clearance(c):
+    if not c.schedule.in_force("1a", c.calc_date):
+        st.warning(f"⚠️ {c.calc_date:%d.%m.%Y} sanasida 1a-modda hali kuchga kirmagan (2026-yil 1-yanvardan).")
+    v = st.number_input("Tovar qiymati (USD):", min_value=0.0, max_value=1000000.0, value=5000.0, step=100.0, key="ph2v")
+    init = st.checkbox("Dastlabki deklaratsiya (20% chegirma)", key="ph2i")
+    bf = c.byd_fee(v) * ((1 - fees.INITIAL_DISCOUNT) if init else 1.0)
+    audit(c, "byd_person", "1a", bf, {"customs_usd": v, "initial_decl": init})
+    st.metric("Rasmiylashtiruv yig'imi", f"{fmt(bf)} so'm", byd_label(v)+(" · −20%" if init else ""))
+
+
+c = ctx()
+st.markdown("## 👤 Jismoniy Shaxslar Uchun Yig'imlar")
+st.info("Chegara bojxona postlarida jismoniy shaxslar uchun alohida stavkalar qo'llaniladi.")
+tab1, tab2 = st.tabs(["📦 Chegara ombori saqlash","📋 Umumiy rasmiylashtiruv"])
+
+with tab1:
+    border_storage(c)
+with tab2:
+    clearance(c)
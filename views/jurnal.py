@@ -0,0 +1,48 @@
+# 12. AUDIT JURNALI (faqat BOJXONA_ADMIN bo'lganda: barcha sessiyalar yozuvlari)
+import time
+from datetime import date
+
+import streamlit as st
+
+from bojxona import audit as audit_log
+from views.common import fmt, fragment
+
+GROUP_LABELS = {"day": "Kun", "article": "Modda", "calc": "Kalkulyator", "rate_date": "Kurs sanasi",
+                "calc_date": "Hisoblash sanasi", "bhm": "BHM", "usd_rate": "USD kursi", "session": "Sessiya"}
+
+
+@fragment
+def report():
+    log = audit_log.default()
+    if log.dropped:
+        st.warning(f"⚠️ Jurnalga yozib bo'lmadi, {log.dropped:,} ta yozuv tashlab yuborildi: {log.last_error}")
+    today = date.today()
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        period = st.date_input("Davr:", value=(today.replace(day=1), today), key="audit_period")
+    with col2:
+        by = st.multiselect("Guruhlash:", list(GROUP_LABELS), default=["article"], format_func=GROUP_LABELS.get, key="audit_by")
+    start, end = (period[0], period[-1]) if period else (None, None)
+
+    t0 = time.perf_counter()
+    agg = log.aggregate(by, start, end)
+    elapsed = time.perf_counter() - t0
+    total, count = (float(agg["total"].sum()), int(agg["count"].sum())) if len(agg) else (0.0, 0)
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Yozuvlar", f"{count:,}")
+    m2.metric("Jami yig'im", f"{fmt(total)} so'm")
+    m3.metric("So'rov vaqti", f"{elapsed * 1000:,.0f} ms")
+    st.dataframe(agg.rename(columns={**GROUP_LABELS, "total": "Jami (so'm)", "count": "Soni"}), hide_index=True, use_container_width=True,
+                 column_config={"Jami (so'm)": st.column_config.NumberColumn(format="%.0f")})
+    st.download_button("⬇️ Hisobot (CSV)", agg.to_csv(index=False).encode("utf-8"), file_name=f"audit_{start}_{end}.csv", key="audit_dl")
+
+    with st.expander("🧾 So'nggi yozuvlar"):
+        st.dataframe(log.records(start, end, limit=500), hide_index=True, use_container_width=True)
+
+
+st.markdown("## 🗂️ Audit Jurnali")
+st.markdown("<div class='info-box'>Ilovada hisoblangan har bir yig'im kiritilgan qiymatlar, BHM, kurs va tafsilotlari bilan saqlanadi (siqilgan Parquet segmentlar, kun bo'yicha). Hisobotlar faqat kerakli ustunlarni o'qiydi.</div>", unsafe_allow_html=True)
+if audit_log.default() is None:
+    st.warning("⚠️ Audit jurnali o'chirilgan (BOJXONA_AUDIT=0)")
+else:
+    report()
@@ -0,0 +1,68 @@
+# 11. MONITORING (faqat BOJXONA_METRICS=1 va BOJXONA_ADMIN bo'lganda)
+import pandas as pd
+import streamlit as st
+
+from bojxona import metrics, settings
+from views.common import fmt, fragment
+
+
+def histogram_table(snap, name, columns=None):
+    # columns: {yorliq: ustun nomi}
+    rows = []
+    for (n, labels), (buckets, total, count) in sorted(snap["histograms"].items()):
+        if n != name:
+            continue
+        rows.append({**{title: dict(labels).get(k, "—") for k, title in (columns or {}).items()}, "Soni": count,
+                     "O'rtacha (ms)": total / count * 1000,
+                     **{f"p{int(q * 100)} (ms)": metrics.quantile(buckets, q) * 1000 for q in (0.5, 0.95, 0.99)}})
+    return pd.DataFrame(rows)
+
+
+@fragment
+def panel():
+    st.button("🔄 Yangilash", key="mon_refresh")
+    snap = metrics.snapshot()
+    counters, gauges = snap["counters"], snap["gauges"]
+    fetches = sum(c for (n, _), (_, _, c) in snap["histograms"].items() if n == "bojxona_cbu_fetch_seconds")
+    failures = counters.get(("bojxona_cbu_fetch_failures_total", ()), 0)
+
+    m1, m2, m3 = st.columns(3)
+    m1.metric("👥 Faol sessiyalar", fmt(gauges[("bojxona_active_sessions", ())]), f"oxirgi {metrics.SESSION_WINDOW // 60} daqiqa", delta_color="off")
+    m2.metric("🌐 CBU so'rovlari", fmt(fetches))
+    m3.metric("⚠️ CBU xatolari", fmt(failures))
+
+    st.markdown("#### ⏱️ Rerun davomiyligi (sahifa va fragment bo'yicha)")
+    st.caption("Fragment — faqat shu fragment qayta ishga tushgani; «—» — butun sahifa rerun.")
+    reruns = histogram_table(snap, "bojxona_rerun_seconds", {"page": "Sahifa", "fragment": "Fragment"})
+    if len(reruns):
+        views = {dict(l).get("page"): v for (n, l), v in counters.items() if n == "bojxona_page_views_total"}
+        reruns.insert(2, "Ochilishlar", reruns["Sahifa"].map(views).fillna(0).astype(int).where(reruns["Fragment"] == "—", 0))
+        st.dataframe(reruns.sort_values("Soni", ascending=False), hide_index=True, use_container_width=True,
+                     column_config={c: st.column_config.NumberColumn(format="%.1f") for c in reruns.columns if "(ms)" in c})
+    else:
+        st.info("Hali rerunlar yo'q")
+
+    cbu = histogram_table(snap, "bojxona_cbu_fetch_seconds")
+    if len(cbu):
+        st.markdown("#### 🌐 cbu.uz so'rovlari")
+        st.dataframe(cbu, hide_index=True, use_container_width=True)
+
+    st.markdown("#### 🗄️ Keshlar")
+    caches = {}
+    for (n, labels), v in gauges.items():
+        if n.startswith("bojxona_cache_"):
+            caches.setdefault(dict(labels)["cache"], {})[n.removeprefix("bojxona_cache_").removesuffix("_total")] = v
+    if caches:
+        st.dataframe(pd.DataFrame([{"Kesh": k, "Topildi": v["hits"], "Topilmadi": v["misses"], "Ulush": f"{v['hit_ratio']:.1%}", "Yozuvlar": v["entries"]}
+                                   for k, v in sorted(caches.items())]), hide_index=True, use_container_width=True)
+
+    with st.expander("📄 Prometheus formatida"):
+        text = metrics.render()
+        st.code(text, language="text")
+        st.download_button("⬇️ metrics.txt", text.encode("utf-8"), file_name="metrics.txt", key="mon_dl")
+
+
+st.markdown("## 🛠️ Monitoring")
+st.markdown(f"<div class='info-box'>Shu jarayon bo'yicha o'lchovlar (jarayon qayta ishga tushganda nollanadi). Prometheus: <code>http://{settings.METRICS_HOST}:{settings.METRICS_PORT}/metrics</code> (BOJXONA_METRICS_HOST).</div>"
+            if settings.METRICS_PORT else "<div class='info-box'>Shu jarayon bo'yicha o'lchovlar (jarayon qayta ishga tushganda nollanadi).</div>", unsafe_allow_html=True)
+panel()
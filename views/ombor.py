@@ -0,0 +1,114 @@
+# 4. OMBOR SAQLASH
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from bojxona import batch, ledger
+from views import results
+from views.common import audit, ctx, fmt, fragment, not_in_force
+
+
+@fragment
+def customs_warehouse(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>4-modda:</b> Egasi bojxona organi bo'lgan bojxona ombori:<br>• Dastlabki 10 sutka: BHM × 3% / 1 tonna / sutka<br>• Har keyingi sutka: BHM × 4% / 1 tonna / sutka</div>", unsafe_allow_html=True)
+    if not_in_force(c, "4a", "4b"):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        w_t = st.number_input("Tovar og'irligi (tonna):", min_value=0.01, max_value=10000.0, value=1.0, step=0.1)
+        days_t = st.number_input("Saqlash kunlari:", min_value=1, max_value=365, value=15)
+    with col2:
+        st4 = results.storage4(w_t, days_t, bhm, c.rates)
+        d1, d2, f_d1, f_d2, total_s = (st4[k] for k in ("d1", "d2", "f_d1", "f_d2", "total"))
+        audit(c, "storage_4", "4", total_s, {"w_t": w_t, "days": days_t}, {"d1": d1, "d2": d2, "f_d1": f_d1, "f_d2": f_d2})
+        st.markdown(f"<div class='metric-card'><p>📅 1-10 kun: <b>{d1} kun</b> → {fmt(f_d1)} so'm</p><p>📅 10+ kun: <b>{d2} kun</b> → {fmt(f_d2)} so'm</p><hr><b>JAMI: {fmt(total_s)} so'm</b> (${total_s/USD_RATE:.2f})</div>", unsafe_allow_html=True)
+
+
+@fragment
+def border_warehouse(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>7-modda:</b> Jismoniy shaxslar — chegara bojxona postlari orqali notijorat maqsadlarda, me'yordan ortiq tovarlar:<br>• 1-5 kun: BHM × 5% / 100 kg / kun<br>• 6-15 kun: BHM × 7% / 100 kg / kun<br>• 15+ kun: BHM × 10% / 100 kg / kun<br>• Tez buziladigan: BHM × 15% / 100 kg / kun</div>", unsafe_allow_html=True)
+    if not_in_force(c, "7a", "7b", "7v", "7g"):
+        return
+    col1, col2 = st.columns(2)
+    with col1:
+        w_kg = st.number_input("Tovar og'irligi (kg brutto):", min_value=1.0, max_value=100000.0, value=100.0, step=10.0)
+        d_p = st.number_input("Saqlash kunlari:", min_value=1, max_value=180, value=10, key="phdays")
+        perishable = st.checkbox("Tez buziladigan tovar")
+    with col2:
+        st7 = results.storage7(w_kg, d_p, bhm, perishable, c.rates)
+        pf = st7["total"]
+        audit(c, "storage_7", "7", pf, {"w_kg": w_kg, "days": d_p, "perishable": perishable},
+              {k: st7[k] for k in ("pf1", "pf2", "pf3")} if not perishable else None)
+        if perishable:
+            st.metric("Jami yig'im", f"{fmt(pf)} so'm", "BHM 15% / 100kg / kun")
+        else:
+            st.dataframe(results.storage7_table(w_kg, d_p, bhm, c.rates), hide_index=True, use_container_width=True)
+            st.metric("JAMI", f"{fmt(pf)} so'm", f"${pf/USD_RATE:.2f}")
+
+
+@fragment
+def warehouse_ledger(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>Ombor reyestri:</b> ko'plab yuklar bo'yicha 4- va 7-modda yig'imlari bir vaqtda.<br>• Kelgan kun 1-kun hisoblanadi, chiqarilgan kun ham kiradi<br>• Tanlangan sanagacha butun ombor bo'yicha hisoblangan yig'im bosqich chegaralari va prefiks yig'indilar orqali olinadi</div>", unsafe_allow_html=True)
+    st.caption("Ustunlar: **article** (4 yoki 7), **weight_kg**, **arrival**, release (bo'sh — hali omborda), perishable (7-modda), id.")
+    up = st.file_uploader("Yuklar ro'yxati:", type=list(batch.INPUT_TYPES), key="ledger_file")
+    if up is None:
+        return
+    if st.session_state.get("ledger_file_id") != up.file_id:
+        try:
+            book = ledger.StorageLedger.from_frame(pd.concat(batch.iter_chunks(up, up.name), ignore_index=True))
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        st.session_state["ledger_file_id"], st.session_state["ledger_book"] = up.file_id, book
+    book = st.session_state["ledger_book"]
+    if not len(book):
+        st.warning("⚠️ Faylda yuklar topilmadi")
+        return
+
+    day = st.date_input("📅 Qaysi sanagacha:", value=c.calc_date, key="ledger_day")
+    if book.day is None or np.datetime64(day, "D").astype(np.int64) >= book.day:
+        # Sana oldinga surilganda jami inkremental yangilanadi: faqat oraliqda bosqichi o'zgargan yuklar
+        acc = book.advance(day) * bhm
+    else:
+        acc = float(book.accrued(day, bhm))
+    daily = float(book.daily(day, bhm))
+    key = (st.session_state["ledger_file_id"], day, bhm)
+    if st.session_state.get("ledger_items_key") != key:
+        st.session_state["ledger_items_key"], st.session_state["ledger_items"] = key, book.items(day, bhm)
+    items = st.session_state["ledger_items"]
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric("Yuklar", f"{len(book):,}")
+    m2.metric("Omborda", f"{int(items['in_stock'].sum()):,}")
+    m3.metric("Hisoblangan yig'im", f"{fmt(acc)} so'm", f"${acc/USD_RATE:,.2f}")
+    m4.metric("Shu kungi yig'im", f"{fmt(daily)} so'm")
+
+    first = book.arrival.min()
+    last = max(int(book.release[~book.is_open].max(initial=first)), int(np.datetime64(day, "D").astype(np.int64)))
+    dates = np.arange(first, last + 1).astype("datetime64[D]")
+    fig = go.Figure(go.Scatter(x=dates, y=book.accrued(dates, bhm), mode='lines', fill='tozeroy', line=dict(color='#7c3aed', width=2)))
+    fig.add_vline(x=np.datetime64(day, "D").astype("datetime64[ms]").astype(object), line_dash="dash", line_color="red")
+    fig.update_layout(title="Ombor bo'yicha jami hisoblangan yig'im", xaxis_title="Sana", yaxis_title="Jami (so'm)", template='plotly_white')
+    st.plotly_chart(fig, use_container_width=True)
+
+    df = pd.DataFrame({"Yuk": book.ids, "Modda": book.kind, "Kelgan": book.arrival.astype("datetime64[D]"),
+                       "Kun": items["days"].astype(int), "Yig'im (so'm)": items["fee"].round()})
+    st.dataframe(df.head(1000), hide_index=True, use_container_width=True)
+    if len(df) > 1000:
+        st.caption(f"Birinchi 1 000 ta yuk ko'rsatildi (jami {len(df):,})")
+    st.download_button("⬇️ Yuklar bo'yicha hisob (CSV)", df.to_csv(index=False).encode("utf-8"), file_name=f"ombor_{day:%Y%m%d}.csv", key="ledger_dl")
+
+
+c = ctx()
+st.markdown("## 🏪 Bojxona Omborida Saqlash Yig'imi")
+tab1, tab2, tab3 = st.tabs(["📦 Bojxona ombori (yuridik)","👤 Chegara ombori (jismoniy)","📒 Ombor reyestri"])
+
+with tab1:
+    customs_warehouse(c)
+with tab2:
+    border_warehouse(c)
+with tab3:
+    warehouse_ledger(c)
@@ -0,0 +1,157 @@
+# 2. RASMIYLASHTIRUV YIG'IMI
+import os
+import tempfile
+from datetime import date, timedelta
+
+import streamlit as st
+
+from bojxona import batch, rates, reports
+from views import artifacts, results
+from views.common import audit, audit_many, byd_label, ctx, fmt, fragment
+
+
+@fragment
+def calculator(c):
+    bhm, USD_RATE, FX = c.bhm, c.usd_rate, c.fx
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        ccy = st.selectbox("💱 Valyuta:", ["USD"] + sorted(k for k in FX if k != "USD"), key="byd_ccy")
+        customs_val = st.number_input(f"🔢 Tovarning bojxona qiymati ({ccy}):", min_value=0.0, max_value=50000000.0, value=50000.0, step=1000.0, format="%.0f", key="byd_value")
+        customs_usd = customs_val if ccy == "USD" else float(rates.to_uzs(customs_val, ccy, FX)) / USD_RATE
+        st.caption(f"So'mda: **{fmt(customs_usd * USD_RATE)}** so'm" + ("" if ccy == "USD" else f" · ≈ ${fmt(customs_usd)} (1 {ccy} = {FX[ccy]:,.2f} so'm)"))
+        initial_decl = st.checkbox("✅ Dastlabki deklaratsiyalash (20% chegirma)")
+        after_hours = st.checkbox("🌙 Ish vaqtidan tashqari rasmiylashtiruv (1 BYD, +BHM 25%)")
+        insp_h = st.number_input("🔍 Ko'rig soatlari (ish vaqtida):", min_value=0, max_value=24, value=0)
+        insp_ot = st.number_input("🔍 Ko'rig soatlari (ish vaqtidan tashqari):", min_value=0, max_value=24, value=0)
+    with col2:
+        st.dataframe(artifacts.byd_bands_table(), hide_index=True, use_container_width=True)
+
+    res = results.byd(customs_usd, bhm, initial_decl, after_hours, insp_h, insp_ot)
+    base, disc, ah_fee, insp_fee, insp_ot_fee, total = (res[k] for k in ("base", "disc", "ah_fee", "insp_fee", "insp_ot_fee", "total"))
+    audit(c, "byd", "1a", total,
+          {"customs_value": customs_val, "currency": ccy, "customs_usd": customs_usd, "initial_decl": initial_decl,
+           "after_hours": after_hours, "insp_h": insp_h, "insp_ot": insp_ot},
+          {"base": base, "disc": disc, "ah_fee": ah_fee, "insp_fee": insp_fee, "insp_ot_fee": insp_ot_fee})
+
+    r1, r2, r3, r4 = st.columns(4)
+    r1.metric("Tovar qiymati", f"${fmt(customs_usd)}", f"{fmt(customs_usd * USD_RATE)} so'm")
+    r2.metric(f"Asosiy yig'im ({byd_label(customs_usd)})", f"{fmt(base)} so'm", f"-{fmt(disc)} so'm" if initial_decl else "")
+    r3.metric("Qo'shimcha to'lovlar", f"{fmt(ah_fee + insp_fee + insp_ot_fee)} so'm")
+    r4.metric("💰 JAMI", f"{fmt(total)} so'm", f"${total/USD_RATE:.2f}")
+
+    st.markdown(f"<div class='result-box'><h2 style='color:white;margin:0;'>Jami to'lov: {fmt(total)} so'm</h2><p style='margin:5px 0 0 0;opacity:0.85;'>≈ ${total/USD_RATE:.2f} · BHM={bhm:,} so'm · 1 USD={fmt(USD_RATE)} so'm</p></div>", unsafe_allow_html=True)
+
+    with st.expander("📊 Batafsil hisoblash"):
+        st.dataframe(results.byd_details(customs_usd, USD_RATE, bhm, initial_decl, after_hours, insp_h, insp_ot), hide_index=True, use_container_width=True)
+
+
+@st.cache_resource(show_spinner=False)
+def rate_history():
+    return rates.RateHistory.load()
+
+
+def history_controls():
+    # Tarixiy kurslar: CBU dan oraliqni yuklab olish (keyin oflayn ishlaydi) va diskdagi oraliq
+    today = date.today()
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        period = st.date_input("Kurslarni yuklash oralig'i:", value=(today - timedelta(days=365), today), max_value=today, key="byd_backfill_period")
+    with col2:
+        st.write("")
+        go = st.button("⬇️ CBU dan yuklash", key="byd_backfill_go", disabled=len(period) < 2)
+    if go:
+        bar = st.progress(0.0, text="Yuklanmoqda...")
+        res = rates.backfill(period[0], period[-1], progress=lambda i, n: bar.progress(i / n, text=f"{i:,} / {n:,} kun"))
+        rate_history.clear()
+        msg = f"{res['days']:,} kun: {res['fetched']:,} ta yangi yuklandi"
+        if res["failed"]:
+            st.warning(f"⚠️ {msg}, {len(res['failed']):,} ta kun olinmadi (qayta bosing): {', '.join(list(res['failed'])[:5])}")
+        else:
+            st.success(f"✅ {msg}")
+    history = rate_history()
+    span = history.span()
+    st.caption(f"Diskdagi USD kurslari: **{span[0]} — {span[1]}** ({len(history):,} yozuv, barcha valyutalar)" if span
+               else "Diskda tarixiy kurslar yo'q — avval oraliqni yuklang")
+    return history
+
+
+@fragment
+def batch_upload(c):
+    bhm = c.bhm
+    with st.expander("📂 Ommaviy hisoblash — fayldan (CSV / Excel / Parquet)"):
+        st.caption("Ustunlar: **customs_usd** yoki **customs_value** + **currency** (istalgan CBU valyutasi), initial_decl, after_hours, insp_h, insp_ot, date (berilsa — shu sanadagi tarif va BHM). Fayl bo'laklab qayta ishlanadi.")
+        up = st.file_uploader("Deklaratsiyalar fayli:", type=list(batch.INPUT_TYPES), key="byd_batch_file")
+        out_type = st.radio("Natija formati:", batch.OUTPUT_TYPES, horizontal=True, key="byd_batch_out")
+        by_date = st.checkbox("📅 Valyutani har deklaratsiya sanasidagi CBU kursi bilan o'girish (date ustuni)", key="byd_batch_asof")
+        history = history_controls() if by_date else None
+        if up is not None and st.button("▶️ Hisoblash", key="byd_batch_go"):
+            bar = st.progress(0.0, text="Hisoblanmoqda...")
+            def on_progress(done, total):
+                bar.progress(min(done / total, 1.0) if total else 0.0, text=f"{done:,} / {total:,} qator")
+            def on_chunk(df):
+                # Sana rejimida har qator o'z sanasi, BHM va kursi bilan hisoblangan — jurnalga ham shular yoziladi
+                df = df[df[batch.ERROR_COLUMN] == ""]
+                per_row = {k: df[k].to_numpy() for k in ("bhm", "usd_rate", "rate_date", "date") if k in df}
+                audit_many(c, "byd_batch", "1a", df["total"], {k: df[k] for k in (*batch.INPUT_COLUMNS, *batch.FX_COLUMNS, "date") if k in df},
+                           {k: df[k] for k in batch.OUTPUT_COLUMNS[:-1]}, bhm=per_row.get("bhm"), usd_rate=per_row.get("usd_rate"),
+                           rate_date=per_row.get("rate_date"), calc_date=per_row.get("date") if "bhm" in per_row else None)
+            tmp = tempfile.NamedTemporaryFile(suffix=f".{out_type}", delete=False)
+            tmp.close()
+            try:
+                res = batch.price_file(up, up.name, bhm, tmp.name, out_type, progress=on_progress, fx=c.fx, sched=c.schedule, on_chunk=on_chunk, history=history)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                used = f"BHM={' / '.join(f'{b:,.0f}' for b in res['bhm'])} so'm"
+                if res["versions"]:
+                    used = f"sana bo'yicha: tarif {', '.join(f'{s} ({n})' for s, n in res['versions'])}; {used}"
+                st.success(f"✅ {res['rows'] - res['failed']:,} ta deklaratsiya hisoblandi ({used})")
+                if res["failed"]:
+                    rows = ", ".join(map(str, res["failed_rows"][:20])) + (" …" if res["failed"] > 20 else "")
+                    st.warning(f"⚠️ {res['failed']:,} ta qator hisoblanmadi (natijada bo'sh, sababi `{batch.ERROR_COLUMN}` ustunida). Qatorlar: {rows}")
+                with open(tmp.name, "rb") as fh:
+                    st.download_button("⬇️ Natijani yuklab olish", fh, file_name=f"{os.path.splitext(up.name)[0]}_yigim.{out_type}", key="byd_batch_dl")
+            finally:
+                os.unlink(tmp.name)
+
+
+@fragment
+def statements(c):
+    bhm = c.bhm
+    with st.expander("🧾 Hisob-varaqlar — har deklaratsiya yoki mijoz uchun (Excel / PDF, ZIP)"):
+        st.caption(f"Ustunlar ommaviy hisoblashdagidek; qo'shimcha: **{reports.ID_COLUMNS[0]}** (yoki {reports.ID_COLUMNS[1]}), **{reports.CLIENT_COLUMN}**. Hisob-varaqlar parallel jarayonlarda tayyorlanib, bitta ZIP ga yoziladi.")
+        up = st.file_uploader("Deklaratsiyalar fayli:", type=list(batch.INPUT_TYPES), key="stmt_file")
+        col1, col2 = st.columns(2)
+        fmt_ = col1.radio("Format:", reports.FORMATS, horizontal=True, key="stmt_fmt")
+        per = col2.radio("Hisob-varaq:", ["Har deklaratsiya", "Har mijoz"], horizontal=True, key="stmt_by")
+        if up is not None and st.button("▶️ Tayyorlash", key="stmt_go"):
+            by = reports.CLIENT_COLUMN if per == "Har mijoz" else None
+            total = batch.count_rows(up, up.name) if by is None else None
+            bar = st.progress(0.0, text="Tayyorlanmoqda...")
+            def on_progress(done):
+                bar.progress(min(done / total, 1.0) if total else 0.0, text=f"{done:,} ta hisob-varaq")
+            chunks = (batch.price_frame(ch, bhm, c.fx, c.schedule) for ch in batch.iter_chunks(up, up.name))
+            tmp = tempfile.NamedTemporaryFile(suffix=".zip", delete=False)
+            tmp.close()
+            try:
+                n = reports.write_zip(chunks, tmp.name, fmt_, by, {"bhm": bhm, "usd_rate": c.usd_rate, "date": f"{c.calc_date:%Y-%m-%d}"}, progress=on_progress)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+            else:
+                bar.progress(1.0, text=f"{n:,} ta hisob-varaq")
+                with open(tmp.name, "rb") as fh:
+                    st.download_button(f"⬇️ ZIP ({n:,} ta {fmt_})", fh, file_name=f"{os.path.splitext(up.name)[0]}_hisob.zip", key="stmt_dl")
+            finally:
+                os.unlink(tmp.name)
+
+
+c = ctx()
+st.markdown("## 📋 BYD Rasmiylashtiruv Yig'imi Kalkulyatori")
+st.markdown("<div class='info-box'><b>1a-modda:</b> Tovarlarni import, eksport va boshqa bojxona rejimlarida BYD orqali rasmiylashtirganda (vaqtincha saqlash, davlat foydasiga voz kechish va yo'q qilishdan tashqari).</div>", unsafe_allow_html=True)
+
+if not c.schedule.in_force("1a", c.calc_date):
+    st.warning(f"⚠️ {c.calc_date:%d.%m.%Y} sanasida 1a-modda hali kuchga kirmagan (2026-yil 1-yanvardan).")
+
+calculator(c)
+batch_upload(c)
+statements(c)
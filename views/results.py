@@ -0,0 +1,141 @@
+import functools
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bojxona import fees, metrics, settings
+from bojxona.cache import LRUCache
+from views.common import fmt
+
+# ─── Kalkulyator natijalari: sessiya memosi + sessiyalar o'rtasida umumiy chegaralangan kesh ───
+# Kalit — funksiya nomi va normallashtirilgan argumentlar (BHM va kurs ham argument). Avval sessiya
+# memosi (sahifalar almashganda ham saqlanadi), keyin umumiy LRU, topilmasa hisoblanadi.
+# Tafsilot jadvallari qatorlardan yig'iladi, har qator faqat o'z kiritishlari bo'yicha keshlanadi:
+# bitta kiritish o'zgarsa, faqat unga bog'liq qatorlar qayta quriladi.
+# Qiymatlar o'qish uchun: keshdan olingan obyektni o'zgartirmang.
+CACHE = LRUCache(maxsize=settings.RESULT_CACHE)
+metrics.cache_collector("results", CACHE)
+SESSION_MEMO = 256
+DETAIL_COLUMNS = ["Qism", "Miqdor", "Izoh"]
+STORAGE_7_COLUMNS = ["Davr", "Kun", "Stavka", "So'm"]
+STORAGE_7_TIERS = ["1–5 kun", "6–15 kun", "15+ kun"]
+
+
+def _norm(v):
+    # 100.0 va 100, np.float64 va float bitta kalit beradi (teng sonlar xeshi teng). Yaxlitlanmaydi:
+    # chegaradagi qiymat (10000.00000001 va 10000) boshqa bosqichga tushadi — kalit aynan son bo'lishi kerak
+    if isinstance(v, (bool, np.bool_)):
+        return bool(v)
+    if isinstance(v, (int, np.integer)):
+        return int(v)
+    if isinstance(v, (float, np.floating)):
+        return float(v)
+    if isinstance(v, str):
+        return v.strip()
+    if isinstance(v, dict):
+        return tuple(sorted((k, _norm(x)) for k, x in v.items()))
+    return v
+
+
+def session_memo():
+    return st.session_state.setdefault("results_memo", LRUCache(maxsize=SESSION_MEMO))
+
+
+def memo(fn):
+    @functools.wraps(fn)
+    def wrapper(*args):
+        key = (fn.__qualname__, *map(_norm, args))
+        return session_memo().get_or_build(key, lambda: CACHE.get_or_build(key, lambda: fn(*args)))
+    return wrapper
+
+
+@memo
+def table(columns, rows):
+    return pd.DataFrame(list(rows), columns=list(columns))
+
+
+# ─── 1a: BYD ───
+@memo
+def byd(customs_usd, bhm, initial, after_hours, insp_h, insp_ot):
+    res = fees.byd_total(customs_usd, bhm, initial, after_hours, insp_h, insp_ot)
+    return {k: float(v) for k, v in res.items()}
+
+
+@memo
+def _byd_value_row(customs_usd, usd_rate):
+    return ("Bojxona qiymati", f"${fmt(customs_usd)}", f"{fmt(customs_usd * usd_rate)} so'm")
+
+
+@memo
+def _byd_base_row(tier, bhm):
+    return (f"Asosiy yig'im ({fees.BYD_LABELS[tier]})", f"{fmt(fees.BYD_RATES[tier] * bhm)} so'm", "")
+
+
+@memo
+def _byd_disc_row(tier, bhm):
+    return ("✅ Dastlabki chegirma (−20%)", f"−{fmt(fees.BYD_RATES[tier] * bhm * fees.INITIAL_DISCOUNT)} so'm", "")
+
+
+@memo
+def _after_hours_row(bhm):
+    return ("🌙 Ish vaqtidan tashqari (BHM 25%)", f"+{fmt(fees.ARTICLE_RATES['3a'] * bhm)} so'm", "")
+
+
+@memo
+def _inspection_row(hours, bhm):
+    return (f"🔍 Ko'rig ish vaqtida ({hours} soat × BHM 25%)", f"+{fmt(fees.ARTICLE_RATES['3b-1'] * bhm * hours)} so'm", "")
+
+
+@memo
+def _inspection_ot_row(hours, bhm):
+    return (f"🔍 Ko'rig ish vaqtidan tashqari ({hours} soat × BHM 2)", f"+{fmt(fees.ARTICLE_RATES['3b-2'] * bhm * hours)} so'm", "")
+
+
+@memo
+def _total_row(total, usd_rate):
+    return ("━━ JAMI", f"{fmt(total)} so'm", f"${total/usd_rate:.2f}")
+
+
+def byd_details(customs_usd, usd_rate, bhm, initial, after_hours, insp_h, insp_ot):
+    tier = int(fees.byd_tier(customs_usd))
+    rows = [_byd_value_row(customs_usd, usd_rate), _byd_base_row(tier, bhm)]
+    if initial: rows.append(_byd_disc_row(tier, bhm))
+    if after_hours: rows.append(_after_hours_row(bhm))
+    if insp_h > 0: rows.append(_inspection_row(int(insp_h), bhm))
+    if insp_ot > 0: rows.append(_inspection_ot_row(int(insp_ot), bhm))
+    rows.append(_total_row(byd(customs_usd, bhm, initial, after_hours, insp_h, insp_ot)["total"], usd_rate))
+    return table(tuple(DETAIL_COLUMNS), tuple(rows))
+
+
+# ─── 4-modda: bojxona ombori ───
+@memo
+def storage4(w_t, days, bhm, rates=None):
+    res = fees.storage_4(w_t, days, bhm, rates)
+    return {k: int(v) if k in ("d1", "d2") else float(v) for k, v in res.items()}
+
+
+# ─── 7-modda: chegara ombori ───
+@memo
+def storage7(w_kg, days, bhm, perishable, rates=None):
+    res = fees.storage_7(w_kg, days, bhm, perishable, rates)
+    return {k: int(v) if k in ("a1", "a2", "a3") else float(v) for k, v in res.items()}
+
+
+@memo
+def _storage7_row(tier, tier_days, w_kg, bhm, rate):
+    return (STORAGE_7_TIERS[tier], tier_days, f"{rate:.0%}", fmt(rate * bhm * (w_kg / 100.0) * tier_days))
+
+
+def storage7_table(w_kg, days, bhm, rates=None):
+    # Kunlar o'zgarsa faqat kunlari o'zgargan bosqich qatorlari qayta quriladi
+    split = fees.tier_days(days, fees.STORAGE_7_EDGES).astype(int)
+    tier_rates = [float(fees.rate(code, rates)) for code in ("7a", "7b", "7v")]
+    rows = [_storage7_row(i, int(n), w_kg, bhm, tier_rates[i]) for i, n in enumerate(split) if n > 0]
+    return table(tuple(STORAGE_7_COLUMNS), tuple(rows))
+
+
+# ─── 5-modda: avtomobil hamrohligi ───
+@memo
+def escort(km, vehicles, bhm, rates=None):
+    return {"fee": float(fees.escort_fee(km, vehicles, bhm, rates)), "rate_bhm": float(fees.escort_rate(km, rates))}
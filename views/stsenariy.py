@@ -0,0 +1,106 @@
+# 10. WHAT-IF STSENARIYLAR
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from bojxona import batch, fees, whatif
+from views.common import ctx, fmt, fragment
+
+# Brauzerga yuboriladigan issiqlik xaritasi o'qlari shu nuqtalar sonigacha siyraklashtiriladi
+HEATMAP_MAX = 300
+
+
+def sample_portfolio(n, usd_rate, seed=0):
+    # Namuna: qiymatlarning ~30% i so'mda (ularning bosqichi kursga bog'liq)
+    rng = np.random.default_rng(seed)
+    usd = rng.lognormal(9.5, 1.6, n)
+    in_uzs = rng.random(n) < 0.3
+    return pd.DataFrame({
+        "customs_value": np.round(np.where(in_uzs, usd * usd_rate, usd), 2),
+        "currency": np.where(in_uzs, "UZS", "USD"),
+        "initial_decl": rng.random(n) < 0.4,
+        "after_hours": rng.random(n) < 0.1,
+    })
+
+
+def load_portfolio(c, up, n_sample):
+    key = ("file", up.file_id) if up is not None else ("sample", n_sample, c.usd_rate)
+    if st.session_state.get("whatif_key") != key:
+        df = pd.concat(batch.iter_chunks(up, up.name), ignore_index=True) if up is not None else sample_portfolio(n_sample, c.usd_rate)
+        st.session_state["whatif_key"], st.session_state["whatif_portfolio"] = key, whatif.Portfolio.from_frame(df, c.fx)
+    return st.session_state["whatif_portfolio"]
+
+
+@fragment
+def scenarios(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    with st.expander("📂 Portfel", expanded=True):
+        st.caption("Ustunlar: **customs_usd** yoki **customs_value** + **currency** (UZS ham), initial_decl, after_hours, insp_h, insp_ot. So'mdagi qiymatlar bosqichi kursga qarab o'zgaradi; boshqa valyutalar kross-kursi o'zgarmas deb olinadi.")
+        up = st.file_uploader("Deklaratsiyalar fayli:", type=list(batch.INPUT_TYPES), key="whatif_file")
+        n_sample = st.number_input("Fayl bo'lmasa — namuna portfel (deklaratsiyalar soni):", min_value=100, max_value=1_000_000, value=10_000, step=1000, key="whatif_n", disabled=up is not None)
+        try:
+            pf = load_portfolio(c, up, int(n_sample))
+        except ValueError as e:
+            st.error(f"❌ {e}")
+            return
+        st.caption(f"{pf.n:,} ta deklaratsiya · shundan so'mda: {len(pf.uzs):,}")
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        b_lo, b_hi = st.slider("BHM oralig'i (so'm):", 100_000, 2_000_000, (int(bhm), min(int(bhm * 1.5), 2_000_000)), step=5000, key="whatif_bhm")
+        nb = st.number_input("BHM nuqtalari:", min_value=2, max_value=1000, value=200, key="whatif_nb")
+    with col2:
+        x_lo, x_hi = st.slider("USD kursi oralig'i (so'm):", 5000, 50000, (max(int(USD_RATE * 0.8) // 50 * 50, 5000), min(int(USD_RATE * 1.3) // 50 * 50, 50000)), step=50, key="whatif_x")
+        nx = st.number_input("Kurs nuqtalari:", min_value=2, max_value=1000, value=200, key="whatif_nx")
+    with col3:
+        discounts = st.multiselect("Chegirma stsenariylari:", [0.0, 0.1, 0.2, 0.3, 0.5], default=[0.0, fees.INITIAL_DISCOUNT],
+                                   format_func=lambda d: f"{d:.0%}", key="whatif_d")
+        unit = st.radio("Birlik:", ["so'm", "USD"], horizontal=True, key="whatif_unit")
+    if not discounts:
+        st.info("Kamida bitta chegirma stsenariysini tanlang")
+        return
+    discounts = sorted(discounts)
+    b_axis = np.linspace(b_lo, b_hi, int(nb))
+    x_axis = np.linspace(x_lo, x_hi, int(nx))
+    cube = pf.grid(b_axis, x_axis, discounts)
+    if unit == "USD":
+        cube = cube / x_axis[None, :, None]
+
+    d_sel = st.select_slider("Xaritadagi chegirma:", options=discounts, value=discounts[-1], format_func=lambda d: f"{d:.0%}", key="whatif_dsel")
+    layer = cube[:, :, discounts.index(d_sel)]
+    now = float(pf.grid([bhm], [USD_RATE], [d_sel])[0, 0, 0]) / (USD_RATE if unit == "USD" else 1)
+    m1, m2, m3 = st.columns(3)
+    m1.metric("Joriy BHM va kurs bo'yicha", f"{fmt(now)} {unit}")
+    m2.metric("To'rdagi minimum", f"{fmt(layer.min())} {unit}")
+    m3.metric("To'rdagi maksimum", f"{fmt(layer.max())} {unit}", f"{layer.max() / now - 1:+.1%}" if now else "")
+
+    bi = np.unique(np.linspace(0, len(b_axis) - 1, min(len(b_axis), HEATMAP_MAX)).astype(int))
+    xi = np.unique(np.linspace(0, len(x_axis) - 1, min(len(x_axis), HEATMAP_MAX)).astype(int))
+    fig = go.Figure(go.Heatmap(x=x_axis[xi], y=b_axis[bi], z=layer[np.ix_(bi, xi)] / 1e6, colorscale="Blues",
+                               colorbar=dict(title=f"mln {unit}")))
+    fig.add_trace(go.Scatter(x=[USD_RATE], y=[bhm], mode="markers", marker=dict(color="red", size=10, symbol="x"), name="Joriy"))
+    fig.update_layout(title=f"Portfel bo'yicha jami yig'im (chegirma {d_sel:.0%})", xaxis_title="1 USD (so'm)", yaxis_title="BHM (so'm)", template='plotly_white')
+    st.plotly_chart(fig, use_container_width=True)
+
+    with st.expander("⬇️ Kubni eksport qilish"):
+        st.caption(f"{cube.size:,} qator: {', '.join(whatif.CUBE_COLUMNS)}. Fayl bo'laklab yoziladi.")
+        out_type = st.radio("Format:", batch.OUTPUT_TYPES, horizontal=True, key="whatif_out")
+        if st.button("▶️ Tayyorlash", key="whatif_go"):
+            tmp = tempfile.NamedTemporaryFile(suffix=f".{out_type}", delete=False)
+            tmp.close()
+            try:
+                rows = whatif.write_cube(pf, tmp.name, out_type, b_axis, x_axis, discounts)
+                with open(tmp.name, "rb") as fh:
+                    st.download_button(f"⬇️ Yuklab olish ({rows:,} qator)", fh, file_name=f"whatif_kub.{out_type}", key="whatif_dl")
+            finally:
+                os.unlink(tmp.name)
+
+
+c = ctx()
+st.markdown("## 🧮 What-if: BHM × Kurs × Chegirma")
+st.markdown("<div class='info-box'>Deklaratsiyalar portfeli bo'yicha jami rasmiylashtiruv yig'imi (1a, 3a, 3b) kelajakdagi BHM, dollar kursi va chegirma stsenariylari to'rida. Hisob portfel qatorlari soniga emas, to'r hajmiga proporsional.</div>", unsafe_allow_html=True)
+scenarios(c)
@@ -0,0 +1,89 @@
+# 2b. BYDLARGA TAQSIMLASH
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from bojxona import batch, split
+from views.common import audit_many, byd_label, ctx, fmt, fragment
+
+
+def _lines_from_file(up):
+    # Fayl bir marta o'qiladi; fragment qayta ishlaganda sessiyadagi nusxa ishlatiladi
+    if st.session_state.get("split_file_id") != up.file_id:
+        df = pd.concat(batch.iter_chunks(up, up.name), ignore_index=True)
+        if "customs_usd" not in df:
+            raise ValueError("Faylda 'customs_usd' ustuni yo'q")
+        st.session_state["split_file_id"], st.session_state["split_file_df"] = up.file_id, df
+    return st.session_state["split_file_df"]
+
+
+@fragment
+def optimizer(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        up = st.file_uploader("Tovar qatorlari fayli (ixtiyoriy):", type=list(batch.INPUT_TYPES), key="split_file")
+        if up is not None:
+            try:
+                lines = _lines_from_file(up)
+            except ValueError as e:
+                st.error(f"❌ {e}")
+                return
+            st.caption(f"{len(lines):,} ta qator yuklandi")
+        else:
+            lines = st.data_editor(
+                pd.DataFrame({"name": ["Tovar 1", "Tovar 2", "Tovar 3", "Tovar 4"],
+                              "customs_usd": [38000.0, 14500.0, 6200.0, 2300.0]}),
+                num_rows="dynamic", hide_index=True, use_container_width=True, key="split_lines",
+                column_config={"name": "Tovar", "customs_usd": st.column_config.NumberColumn("Qiymat (USD)", min_value=0.0, format="%.2f")})
+    with col2:
+        initial = st.checkbox("✅ Dastlabki deklaratsiyalash (20% chegirma)", key="split_init")
+        after_hours = st.checkbox("🌙 Ish vaqtidan tashqari (har BYD uchun +BHM 25%)", key="split_ah")
+        insp_h = st.number_input("🔍 Ko'rig soatlari / BYD (ish vaqtida):", min_value=0, max_value=24, value=0, key="split_ih")
+        insp_ot = st.number_input("🔍 Ko'rig soatlari / BYD (ish vaqtidan tashqari):", min_value=0, max_value=24, value=0, key="split_io")
+
+    values = batch.to_numbers(lines["customs_usd"], 0.0) if len(lines) else np.zeros(0)
+    if not len(values) or values.sum() <= 0:
+        st.info("Tovar qatorlarini kiriting")
+        return
+    try:
+        res = split.optimize(values, bhm, initial, after_hours, insp_h, insp_ot)
+    except ValueError as e:
+        st.error(f"❌ {e}")
+        return
+    saving = res["single"] - res["total"]
+    audit_many(c, "byd_split", "1a", res["fees"], {"customs_usd": res["sums"], "lines": np.bincount(res["groups"], minlength=len(res["sums"]))},
+               key=(float(values.sum()), len(values), int(pd.util.hash_array(values).sum()), initial, after_hours, insp_h, insp_ot))
+
+    r1, r2, r3, r4 = st.columns(4)
+    r1.metric("Jami qiymat", f"${fmt(values.sum())}", f"{len(values):,} qator")
+    r2.metric("Bitta BYD", f"{fmt(res['single'])} so'm", byd_label(values.sum()))
+    r3.metric("Optimal taqsimot", f"{fmt(res['total'])} so'm", f"{len(res['sums'])} ta BYD")
+    r4.metric("💰 Tejov", f"{fmt(saving)} so'm", f"${saving/USD_RATE:.2f}")
+    if not res["optimal"]:
+        st.caption(f"Quyi chegara: {fmt(res['lower_bound'])} so'm — topilgan taqsimot optimal ekani isbotlanmadi")
+
+    decl = pd.DataFrame({
+        "BYD": np.arange(1, len(res["sums"]) + 1),
+        "Qatorlar": np.bincount(res["groups"], minlength=len(res["sums"])),
+        "Qiymat (USD)": res["sums"].round(2),
+        "Stavka": [byd_label(s) for s in res["sums"]],
+        "Yig'im (so'm)": res["fees"].round(),
+    })
+    st.dataframe(decl, hide_index=True, use_container_width=True)
+
+    out = lines.copy()
+    out["declaration"] = res["groups"] + 1
+    with st.expander("📄 Qatorlar bo'yicha taqsimot"):
+        st.dataframe(out.head(1000), hide_index=True, use_container_width=True)
+        st.download_button("⬇️ Taqsimotni yuklab olish (CSV)", out.to_csv(index=False).encode("utf-8"), file_name="byd_taqsimot.csv", key="split_dl")
+
+
+c = ctx()
+st.markdown("## 🧩 Yukni BYDlarga Optimal Taqsimlash")
+st.markdown("<div class='info-box'><b>1a-modda</b> yig'imi BYD dagi jami qiymat bosqichiga bog'liq, shuning uchun yukni bir nechta BYD ga bo'lish jami to'lovni kamaytirishi mumkin (BYD boshiga qo'shimcha to'lovlar hisobga olinadi).<br>Har bir tovar qatori bo'linmaydi; kalkulyator eng arzon guruhlashni topadi.</div>", unsafe_allow_html=True)
+
+if not c.schedule.in_force("1a", c.calc_date):
+    st.warning(f"⚠️ {c.calc_date:%d.%m.%Y} sanasida 1a-modda hali kuchga kirmagan (2026-yil 1-yanvardan).")
+
+optimizer(c)
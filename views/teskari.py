@@ -0,0 +1,135 @@
+# 13. TESKARI KALKULYATOR
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from bojxona import fees, inverse
+from views.common import ctx, fmt, fragment
+
+QUERIES = {
+    "byd": ("📋 1a: eng katta bojxona qiymati", "USD"),
+    "storage4_days": ("🏪 4-modda: eng ko'p saqlash kuni", "kun"),
+    "storage4_weight": ("🏪 4-modda: eng katta og'irlik", "tonna"),
+    "storage7_days": ("🏬 7-modda: eng ko'p saqlash kuni", "kun"),
+    "storage7_weight": ("🏬 7-modda: eng katta og'irlik", "kg"),
+    "escort_km": ("🚗 5-modda: eng uzoq masofa", "km"),
+    "escort_vehicles": ("🚗 5-modda: eng ko'p avtomobil", "dona"),
+    "flat": ("📜 Proporsional moddalar: miqdor", "dona / kg"),
+}
+TIERS = {"byd": ("1a: bojxona qiymati (USD)", 15000.0), "storage4": ("4-modda: saqlash kunlari", 8.0),
+         "storage7": ("7-modda: saqlash kunlari", 4.0), "escort": ("5-modda: masofa (km)", 150.0)}
+# Stsenariylar to'plamidagi eng ko'p nuqta va grafikka chiqariladigan nuqtalar soni
+GRID_MAX = 100_000
+CHART_POINTS = 2000
+
+
+def query_params(kind):
+    # Tanlangan so'rov uchun qo'shimcha kiritishlar; budget → {"max", "fee"} funksiyasini qaytaradi
+    if kind == "byd":
+        initial = st.checkbox("Dastlabki deklaratsiya (20% chegirma)", key="inv_initial")
+        return lambda b, bhm: inverse.byd_value(b, bhm, initial)
+    if kind == "storage4_days":
+        w_t = st.number_input("Tovar og'irligi (tonna):", min_value=0.01, max_value=10000.0, value=1.0, step=0.1, key="inv_w_t")
+        return lambda b, bhm: inverse.storage4_days(b, w_t, bhm)
+    if kind == "storage4_weight":
+        days = st.number_input("Saqlash kunlari:", min_value=1, max_value=365, value=15, key="inv_days4")
+        return lambda b, bhm: inverse.storage4_weight(b, days, bhm)
+    if kind in ("storage7_days", "storage7_weight"):
+        perishable = st.checkbox("Tez buziladigan tovar (7g)", key="inv_perishable")
+        if kind == "storage7_days":
+            w_kg = st.number_input("Tovar og'irligi (kg brutto):", min_value=1.0, max_value=100000.0, value=100.0, step=10.0, key="inv_w_kg")
+            return lambda b, bhm: inverse.storage7_days(b, w_kg, bhm, perishable)
+        days = st.number_input("Saqlash kunlari:", min_value=1, max_value=180, value=10, key="inv_days7")
+        return lambda b, bhm: inverse.storage7_weight(b, days, bhm, perishable)
+    if kind == "escort_km":
+        vehicles = st.number_input("Avtomobillar soni:", min_value=1, max_value=100, value=1, key="inv_vehicles")
+        return lambda b, bhm: inverse.escort_km(b, vehicles, bhm)
+    if kind == "escort_vehicles":
+        km = st.number_input("Masofa (km):", min_value=1, max_value=5000, value=150, key="inv_km")
+        return lambda b, bhm: inverse.escort_vehicles(b, km, bhm)
+    article = st.selectbox("Modda:", inverse.FLAT_ARTICLES, key="inv_article")
+    return lambda b, bhm: inverse.flat_n(b, article, bhm)
+
+
+def show_max(v, unit):
+    if np.isnan(v):
+        return "Sig'maydi"
+    if np.isinf(v):
+        return "Chegarasiz"
+    return f"{fmt(v) if v >= 100 else f'{v:g}'} {unit}"
+
+
+@fragment
+def budget_queries(c):
+    bhm = c.bhm
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        kind = st.radio("Nima topilsin?", list(QUERIES), format_func=lambda k: QUERIES[k][0], key="inv_kind")
+    with col2:
+        solve = query_params(kind)
+        budget = st.number_input("💰 Yig'im byudjeti (so'm):", min_value=0.0, max_value=1e12, value=float(bhm * 5), step=float(bhm), format="%.0f", key="inv_budget")
+        res = solve(budget, bhm)
+        unit = QUERIES[kind][1]
+        fee = f"{fmt(float(res['fee']))} so'm" if np.isfinite(res["fee"]) else "—"
+        st.markdown(f"<div class='result-box'><h2 style='color:white;margin:0;'>{show_max(float(res['max']), unit)}</h2><p style='margin:5px 0 0 0;opacity:0.85;'>Yig'im: {fee} · byudjet {fmt(budget)} so'm · BHM={bhm:,} so'm</p></div>", unsafe_allow_html=True)
+
+    st.markdown("#### 🧮 Stsenariylar to'plami")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        lo = st.number_input("Byudjet: dan (so'm)", min_value=0.0, value=0.0, step=float(bhm), format="%.0f", key="inv_lo")
+    with col2:
+        hi = st.number_input("gacha (so'm)", min_value=0.0, value=float(bhm * 30), step=float(bhm), format="%.0f", key="inv_hi")
+    with col3:
+        n = st.number_input("Nuqtalar:", min_value=2, max_value=GRID_MAX, value=10_000, step=1000, key="inv_n")
+    if hi <= lo:
+        st.warning("⚠️ Oraliq oxiri boshidan katta bo'lishi kerak")
+        return
+    budgets = np.linspace(lo, hi, int(n))
+    t0 = time.perf_counter()
+    grid = solve(budgets, bhm)
+    elapsed = time.perf_counter() - t0
+    st.caption(f"{len(budgets):,} ta stsenariy · {elapsed * 1000:,.1f} ms")
+    step = max(1, len(budgets) // CHART_POINTS)
+    shown = np.where(np.isfinite(grid["max"]), grid["max"], np.nan)[::step]
+    fig = go.Figure(go.Scatter(x=budgets[::step], y=shown, mode="lines", line_shape="hv" if kind in ("byd", "escort_km") else "linear"))
+    fig.update_layout(height=360, margin=dict(l=10, r=10, t=30, b=10), xaxis_title="Byudjet (so'm)", yaxis_title=f"Eng katta qiymat ({unit})")
+    st.plotly_chart(fig, use_container_width=True)
+    df = pd.DataFrame({"budget": budgets, "max": grid["max"], "fee": np.broadcast_to(grid["fee"], len(budgets))})
+    st.download_button("⬇️ Stsenariylar (CSV)", df.to_csv(index=False).encode("utf-8"), file_name=f"teskari_{kind}.csv", key="inv_dl")
+
+
+@fragment
+def tier_query(c):
+    bhm = c.bhm
+    col1, col2 = st.columns([1, 2])
+    with col1:
+        kind = st.selectbox("Modda:", list(TIERS), format_func=lambda k: TIERS[k][0], key="inv_tier_kind")
+        value = st.number_input("Joriy qiymat:", min_value=0.0, value=TIERS[kind][1], key=f"inv_tier_value_{kind}")
+    res = {k: float(v) for k, v in inverse.next_tier(kind, value).items()}
+    with col2:
+        m1, m2, m3 = st.columns(3)
+        if np.isnan(res["next"]):
+            m1.metric("Keyingi chegara", "Yo'q")
+            m2.metric("Zaxira", "—")
+        else:
+            m1.metric("Bosqich oxiri", fmt(res["next"]))
+            m2.metric("Zaxira", fmt(res["headroom"]))
+        m3.metric("Stavka (BHM)", f"{res['rate']:g}", None if np.isnan(res["rate_next"]) else f"keyin {res['rate_next']:g} × BHM", delta_color="inverse")
+        curve = inverse.CURVES[kind]
+        st.dataframe(pd.DataFrame({"Chegara": curve.breaks, "Stavka (BHM)": curve.rate(curve.breaks),
+                                   "Keyingi stavka (BHM)": curve.rate(curve.after(curve.breaks)),
+                                   "Stavka (so'm)": curve.rate(curve.breaks) * bhm}),
+                     hide_index=True, use_container_width=True)
+
+
+c = ctx()
+st.markdown("## 🔁 Teskari Kalkulyator")
+st.markdown("<div class='info-box'>Byudjetga sig'adigan eng katta qiymat (bojxona qiymati, kunlar, og'irlik, masofa, miqdor) va joriy qiymatdan keyingi bosqich chegarasi. Har modda oldindan bo'lakli-chiziqli funksiya sifatida qurilgan — minglab stsenariylar bir zumda hisoblanadi.</div>", unsafe_allow_html=True)
+st.markdown("### 💰 Byudjet bo'yicha")
+budget_queries(c)
+st.markdown("### 📐 Keyingi bosqich chegarasi")
+tier_query(c)
+st.caption(f"Yuqori chegara pastki bosqichga kiradi (masalan, {fmt(fees.BYD_BREAKS[0])} USD — hali {fees.BYD_LABELS[0]}).")
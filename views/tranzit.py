@@ -0,0 +1,81 @@
+# 3. TRANZIT VA MAXSUS REJIMLAR
+import streamlit as st
+
+from bojxona import fees
+from views.common import audit, ctx, fmt, fragment, not_in_force
+
+
+@fragment
+def transit(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>1b-modda:</b> «tranzit», «bojxona hududida qayta ishlash», «bojxona hududidan tashqarida qayta ishlash» rejimlari.<br><b>Stavka: BHM × 25% — 1 deklaratsiya uchun</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "1b"):
+        return
+    n = st.number_input("Deklaratsiyalar soni:", min_value=1, max_value=1000, value=1, key="tr_n")
+    ah_off = "3a" not in c.rates
+    ah = st.checkbox("Ish vaqtidan tashqari (+BHM 25% / BYD)", key="tr_ah", disabled=ah_off,
+                     help=f"3a-modda {c.calc_date:%d.%m.%Y} sanasida hali kuchga kirmagan" if ah_off else None) and not ah_off
+    fee1 = float(fees.flat_fee("1b", n, bhm, c.rates))
+    fee2 = float(fees.flat_fee("3a", n, bhm, c.rates)) if ah else 0.0
+    audit(c, "transit", "1b", fee1 + fee2, {"n": n, "after_hours": ah}, {"1b": fee1, "3a": fee2})
+    c1,c2,c3 = st.columns(3)
+    c1.metric("Asosiy yig'im", f"{fmt(fee1)} so'm", f"{n} × BHM 25%")
+    c2.metric("Ish vaqtidan tashqari", f"{fmt(fee2)} so'm")
+    c3.metric("Jami", f"{fmt(fee1+fee2)} so'm", f"${(fee1+fee2)/USD_RATE:.2f}")
+
+
+@fragment
+def cash(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>1v-modda:</b> Yuridik shaxslar tomonidan olib kelinayotgan naqd chet el valyutasi.<br><b>Stavka: BHM × 2.5 — 1 deklaratsiya uchun</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "1v"):
+        return
+    n2 = st.number_input("Deklaratsiyalar soni:", min_value=1, max_value=100, value=1, key="cur_n")
+    f2 = float(fees.flat_fee("1v", n2, bhm, c.rates))
+    audit(c, "cash", "1v", f2, {"n": n2})
+    c1,c2 = st.columns(2)
+    c1.metric("Yig'im", f"{fmt(f2)} so'm", f"{n2} × BHM 2.5")
+    c2.metric("USD da", f"${f2/USD_RATE:.2f}")
+
+
+@fragment
+def order(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>1g-modda:</b> Umumiy shakldagi bojxona kirim orderini qo'llash orqali.<br><b>Stavka: BHM × 25% — 1 kirim orderi uchun</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "1g"):
+        return
+    n3 = st.number_input("Kirim orderlari soni:", min_value=1, max_value=1000, value=1, key="ord_n")
+    f3 = float(fees.flat_fee("1g", n3, bhm, c.rates))
+    audit(c, "order", "1g", f3, {"n": n3})
+    c1,c2 = st.columns(2)
+    c1.metric("Yig'im", f"{fmt(f3)} so'm", f"{n3} × BHM 25%")
+    c2.metric("USD da", f"${f3/USD_RATE:.2f}")
+
+
+@fragment
+def courier(c):
+    bhm, USD_RATE = c.bhm, c.usd_rate
+    st.markdown("<div class='info-box'><b>1d-modda:</b> Xalqaro kuryerlik tashkilotining murojaatiga asosan xalqaro kuryerlik jo'natmalari.<br><b>Stavka: BHM × 2% — 1 kg brutto uchun</b></div>", unsafe_allow_html=True)
+    if not_in_force(c, "1d"):
+        return
+    kg = st.number_input("Og'irlik (kg brutto):", min_value=0.1, max_value=10000.0, value=1.0, step=0.1)
+    f4 = float(fees.flat_fee("1d", kg, bhm, c.rates))
+    audit(c, "courier", "1d", f4, {"kg": kg})
+    c1,c2,c3 = st.columns(3)
+    c1.metric("Og'irlik", f"{kg} kg")
+    c2.metric("Yig'im", f"{fmt(f4)} so'm", f"{kg} × BHM 2%")
+    c3.metric("USD da", f"${f4/USD_RATE:.2f}")
+
+
+c = ctx()
+st.markdown("## 🔄 Tranzit va Maxsus Rejimlar")
+tab1, tab2, tab3, tab4 = st.tabs(["🚛 Tranzit/Qayta ishlash","💵 Naqd valyuta","📄 Kirim orderi","📦 Kuryerlik"])
+
+with tab1:
+    transit(c)
+with tab2:
+    cash(c)
+with tab3:
+    order(c)
+with tab4:
+    courier(c)